@@ -28,7 +28,7 @@ from tgusers.routes import router as tgusers_router
 from admin.deps import get_current_admin
 from users.schemas import UserCreate, UserUpdate
 from fund.schemas import FundInfoCreate, FundInfoUpdate
-from . import users, fund, publications, feedback, donations
+from . import users, fund, publications, feedback, donations, jobs, broadcasts
 from .tg import router as tg_router
 
 settings = get_settings()
@@ -43,5 +43,7 @@ def init_admin_routes(app: FastAPI):
     app.include_router(publications.router)
     app.include_router(feedback.router)
     app.include_router(donations.router)
+    app.include_router(jobs.router)
+    app.include_router(broadcasts.router)
     app.include_router(tg_router)
     app.include_router(tgusers_router) 
\ No newline at end of file
@@ -0,0 +1,89 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Union
+
+from core.database import get_async_db
+from core.pagination import Page, paginate_async
+from core.queue import enqueue_async
+from donations.models import DonationCampaign
+from publications.models import Publication
+from tgusers.broadcast import CANCELLED, DONE, campaign_message, publication_message
+from tgusers.models import TgBroadcast
+from tgusers.schemas import TgBroadcastCreate, TgBroadcastRead
+from tgusers.tasks import TG_BROADCAST
+from users.models import User
+from admin.deps import get_current_admin
+from admin.crud import AsyncBaseCRUD
+
+router = APIRouter(prefix="/admin/broadcasts", tags=["admin-broadcasts"])
+
+broadcast_crud = AsyncBaseCRUD(TgBroadcast)
+
+@router.get("/", response_model=Union[Page[TgBroadcastRead], List[TgBroadcastRead]])
+async def get_broadcasts(
+    current_admin: User = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_async_db),
+    status: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None
+):
+    stmt = select(TgBroadcast)
+    if status:
+        stmt = stmt.where(TgBroadcast.status == status)
+    if cursor is not None:
+        return await paginate_async(db, stmt, TgBroadcast, cursor, limit)
+    return (await db.scalars(stmt.order_by(TgBroadcast.id.desc()).offset(skip).limit(limit))).all()
+
+@router.post("/", response_model=TgBroadcastRead)
+async def create_broadcast(
+    broadcast: TgBroadcastCreate,
+    current_admin: User = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Создает рассылку по всем tg_users и ставит ее в очередь; прогресс - в GET /admin/broadcasts/{id}"""
+    text, parse_mode = broadcast.text, broadcast.parse_mode
+    if broadcast.publication_id is not None:
+        publication = await db.get(Publication, broadcast.publication_id)
+        if not publication:
+            raise HTTPException(status_code=404, detail="Publication not found")
+        text, parse_mode = publication_message(publication), "HTML"
+    elif broadcast.campaign_id is not None:
+        campaign = await db.get(DonationCampaign, broadcast.campaign_id)
+        if not campaign:
+            raise HTTPException(status_code=404, detail="Campaign not found")
+        text, parse_mode = campaign_message(campaign), "HTML"
+
+    db_broadcast = TgBroadcast(text=text, parse_mode=parse_mode)
+    db.add(db_broadcast)
+    await db.flush()
+    # Рассылка и задача появляются в БД одной транзакцией
+    await enqueue_async(db, TG_BROADCAST, {"broadcast_id": db_broadcast.id}, commit=False)
+    await db.commit()
+    return await broadcast_crud.get(db, id=db_broadcast.id)
+
+@router.get("/{broadcast_id}", response_model=TgBroadcastRead)
+async def get_broadcast(
+    broadcast_id: int,
+    current_admin: User = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_async_db)
+):
+    broadcast = await broadcast_crud.get(db, id=broadcast_id)
+    if not broadcast:
+        raise HTTPException(status_code=404, detail="Broadcast not found")
+    return broadcast
+
+@router.post("/{broadcast_id}/cancel", response_model=TgBroadcastRead)
+async def cancel_broadcast(
+    broadcast_id: int,
+    current_admin: User = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Останавливает рассылку после текущей пачки получателей"""
+    broadcast = await broadcast_crud.get(db, id=broadcast_id)
+    if not broadcast:
+        raise HTTPException(status_code=404, detail="Broadcast not found")
+    if broadcast.status in (DONE, CANCELLED):
+        raise HTTPException(status_code=400, detail="Broadcast is already finished")
+    return await broadcast_crud.update(db, db_obj=broadcast, obj_in={"status": CANCELLED})
@@ -1,7 +1,11 @@
-from typing import Type, TypeVar, Generic, Optional, List
+from typing import Any, Dict, Type, TypeVar, Generic, Optional, List, Sequence, Union
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from sqlalchemy.ext.declarative import DeclarativeMeta
+from core.database import commit_returning
+from core.pagination import paginate, paginate_async
 
 ModelType = TypeVar("ModelType", bound=DeclarativeMeta)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
@@ -19,12 +23,15 @@ class BaseCRUD(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     ) -> List[ModelType]:
         return db.query(self.model).offset(skip).limit(limit).all()
 
+    def get_page(
+        self, db: Session, *, cursor: Optional[str] = None, limit: int = 100
+    ) -> dict:
+        return paginate(db.query(self.model), self.model, cursor, limit)
+
     def create(self, db: Session, *, obj_in: CreateSchemaType) -> ModelType:
         obj_in_data = obj_in.model_dump()
         db_obj = self.model(**obj_in_data)
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        commit_returning(db, db_obj)
         return db_obj
 
     def update(
@@ -37,13 +44,177 @@ class BaseCRUD(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         update_data = obj_in.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_obj, field, value)
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        commit_returning(db, db_obj)
         return db_obj
 
     def remove(self, db: Session, *, id: int) -> ModelType:
-        obj = db.query(self.model).get(id)
+        obj = db.get(self.model, id)
         db.delete(obj)
         db.commit()
-        return obj 
\ No newline at end of file
+        return obj
+
+    def get_many(self, db: Session, ids: Sequence[int]) -> List[ModelType]:
+        objs = {obj.id: obj for obj in db.query(self.model).filter(self.model.id.in_(ids))}
+        return [objs[id] for id in ids if id in objs]
+
+    def create_many(
+        self, db: Session, *, objs_in: Sequence[Union[CreateSchemaType, Dict[str, Any]]]
+    ) -> List[ModelType]:
+        """Вставляет строки одним INSERT ... RETURNING в одной транзакции"""
+        rows = [obj if isinstance(obj, dict) else obj.model_dump() for obj in objs_in]
+        if not rows:
+            return []
+        ids = db.scalars(
+            insert(self.model).returning(self.model.id, sort_by_parameter_order=True), rows
+        ).all()
+        db.commit()
+        return self.get_many(db, ids)
+
+    def update_many(
+        self, db: Session, *, ids: Sequence[int], obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+    ) -> List[ModelType]:
+        """Применяет одни и те же изменения ко всем строкам из ids одним UPDATE"""
+        data = obj_in if isinstance(obj_in, dict) else obj_in.model_dump(exclude_unset=True)
+        if data:
+            stmt = update(self.model).where(self.model.id.in_(ids)).values(**data)
+            ids = db.scalars(
+                stmt.returning(self.model.id).execution_options(synchronize_session=False)
+            ).all()
+            db.commit()
+        return self.get_many(db, ids)
+
+    def remove_many(self, db: Session, *, ids: Sequence[int]) -> List[int]:
+        """Удаляет строки одним DELETE; возвращает id удаленных.
+        Связанные строки удаляются каскадом в БД (ondelete), а не ORM"""
+        deleted = db.scalars(
+            delete(self.model)
+            .where(self.model.id.in_(ids))
+            .returning(self.model.id)
+            .execution_options(synchronize_session=False)
+        ).all()
+        db.commit()
+        return list(deleted)
+
+class AsyncBaseCRUD(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    """Асинхронный аналог BaseCRUD для AsyncSession.
+
+    options - опции загрузки связей (selectinload и т.п.), которые нужны
+    при сериализации ответа: ленивая загрузка в AsyncSession недоступна.
+    """
+
+    def __init__(self, model: Type[ModelType], options: Sequence[Any] = ()):
+        self.model = model
+        self.options = options
+
+    def _select(self):
+        return select(self.model).options(*self.options)
+
+    async def _reload(self, db: AsyncSession, db_obj: ModelType) -> ModelType:
+        # Серверные значения уже пришли в RETURNING (expire_on_commit=False);
+        # SELECT нужен только чтобы подгрузить связи из options
+        if not self.options:
+            return db_obj
+        stmt = (
+            self._select()
+            .filter(self.model.id == db_obj.id)
+            .execution_options(populate_existing=True)
+        )
+        return (await db.scalars(stmt)).one()
+
+    async def get_many(self, db: AsyncSession, ids: Sequence[int]) -> List[ModelType]:
+        # Один SELECT для всей пачки, порядок - как в ids
+        stmt = (
+            self._select()
+            .filter(self.model.id.in_(ids))
+            .execution_options(populate_existing=True)
+        )
+        objs = {obj.id: obj for obj in (await db.scalars(stmt)).all()}
+        return [objs[id] for id in ids if id in objs]
+
+    async def get(self, db: AsyncSession, id: int) -> Optional[ModelType]:
+        return (await db.scalars(self._select().filter(self.model.id == id))).first()
+
+    async def get_multi(
+        self, db: AsyncSession, *, skip: int = 0, limit: int = 100
+    ) -> List[ModelType]:
+        return (await db.scalars(self._select().offset(skip).limit(limit))).all()
+
+    async def get_page(
+        self, db: AsyncSession, *, cursor: Optional[str] = None, limit: int = 100
+    ) -> dict:
+        return await paginate_async(db, self._select(), self.model, cursor, limit)
+
+    async def create(
+        self, db: AsyncSession, *, obj_in: Union[CreateSchemaType, Dict[str, Any]]
+    ) -> ModelType:
+        obj_in_data = obj_in if isinstance(obj_in, dict) else obj_in.model_dump()
+        db_obj = self.model(**obj_in_data)
+        db.add(db_obj)
+        await db.commit()
+        return await self._reload(db, db_obj)
+
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: ModelType,
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+    ) -> ModelType:
+        if isinstance(obj_in, dict):
+            update_data = obj_in
+        else:
+            update_data = obj_in.model_dump(exclude_unset=True)
+        for field, value in update_data.items():
+            setattr(db_obj, field, value)
+        db.add(db_obj)
+        await db.commit()
+        return await self._reload(db, db_obj)
+
+    async def remove(self, db: AsyncSession, *, id: int) -> Optional[ModelType]:
+        obj = await db.get(self.model, id)
+        if obj is not None:
+            await db.delete(obj)
+            await db.commit()
+        return obj
+
+    async def create_many(
+        self, db: AsyncSession, *, objs_in: Sequence[Union[CreateSchemaType, Dict[str, Any]]]
+    ) -> List[ModelType]:
+        """Вставляет строки одним INSERT ... RETURNING в одной транзакции"""
+        rows = [obj if isinstance(obj, dict) else obj.model_dump() for obj in objs_in]
+        if not rows:
+            return []
+        ids = (await db.scalars(
+            insert(self.model).returning(self.model.id, sort_by_parameter_order=True), rows
+        )).all()
+        await db.commit()
+        return await self.get_many(db, ids)
+
+    async def update_many(
+        self,
+        db: AsyncSession,
+        *,
+        ids: Sequence[int],
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+    ) -> List[ModelType]:
+        """Применяет одни и те же изменения ко всем строкам из ids одним UPDATE"""
+        data = obj_in if isinstance(obj_in, dict) else obj_in.model_dump(exclude_unset=True)
+        if data:
+            stmt = update(self.model).where(self.model.id.in_(ids)).values(**data)
+            ids = (await db.scalars(
+                stmt.returning(self.model.id).execution_options(synchronize_session=False)
+            )).all()
+            await db.commit()
+        return await self.get_many(db, ids)
+
+    async def remove_many(self, db: AsyncSession, *, ids: Sequence[int]) -> List[int]:
+        """Удаляет строки одним DELETE; возвращает id удаленных.
+        Связанные строки удаляются каскадом в БД (ondelete), а не ORM"""
+        deleted = (await db.scalars(
+            delete(self.model)
+            .where(self.model.id.in_(ids))
+            .returning(self.model.id)
+            .execution_options(synchronize_session=False)
+        )).all()
+        await db.commit()
+        return list(deleted)
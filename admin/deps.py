@@ -1,9 +1,8 @@
 from fastapi import Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from jose import jwt, JWTError
-from core.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.database import get_async_db
 from core.config import get_settings
-from users.models import User
+from core.principals import get_principal_async, get_token_subject
 
 settings = get_settings()
 
@@ -12,20 +11,16 @@ if oauth2_scheme is None:
     from fastapi.security import OAuth2PasswordBearer
     oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/token")
 
-def get_current_admin(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+async def get_current_admin(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
-    except JWTError:
+    email = get_token_subject(token)
+    if email is None:
         raise credentials_exception
-    user = db.query(User).filter(User.email == email).first()
+    user = await get_principal_async(db, "email", email)
     if user is None:
         raise credentials_exception
     if not user.is_superuser:
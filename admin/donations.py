@@ -1,77 +1,130 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Union
 
-from core.database import get_db
+from core.database import get_async_db
 from users.models import User
 from donations.models import DonationCampaign, Wallet
 from donations.schemas import DonationCampaignCreate, DonationCampaignUpdate, DonationCampaignResponse, WalletCreate, WalletUpdate, WalletResponse
 from admin.deps import get_current_admin
-from admin.crud import BaseCRUD
+from admin.crud import AsyncBaseCRUD
+from admin.schemas import BatchCreate, BatchDeleteResult, BatchIds, BatchUpdate
+from core.cache import get_cache
+from core.pagination import Page
 
 router = APIRouter(prefix="/admin/donations", tags=["admin-donations"])
 
-campaign_crud = BaseCRUD(DonationCampaign)
-wallet_crud = BaseCRUD(Wallet)
+campaign_crud = AsyncBaseCRUD(DonationCampaign)
+wallet_crud = AsyncBaseCRUD(Wallet)
 
 # --- Campaigns ---
-@router.get("/campaigns", response_model=List[DonationCampaignResponse])
-async def get_campaigns(current_admin: User = Depends(get_current_admin), db: Session = Depends(get_db), skip: int = 0, limit: int = 100):
-    return campaign_crud.get_multi(db, skip=skip, limit=limit)
+@router.get("/campaigns", response_model=Union[Page[DonationCampaignResponse], List[DonationCampaignResponse]])
+async def get_campaigns(current_admin: User = Depends(get_current_admin), db: AsyncSession = Depends(get_async_db), skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+    if cursor is not None:
+        return await campaign_crud.get_page(db, cursor=cursor, limit=limit)
+    return await campaign_crud.get_multi(db, skip=skip, limit=limit)
 
 @router.get("/campaigns/{campaign_id}", response_model=DonationCampaignResponse)
-async def get_campaign(campaign_id: int, current_admin: User = Depends(get_current_admin), db: Session = Depends(get_db)):
-    campaign = campaign_crud.get(db, id=campaign_id)
+async def get_campaign(campaign_id: int, current_admin: User = Depends(get_current_admin), db: AsyncSession = Depends(get_async_db)):
+    campaign = await campaign_crud.get(db, id=campaign_id)
     if not campaign:
         raise HTTPException(status_code=404, detail="Campaign not found")
     return campaign
 
 @router.post("/campaigns", response_model=DonationCampaignResponse)
-async def create_campaign(campaign_in: DonationCampaignCreate, current_admin: User = Depends(get_current_admin), db: Session = Depends(get_db)):
-    return campaign_crud.create(db, obj_in=campaign_in)
+async def create_campaign(campaign_in: DonationCampaignCreate, current_admin: User = Depends(get_current_admin), db: AsyncSession = Depends(get_async_db)):
+    campaign = await campaign_crud.create(db, obj_in=campaign_in)
+    await get_cache().invalidate("donations")
+    return campaign
 
 @router.put("/campaigns/{campaign_id}", response_model=DonationCampaignResponse)
-async def update_campaign(campaign_id: int, campaign_in: DonationCampaignUpdate, current_admin: User = Depends(get_current_admin), db: Session = Depends(get_db)):
-    campaign = campaign_crud.get(db, id=campaign_id)
+async def update_campaign(campaign_id: int, campaign_in: DonationCampaignUpdate, current_admin: User = Depends(get_current_admin), db: AsyncSession = Depends(get_async_db)):
+    campaign = await campaign_crud.get(db, id=campaign_id)
     if not campaign:
         raise HTTPException(status_code=404, detail="Campaign not found")
-    return campaign_crud.update(db, db_obj=campaign, obj_in=campaign_in)
+    campaign = await campaign_crud.update(db, db_obj=campaign, obj_in=campaign_in)
+    await get_cache().invalidate("donations")
+    return campaign
 
 @router.delete("/campaigns/{campaign_id}")
-async def delete_campaign(campaign_id: int, current_admin: User = Depends(get_current_admin), db: Session = Depends(get_db)):
-    campaign = campaign_crud.get(db, id=campaign_id)
+async def delete_campaign(campaign_id: int, current_admin: User = Depends(get_current_admin), db: AsyncSession = Depends(get_async_db)):
+    campaign = await campaign_crud.get(db, id=campaign_id)
     if not campaign:
         raise HTTPException(status_code=404, detail="Campaign not found")
-    campaign_crud.remove(db, id=campaign_id)
+    await campaign_crud.remove(db, id=campaign_id)
+    await get_cache().invalidate("donations")
     return {"message": "Campaign deleted successfully"}
 
+@router.post("/campaigns/batch", response_model=List[DonationCampaignResponse])
+async def create_campaigns(batch: BatchCreate[DonationCampaignCreate], current_admin: User = Depends(get_current_admin), db: AsyncSession = Depends(get_async_db)):
+    campaigns = await campaign_crud.create_many(db, objs_in=batch.items)
+    await get_cache().invalidate("donations")
+    return campaigns
+
+@router.patch("/campaigns/batch", response_model=List[DonationCampaignResponse])
+async def update_campaigns(batch: BatchUpdate[DonationCampaignUpdate], current_admin: User = Depends(get_current_admin), db: AsyncSession = Depends(get_async_db)):
+    campaigns = await campaign_crud.update_many(db, ids=batch.ids, obj_in=batch.data)
+    await get_cache().invalidate("donations")
+    return campaigns
+
+@router.post("/campaigns/batch/delete", response_model=BatchDeleteResult)
+async def delete_campaigns(batch: BatchIds, current_admin: User = Depends(get_current_admin), db: AsyncSession = Depends(get_async_db)):
+    deleted = await campaign_crud.remove_many(db, ids=batch.ids)
+    await get_cache().invalidate("donations")
+    return {"deleted": deleted, "not_found": sorted(set(batch.ids) - set(deleted))}
+
 # --- Wallets ---
-@router.get("/wallets", response_model=List[WalletResponse])
-async def get_wallets(current_admin: User = Depends(get_current_admin), db: Session = Depends(get_db), skip: int = 0, limit: int = 100):
-    return wallet_crud.get_multi(db, skip=skip, limit=limit)
+@router.get("/wallets", response_model=Union[Page[WalletResponse], List[WalletResponse]])
+async def get_wallets(current_admin: User = Depends(get_current_admin), db: AsyncSession = Depends(get_async_db), skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+    if cursor is not None:
+        return await wallet_crud.get_page(db, cursor=cursor, limit=limit)
+    return await wallet_crud.get_multi(db, skip=skip, limit=limit)
 
 @router.get("/wallets/{wallet_id}", response_model=WalletResponse)
-async def get_wallet(wallet_id: int, current_admin: User = Depends(get_current_admin), db: Session = Depends(get_db)):
-    wallet = wallet_crud.get(db, id=wallet_id)
+async def get_wallet(wallet_id: int, current_admin: User = Depends(get_current_admin), db: AsyncSession = Depends(get_async_db)):
+    wallet = await wallet_crud.get(db, id=wallet_id)
     if not wallet:
         raise HTTPException(status_code=404, detail="Wallet not found")
     return wallet
 
 @router.post("/wallets", response_model=WalletResponse)
-async def create_wallet(wallet_in: WalletCreate, current_admin: User = Depends(get_current_admin), db: Session = Depends(get_db)):
-    return wallet_crud.create(db, obj_in=wallet_in)
+async def create_wallet(wallet_in: WalletCreate, current_admin: User = Depends(get_current_admin), db: AsyncSession = Depends(get_async_db)):
+    wallet = await wallet_crud.create(db, obj_in=wallet_in)
+    await get_cache().invalidate("donations")
+    return wallet
 
 @router.put("/wallets/{wallet_id}", response_model=WalletResponse)
-async def update_wallet(wallet_id: int, wallet_in: WalletUpdate, current_admin: User = Depends(get_current_admin), db: Session = Depends(get_db)):
-    wallet = wallet_crud.get(db, id=wallet_id)
+async def update_wallet(wallet_id: int, wallet_in: WalletUpdate, current_admin: User = Depends(get_current_admin), db: AsyncSession = Depends(get_async_db)):
+    wallet = await wallet_crud.get(db, id=wallet_id)
     if not wallet:
         raise HTTPException(status_code=404, detail="Wallet not found")
-    return wallet_crud.update(db, db_obj=wallet, obj_in=wallet_in)
+    wallet = await wallet_crud.update(db, db_obj=wallet, obj_in=wallet_in)
+    await get_cache().invalidate("donations")
+    return wallet
 
 @router.delete("/wallets/{wallet_id}")
-async def delete_wallet(wallet_id: int, current_admin: User = Depends(get_current_admin), db: Session = Depends(get_db)):
-    wallet = wallet_crud.get(db, id=wallet_id)
+async def delete_wallet(wallet_id: int, current_admin: User = Depends(get_current_admin), db: AsyncSession = Depends(get_async_db)):
+    wallet = await wallet_crud.get(db, id=wallet_id)
     if not wallet:
         raise HTTPException(status_code=404, detail="Wallet not found")
-    wallet_crud.remove(db, id=wallet_id)
-    return {"message": "Wallet deleted successfully"} 
\ No newline at end of file
+    await wallet_crud.remove(db, id=wallet_id)
+    await get_cache().invalidate("donations")
+    return {"message": "Wallet deleted successfully"}
+
+@router.post("/wallets/batch", response_model=List[WalletResponse])
+async def create_wallets(batch: BatchCreate[WalletCreate], current_admin: User = Depends(get_current_admin), db: AsyncSession = Depends(get_async_db)):
+    wallets = await wallet_crud.create_many(db, objs_in=batch.items)
+    await get_cache().invalidate("donations")
+    return wallets
+
+@router.patch("/wallets/batch", response_model=List[WalletResponse])
+async def update_wallets(batch: BatchUpdate[WalletUpdate], current_admin: User = Depends(get_current_admin), db: AsyncSession = Depends(get_async_db)):
+    wallets = await wallet_crud.update_many(db, ids=batch.ids, obj_in=batch.data)
+    await get_cache().invalidate("donations")
+    return wallets
+
+@router.post("/wallets/batch/delete", response_model=BatchDeleteResult)
+async def delete_wallets(batch: BatchIds, current_admin: User = Depends(get_current_admin), db: AsyncSession = Depends(get_async_db)):
+    deleted = await wallet_crud.remove_many(db, ids=batch.ids)
+    await get_cache().invalidate("donations")
+    return {"deleted": deleted, "not_found": sorted(set(batch.ids) - set(deleted))}
@@ -1,34 +1,39 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Union
 
-from core.database import get_db
+from core.database import get_async_db
 from users.models import User
 from feedback.models import Feedback
 from feedback.schemas import FeedbackCreate, FeedbackUpdate, FeedbackRead
 from admin.deps import get_current_admin
-from admin.crud import BaseCRUD
+from admin.crud import AsyncBaseCRUD
+from admin.schemas import BatchCreate, BatchDeleteResult, BatchIds, BatchUpdate
+from core.pagination import Page
 
 router = APIRouter(prefix="/admin/feedback", tags=["admin-feedback"])
 
-feedback_crud = BaseCRUD(Feedback)
+feedback_crud = AsyncBaseCRUD(Feedback)
 
-@router.get("/", response_model=List[FeedbackRead])
+@router.get("/", response_model=Union[Page[FeedbackRead], List[FeedbackRead]])
 async def get_feedback(
     current_admin: User = Depends(get_current_admin),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    cursor: Optional[str] = None
 ):
-    return feedback_crud.get_multi(db, skip=skip, limit=limit)
+    if cursor is not None:
+        return await feedback_crud.get_page(db, cursor=cursor, limit=limit)
+    return await feedback_crud.get_multi(db, skip=skip, limit=limit)
 
 @router.get("/{feedback_id}", response_model=FeedbackRead)
 async def get_feedback_item(
     feedback_id: int,
     current_admin: User = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    feedback = feedback_crud.get(db, id=feedback_id)
+    feedback = await feedback_crud.get(db, id=feedback_id)
     if not feedback:
         raise HTTPException(status_code=404, detail="Feedback not found")
     return feedback
@@ -37,30 +42,55 @@ async def get_feedback_item(
 async def create_feedback(
     feedback_in: FeedbackCreate,
     current_admin: User = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    return feedback_crud.create(db, obj_in=feedback_in)
+    return await feedback_crud.create(db, obj_in=feedback_in)
 
 @router.put("/{feedback_id}", response_model=FeedbackRead)
 async def update_feedback(
     feedback_id: int,
     feedback_in: FeedbackUpdate,
     current_admin: User = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    feedback = feedback_crud.get(db, id=feedback_id)
+    feedback = await feedback_crud.get(db, id=feedback_id)
     if not feedback:
         raise HTTPException(status_code=404, detail="Feedback not found")
-    return feedback_crud.update(db, db_obj=feedback, obj_in=feedback_in)
+    return await feedback_crud.update(db, db_obj=feedback, obj_in=feedback_in)
 
 @router.delete("/{feedback_id}")
 async def delete_feedback(
     feedback_id: int,
     current_admin: User = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    feedback = feedback_crud.get(db, id=feedback_id)
+    feedback = await feedback_crud.get(db, id=feedback_id)
     if not feedback:
         raise HTTPException(status_code=404, detail="Feedback not found")
-    feedback_crud.remove(db, id=feedback_id)
-    return {"message": "Feedback deleted successfully"} 
\ No newline at end of file
+    await feedback_crud.remove(db, id=feedback_id)
+    return {"message": "Feedback deleted successfully"}
+
+@router.post("/batch", response_model=List[FeedbackRead])
+async def create_feedback_batch(
+    batch: BatchCreate[FeedbackCreate],
+    current_admin: User = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await feedback_crud.create_many(db, objs_in=batch.items)
+
+@router.patch("/batch", response_model=List[FeedbackRead])
+async def update_feedback_batch(
+    batch: BatchUpdate[FeedbackUpdate],
+    current_admin: User = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await feedback_crud.update_many(db, ids=batch.ids, obj_in=batch.data)
+
+@router.post("/batch/delete", response_model=BatchDeleteResult)
+async def delete_feedback_batch(
+    batch: BatchIds,
+    current_admin: User = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_async_db)
+):
+    deleted = await feedback_crud.remove_many(db, ids=batch.ids)
+    return {"deleted": deleted, "not_found": sorted(set(batch.ids) - set(deleted))}
@@ -0,0 +1,64 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Union
+
+from core.database import get_async_db
+from core.models import Job
+from core.pagination import Page, paginate_async
+from core.queue import DEAD, PENDING, utcnow
+from schemas.job import JobRead
+from users.models import User
+from admin.deps import get_current_admin
+from admin.crud import AsyncBaseCRUD
+
+router = APIRouter(prefix="/admin/jobs", tags=["admin-jobs"])
+
+job_crud = AsyncBaseCRUD(Job)
+
+@router.get("/", response_model=Union[Page[JobRead], List[JobRead]])
+async def get_jobs(
+    current_admin: User = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_async_db),
+    status: Optional[str] = None,
+    kind: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None
+):
+    stmt = select(Job)
+    if status:
+        stmt = stmt.where(Job.status == status)
+    if kind:
+        stmt = stmt.where(Job.kind == kind)
+    if cursor is not None:
+        return await paginate_async(db, stmt, Job, cursor, limit)
+    return (await db.scalars(stmt.order_by(Job.id.desc()).offset(skip).limit(limit))).all()
+
+@router.get("/{job_id}", response_model=JobRead)
+async def get_job(
+    job_id: int,
+    current_admin: User = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_async_db)
+):
+    job = await job_crud.get(db, id=job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@router.post("/{job_id}/retry", response_model=JobRead)
+async def retry_job(
+    job_id: int,
+    current_admin: User = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_async_db)
+):
+    job = await job_crud.get(db, id=job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status != DEAD:
+        raise HTTPException(status_code=400, detail="Only dead jobs can be retried")
+    return await job_crud.update(
+        db,
+        db_obj=job,
+        obj_in={"status": PENDING, "attempts": 0, "run_at": utcnow(), "last_error": None},
+    )
@@ -1,42 +1,58 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
-from sqlalchemy.orm import Session
-from typing import List
-import shutil
-import os
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, UploadFile, File, Header, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from typing import List, Optional, Union
 from pathlib import Path
 
-from core.database import get_db
+from core.database import get_async_db
 from users.models import User
 from publications.models import Publication, PublicationImage, PublicationVideo
-from publications.schemas import PublicationCreate, PublicationUpdate, PublicationResponse
+from publications.schemas import PublicationCreate, PublicationUpdate, PublicationResponse, ResumableUploadCreate, ResumableUploadStatus
 from admin.deps import get_current_admin
-from admin.crud import BaseCRUD
+from admin.crud import AsyncBaseCRUD
+from admin.schemas import BatchCreate, BatchDeleteResult, BatchIds, BatchUpdate
+from core.cache import get_cache
+from core.pagination import Page
 from core.config import get_settings
+from core.images import generate_derivatives
+from core.queue import enqueue_async
+from publications.tasks import PIN_PUBLICATION
+from schemas.job import JobRead
+from core.storage import media_ext, media_store
+from core.uploads import ResumableUploads, safe_filename
 
 settings = get_settings()
 router = APIRouter(prefix="/admin/publications", tags=["admin-publications"])
 
-publication_crud = BaseCRUD(Publication)
-image_crud = BaseCRUD(PublicationImage)
-video_crud = BaseCRUD(PublicationVideo)
+publication_crud = AsyncBaseCRUD(
+    Publication,
+    options=[selectinload(Publication.images), selectinload(Publication.videos)],
+)
+image_crud = AsyncBaseCRUD(PublicationImage)
+video_crud = AsyncBaseCRUD(PublicationVideo)
+resumable_uploads = ResumableUploads(Path(settings.UPLOAD_DIR) / ".incoming", settings.UPLOAD_RESUMABLE_TTL)
 
 # Publications
-@router.get("/", response_model=List[PublicationResponse])
+@router.get("/", response_model=Union[Page[PublicationResponse], List[PublicationResponse]])
 async def get_publications(
     current_admin: User = Depends(get_current_admin),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    cursor: Optional[str] = None
 ):
-    return publication_crud.get_multi(db, skip=skip, limit=limit)
+    if cursor is not None:
+        return await publication_crud.get_page(db, cursor=cursor, limit=limit)
+    return await publication_crud.get_multi(db, skip=skip, limit=limit)
 
 @router.get("/{publication_id}", response_model=PublicationResponse)
 async def get_publication(
     publication_id: int,
     current_admin: User = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    publication = publication_crud.get(db, id=publication_id)
+    publication = await publication_crud.get(db, id=publication_id)
     if not publication:
         raise HTTPException(status_code=404, detail="Publication not found")
     return publication
@@ -44,78 +60,182 @@ async def get_publication(
 @router.post("/", response_model=PublicationResponse)
 async def create_publication(
     publication_in: PublicationCreate,
+    background_tasks: BackgroundTasks,
     current_admin: User = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    return publication_crud.create(db, obj_in=publication_in)
+    publication = await publication_crud.create(db, obj_in=publication_in)
+    if publication.photo:
+        background_tasks.add_task(generate_derivatives, publication.photo)
+    await get_cache().invalidate("publications")
+    return publication
 
 @router.put("/{publication_id}", response_model=PublicationResponse)
 async def update_publication(
     publication_id: int,
     publication_in: PublicationUpdate,
+    background_tasks: BackgroundTasks,
     current_admin: User = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    publication = publication_crud.get(db, id=publication_id)
+    publication = await publication_crud.get(db, id=publication_id)
     if not publication:
         raise HTTPException(status_code=404, detail="Publication not found")
-    return publication_crud.update(db, db_obj=publication, obj_in=publication_in)
+    old_files = (publication.photo, publication.file_path)
+    publication = await publication_crud.update(db, db_obj=publication, obj_in=publication_in)
+    await media_store.release(db, old_files)
+    if publication.photo and publication.photo not in old_files:
+        background_tasks.add_task(generate_derivatives, publication.photo)
+    await get_cache().invalidate("publications")
+    return publication
 
 @router.delete("/{publication_id}")
 async def delete_publication(
     publication_id: int,
     current_admin: User = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    publication = publication_crud.get(db, id=publication_id)
+    publication = await publication_crud.get(db, id=publication_id)
     if not publication:
         raise HTTPException(status_code=404, detail="Publication not found")
-    publication_crud.remove(db, id=publication_id)
+    files = [publication.photo, publication.file_path]
+    files += [image.image for image in publication.images]
+    files += [video.video for video in publication.videos]
+    await publication_crud.remove(db, id=publication_id)
+    await media_store.release(db, files)
+    await get_cache().invalidate("publications")
     return {"message": "Publication deleted successfully"}
 
+@router.post("/batch", response_model=List[PublicationResponse])
+async def create_publications(
+    batch: BatchCreate[PublicationCreate],
+    background_tasks: BackgroundTasks,
+    current_admin: User = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_async_db)
+):
+    publications = await publication_crud.create_many(db, objs_in=batch.items)
+    for publication in publications:
+        if publication.photo:
+            background_tasks.add_task(generate_derivatives, publication.photo)
+    await get_cache().invalidate("publications")
+    return publications
+
+@router.patch("/batch", response_model=List[PublicationResponse])
+async def update_publications(
+    batch: BatchUpdate[PublicationUpdate],
+    background_tasks: BackgroundTasks,
+    current_admin: User = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Одинаковые изменения для всех ids (например, снять с публикации) одним UPDATE"""
+    old_files = (await db.execute(
+        select(Publication.photo, Publication.file_path).where(Publication.id.in_(batch.ids))
+    )).all()
+    publications = await publication_crud.update_many(db, ids=batch.ids, obj_in=batch.data)
+    await media_store.release(db, [key for files in old_files for key in files])
+    if batch.data.photo:
+        background_tasks.add_task(generate_derivatives, batch.data.photo)
+    await get_cache().invalidate("publications")
+    return publications
+
+@router.post("/batch/delete", response_model=BatchDeleteResult)
+async def delete_publications(
+    batch: BatchIds,
+    current_admin: User = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_async_db)
+):
+    files = []
+    for publication in await publication_crud.get_many(db, batch.ids):
+        files += [publication.photo, publication.file_path]
+        files += [image.image for image in publication.images]
+        files += [video.video for video in publication.videos]
+    deleted = await publication_crud.remove_many(db, ids=batch.ids)
+    await media_store.release(db, files)
+    await get_cache().invalidate("publications")
+    return {"deleted": deleted, "not_found": sorted(set(batch.ids) - set(deleted))}
+
+@router.post("/{publication_id}/pin", response_model=JobRead)
+async def pin_publication(
+    publication_id: int,
+    current_admin: User = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Ставит закрепление файлов публикации в IPFS в очередь; статус - в /admin/jobs/{id}"""
+    if not await db.get(Publication, publication_id):
+        raise HTTPException(status_code=404, detail="Publication not found")
+    return await enqueue_async(db, PIN_PUBLICATION, {"publication_id": publication_id})
+
+# Photo and attached file: streamed to disk via media_store
+@router.put("/{publication_id}/photo", response_model=PublicationResponse)
+async def upload_photo(
+    publication_id: int,
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    current_admin: User = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_async_db)
+):
+    publication = await publication_crud.get(db, id=publication_id)
+    if not publication:
+        raise HTTPException(status_code=404, detail="Publication not found")
+    key = await media_store.put_upload(file, settings.MAX_IMAGE_SIZE)
+    old_photo = publication.photo
+    publication = await publication_crud.update(db, db_obj=publication, obj_in={"photo": key})
+    await media_store.release(db, [old_photo])
+    await get_cache().invalidate("publications")
+    background_tasks.add_task(generate_derivatives, key)
+    return publication
+
+@router.put("/{publication_id}/file", response_model=PublicationResponse)
+async def upload_file(
+    publication_id: int,
+    file: UploadFile = File(...),
+    current_admin: User = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_async_db)
+):
+    publication = await publication_crud.get(db, id=publication_id)
+    if not publication:
+        raise HTTPException(status_code=404, detail="Publication not found")
+    key = await media_store.put_upload(file, settings.MAX_FILE_SIZE)
+    old_file = publication.file_path
+    publication = await publication_crud.update(db, db_obj=publication, obj_in={"file_path": key})
+    await media_store.release(db, [old_file])
+    await get_cache().invalidate("publications")
+    return publication
+
 # Images
 @router.post("/{publication_id}/images")
 async def upload_image(
     publication_id: int,
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     current_admin: User = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    publication = publication_crud.get(db, id=publication_id)
-    if not publication:
+    if not await db.get(Publication, publication_id):
         raise HTTPException(status_code=404, detail="Publication not found")
 
-    upload_dir = Path(settings.UPLOAD_DIR) / "publications" / str(publication_id) / "images"
-    upload_dir.mkdir(parents=True, exist_ok=True)
+    key = await media_store.put_upload(file, settings.MAX_IMAGE_SIZE)
 
-    file_path = upload_dir / file.filename
-    with file_path.open("wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-
-    image = PublicationImage(
-        publication_id=publication_id,
-        path=str(file_path.relative_to(settings.UPLOAD_DIR))
-    )
+    image = PublicationImage(publication_id=publication_id, image=key)
     db.add(image)
-    db.commit()
-    db.refresh(image)
-    return {"message": "Image uploaded successfully", "image_id": image.id}
+    await db.commit()
+    background_tasks.add_task(generate_derivatives, key)
+    await get_cache().invalidate("publications")
+    return {"message": "Image uploaded successfully", "image_id": image.id, "image": key}
 
 @router.delete("/images/{image_id}")
 async def delete_image(
     image_id: int,
     current_admin: User = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    image = image_crud.get(db, id=image_id)
+    image = await image_crud.get(db, id=image_id)
     if not image:
         raise HTTPException(status_code=404, detail="Image not found")
     
-    file_path = Path(settings.UPLOAD_DIR) / image.path
-    if file_path.exists():
-        file_path.unlink()
-    
-    image_crud.remove(db, id=image_id)
+    await image_crud.remove(db, id=image_id)
+    await media_store.release(db, [image.image])
+    await get_cache().invalidate("publications")
     return {"message": "Image deleted successfully"}
 
 # Videos
@@ -124,41 +244,107 @@ async def upload_video(
     publication_id: int,
     file: UploadFile = File(...),
     current_admin: User = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    publication = publication_crud.get(db, id=publication_id)
-    if not publication:
+    if not await db.get(Publication, publication_id):
         raise HTTPException(status_code=404, detail="Publication not found")
 
-    upload_dir = Path(settings.UPLOAD_DIR) / "publications" / str(publication_id) / "videos"
-    upload_dir.mkdir(parents=True, exist_ok=True)
+    key = await media_store.put_upload(file, settings.MAX_VIDEO_SIZE)
 
-    file_path = upload_dir / file.filename
-    with file_path.open("wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-
-    video = PublicationVideo(
-        publication_id=publication_id,
-        path=str(file_path.relative_to(settings.UPLOAD_DIR))
-    )
+    video = PublicationVideo(publication_id=publication_id, video=key)
     db.add(video)
-    db.commit()
-    db.refresh(video)
-    return {"message": "Video uploaded successfully", "video_id": video.id}
+    await db.commit()
+    await get_cache().invalidate("publications")
+    return {"message": "Video uploaded successfully", "video_id": video.id, "video": key}
 
 @router.delete("/videos/{video_id}")
 async def delete_video(
     video_id: int,
     current_admin: User = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    video = video_crud.get(db, id=video_id)
+    video = await video_crud.get(db, id=video_id)
     if not video:
         raise HTTPException(status_code=404, detail="Video not found")
     
-    file_path = Path(settings.UPLOAD_DIR) / video.path
-    if file_path.exists():
-        file_path.unlink()
-    
-    video_crud.remove(db, id=video_id)
-    return {"message": "Video deleted successfully"} 
\ No newline at end of file
+    await video_crud.remove(db, id=video_id)
+    await media_store.release(db, [video.video])
+    await get_cache().invalidate("publications")
+    return {"message": "Video deleted successfully"}
+
+# Resumable video uploads: create -> PATCH parts with Upload-Offset -> complete
+@router.post("/{publication_id}/videos/uploads", response_model=ResumableUploadStatus)
+async def create_video_upload(
+    publication_id: int,
+    upload_in: ResumableUploadCreate,
+    current_admin: User = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_async_db)
+):
+    if not await db.get(Publication, publication_id):
+        raise HTTPException(status_code=404, detail="Publication not found")
+    upload_id = await resumable_uploads.create(
+        upload_in.size,
+        settings.MAX_VIDEO_SIZE,
+        {"publication_id": publication_id, "filename": safe_filename(upload_in.filename)},
+    )
+    return await resumable_uploads.status(upload_id)
+
+@router.get("/uploads/{upload_id}", response_model=ResumableUploadStatus)
+async def get_video_upload(
+    upload_id: str,
+    response: Response,
+    current_admin: User = Depends(get_current_admin)
+):
+    status = await resumable_uploads.status(upload_id)
+    response.headers["Upload-Offset"] = str(status["offset"])
+    return status
+
+@router.patch("/uploads/{upload_id}", response_model=ResumableUploadStatus)
+async def append_video_upload(
+    upload_id: str,
+    request: Request,
+    response: Response,
+    upload_offset: int = Header(..., alias="Upload-Offset"),
+    current_admin: User = Depends(get_current_admin)
+):
+    offset = await resumable_uploads.append(upload_id, upload_offset, request.stream())
+    response.headers["Upload-Offset"] = str(offset)
+    return await resumable_uploads.status(upload_id)
+
+@router.post("/uploads/{upload_id}/complete")
+async def complete_video_upload(
+    upload_id: str,
+    current_admin: User = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_async_db)
+):
+    status = await resumable_uploads.status(upload_id)
+    publication_id = status["publication_id"]
+    if not await db.get(Publication, publication_id):
+        raise HTTPException(status_code=404, detail="Publication not found")
+
+    stored = await resumable_uploads.complete(upload_id, media_store.tmp_path())
+    key = await media_store.put(stored, media_ext(status["filename"]))
+
+    video = PublicationVideo(publication_id=publication_id, video=key)
+    db.add(video)
+    await db.commit()
+    await get_cache().invalidate("publications")
+    return {"message": "Video uploaded successfully", "video_id": video.id, "video": key}
+
+@router.delete("/uploads/{upload_id}")
+async def abort_video_upload(
+    upload_id: str,
+    current_admin: User = Depends(get_current_admin)
+):
+    await resumable_uploads.abort(upload_id)
+    return {"message": "Upload aborted"}
+
+# Media storage
+@router.post("/media/gc")
+async def collect_media_garbage(
+    current_admin: User = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_async_db)
+):
+    removed = await media_store.collect_garbage(db)
+    stale_uploads = await resumable_uploads.collect_stale()
+    return {"message": "Orphaned media removed", "removed": removed, "stale_uploads": stale_uploads}
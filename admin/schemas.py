@@ -0,0 +1,27 @@
+from typing import Generic, List, TypeVar
+
+from pydantic import BaseModel, Field
+
+T = TypeVar("T")
+
+# Строк в одном пакетном запросе админки
+MAX_BATCH_SIZE = 500
+
+
+class BatchCreate(BaseModel, Generic[T]):
+    items: List[T] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class BatchUpdate(BaseModel, Generic[T]):
+    """Одинаковые изменения для всех ids"""
+    ids: List[int] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+    data: T
+
+
+class BatchIds(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class BatchDeleteResult(BaseModel):
+    deleted: List[int]
+    not_found: List[int]
@@ -1,11 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
 from sqlalchemy.orm import Session
-from typing import List
-from core.database import get_db
+from typing import List, Literal, Optional
+from core.database import commit_returning, get_db
 from users.models import User
+from tgusers import crud
 from tgusers.models import TgUsers
-from tgusers.schemas import TgUserCreate, TgUserUpdate, TgUserOut
+from tgusers.schemas import TgUserCreate, TgUserUpdate, TgUserOut, TgUserImportResult
 from admin.deps import get_current_admin
+import io
 import uuid
 
 router = APIRouter(prefix="/admin/tg", tags=["admin"])
@@ -16,14 +18,31 @@ def get_tgusers(current_admin: User = Depends(get_current_admin), db: Session =
 
 @router.post("/users", response_model=TgUserOut)
 def create_tguser(user: TgUserCreate, current_admin: User = Depends(get_current_admin), db: Session = Depends(get_db)):
+    if db.query(TgUsers.id).filter(TgUsers.id_telegram == user.id_telegram).first():
+        raise HTTPException(status_code=400, detail="TgUser with this id_telegram already exists")
     user_data = user.dict()
     user_data['uuid_id'] = str(uuid.uuid4())
     tguser = TgUsers(**user_data)
-    db.add(tguser)
-    db.commit()
-    db.refresh(tguser)
+    commit_returning(db, tguser)
     return tguser
 
+@router.post("/users/import", response_model=TgUserImportResult)
+def import_tgusers(
+    file: UploadFile = File(...),
+    format: Optional[Literal["csv", "ndjson"]] = Form(None),
+    current_admin: User = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """Массовый импорт из CSV (id_telegram,name) или NDJSON: новые добавляются,
+    у существующих обновляется имя. Формат по умолчанию - по расширению файла"""
+    if format is None:
+        format = "csv" if (file.filename or "").lower().endswith(".csv") else "ndjson"
+    stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        return crud.import_tg_users(db, stream, format)
+    finally:
+        stream.detach()
+
 @router.put("/users/{tguser_id}", response_model=TgUserOut)
 def update_tguser(tguser_id: int, user: TgUserUpdate, current_admin: User = Depends(get_current_admin), db: Session = Depends(get_db)):
     tguser = db.query(TgUsers).filter(TgUsers.id == tguser_id).first()
@@ -31,8 +50,7 @@ def update_tguser(tguser_id: int, user: TgUserUpdate, current_admin: User = Depe
         raise HTTPException(status_code=404, detail="TgUser not found")
     for field, value in user.dict(exclude_unset=True).items():
         setattr(tguser, field, value)
-    db.commit()
-    db.refresh(tguser)
+    commit_returning(db, tguser)
     return tguser
 
 @router.delete("/users/{tguser_id}")
@@ -1,34 +1,40 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Union
 
-from core.database import get_db
+from core.database import get_async_db
 from users.models import User
 from users.schemas import UserCreate, UserUpdate, UserResponse
 from admin.deps import get_current_admin
-from admin.crud import BaseCRUD
-from core.security import get_password_hash
+from admin.crud import AsyncBaseCRUD
+from core.pagination import Page
+from core.principals import invalidate_principal
+from core.security import get_password_hash_async
 
 router = APIRouter(prefix="/admin/users", tags=["admin-users"])
 
-user_crud = BaseCRUD(User)
+user_crud = AsyncBaseCRUD(User)
 
-@router.get("/", response_model=List[UserResponse])
+@router.get("/", response_model=Union[Page[UserResponse], List[UserResponse]])
 async def get_users(
     current_admin: User = Depends(get_current_admin),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    cursor: Optional[str] = None
 ):
-    return user_crud.get_multi(db, skip=skip, limit=limit)
+    if cursor is not None:
+        return await user_crud.get_page(db, cursor=cursor, limit=limit)
+    return await user_crud.get_multi(db, skip=skip, limit=limit)
 
 @router.get("/{user_id}", response_model=UserResponse)
 async def get_user(
     user_id: int,
     current_admin: User = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    user = user_crud.get(db, id=user_id)
+    user = await user_crud.get(db, id=user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return user
@@ -37,42 +43,46 @@ async def get_user(
 async def create_user(
     user_in: UserCreate,
     current_admin: User = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    if db.query(User).filter(User.email == user_in.email).first():
+    if await db.scalar(select(User).filter(User.email == user_in.email)):
         raise HTTPException(status_code=400, detail="Email already registered")
     
-    hashed_password = get_password_hash(user_in.password)
+    hashed_password = await get_password_hash_async(user_in.password)
     user_data = user_in.model_dump(exclude={"password"})
     user_data["hashed_password"] = hashed_password
     
-    return user_crud.create(db, obj_in=user_data)
+    return await user_crud.create(db, obj_in=user_data)
 
 @router.put("/{user_id}", response_model=UserResponse)
 async def update_user(
     user_id: int,
     user_in: UserUpdate,
     current_admin: User = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    user = user_crud.get(db, id=user_id)
+    user = await user_crud.get(db, id=user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
+    update_data = user_in.model_dump(exclude_unset=True, exclude={"password"})
     if user_in.password:
-        user_in.hashed_password = get_password_hash(user_in.password)
-        user_in = user_in.model_dump(exclude={"password"})
+        update_data["hashed_password"] = await get_password_hash_async(user_in.password)
     
-    return user_crud.update(db, db_obj=user, obj_in=user_in)
+    old_email = user.email
+    user = await user_crud.update(db, db_obj=user, obj_in=update_data)
+    invalidate_principal(user_id=user_id, email=old_email)
+    return user
 
 @router.delete("/{user_id}")
 async def delete_user(
     user_id: int,
     current_admin: User = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    user = user_crud.get(db, id=user_id)
+    user = await user_crud.get(db, id=user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    user_crud.remove(db, id=user_id)
+    await user_crud.remove(db, id=user_id)
+    invalidate_principal(user_id=user_id, email=user.email)
     return {"message": "User deleted successfully"} 
\ No newline at end of file
@@ -1,17 +1,19 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional, Union
 
 from core.database import get_db
 from crud.api_key import (
     create_api_key,
     get_api_key,
     get_api_keys,
+    get_api_keys_page,
     update_api_key,
     delete_api_key
 )
 from schemas.api_key import APIKeyCreate, APIKeyUpdate, APIKeyResponse
 from admin.deps import get_current_admin
+from core.pagination import Page
 
 router = APIRouter(prefix="/admin/api-keys", tags=["admin"])
 
@@ -27,13 +29,16 @@ def create_new_api_key(
     return api_key
 
 
-@router.get("/", response_model=List[APIKeyResponse])
+@router.get("/", response_model=Union[Page[APIKeyResponse], List[APIKeyResponse]])
 def read_api_keys(
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     current_admin: dict = Depends(get_current_admin)
 ):
+    if cursor is not None:
+        return get_api_keys_page(db, cursor=cursor, limit=limit)
     api_keys = get_api_keys(db, skip=skip, limit=limit)
     return api_keys
 
@@ -1,13 +1,11 @@
 from typing import Annotated
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
 from sqlalchemy.orm import Session
 
 from core.config import get_settings
 from core.database import get_db
-from users.crud import get_user_by_email
-from auth.schemas import TokenData
+from core.principals import get_principal, get_token_subject
 
 settings = get_settings()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/token")
@@ -22,16 +20,11 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
-        token_data = TokenData(email=email)
-    except JWTError:
+    email = get_token_subject(token)
+    if email is None:
         raise credentials_exception
         
-    user = get_user_by_email(db, email=token_data.email)
+    user = get_principal(db, "email", email)
     if user is None:
         raise credentials_exception
         
@@ -1,11 +1,13 @@
 from typing import Annotated
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
 from core.database import get_db
 from users.crud import get_user_by_email
-from auth.utils import verify_password, create_access_token
+from auth.utils import create_access_token
+from core.security import verify_and_update_password
 from auth.schemas import Token
 
 router = APIRouter(prefix="/auth", tags=["auth"])
@@ -15,13 +17,20 @@ async def login_for_access_token(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
     db: Annotated[Session, Depends(get_db)]
 ) -> Token:
-    user = get_user_by_email(db, email=form_data.username)
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    user = await run_in_threadpool(get_user_by_email, db, email=form_data.username)
+    verified, new_hash = False, None
+    if user:
+        verified, new_hash = await verify_and_update_password(form_data.password, user.hashed_password)
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    if new_hash:
+        # Хеш со старыми параметрами bcrypt заменяется при успешном входе
+        user.hashed_password = new_hash
+        await run_in_threadpool(db.commit)
     
     access_token = create_access_token(data={"sub": user.email})
     return Token(access_token=access_token, token_type="bearer") 
\ No newline at end of file
@@ -0,0 +1,66 @@
+"""Одновременные входы до и после пула потоков для bcrypt.
+
+Запуск из корня проекта (нужен config.yaml)::
+
+    python -m benchmarks.passwords --logins 16
+
+before - прежний вход: pwd_context.verify прямо в асинхронном обработчике,
+цикл событий стоит, пока считается хеш; after - password_hasher.run_async().
+Кроме общего времени измеряется задержка цикла событий: насколько позже
+срабатывает таймер с шагом 10 мс, то есть сколько ждут все остальные запросы.
+"""
+import argparse
+import asyncio
+import time
+
+from passlib.hash import bcrypt
+
+from core.security import PasswordHasher, pwd_context
+
+TICK = 0.01
+
+
+async def loop_lag(stop: asyncio.Event) -> float:
+    worst = 0.0
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(TICK)
+        worst = max(worst, time.perf_counter() - started - TICK)
+    return worst
+
+
+async def measure(login, logins: int):
+    stop = asyncio.Event()
+    lag = asyncio.create_task(loop_lag(stop))
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    return elapsed, await lag
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=16, help="одновременных входов")
+    parser.add_argument("--rounds", type=int, default=12, help="раунды bcrypt хеша")
+    parser.add_argument("--workers", type=int, default=4, help="потоков в пуле")
+    args = parser.parse_args()
+
+    hashed = bcrypt.using(rounds=args.rounds).hash("password")
+    hasher = PasswordHasher(args.workers, args.logins)
+
+    async def login_before():
+        return pwd_context.verify("password", hashed)
+
+    async def login_after():
+        return await hasher.run_async(pwd_context.verify, "password", hashed)
+
+    for name, login in (("before", login_before), ("after", login_after)):
+        elapsed, lag = asyncio.run(measure(login, args.logins))
+        print(f"{name}: {args.logins} входов за {elapsed * 1000:.0f} ms, "
+              f"{args.logins / elapsed:.1f} вх/с, задержка цикла до {lag * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Рендер писем до и после общего окружения Jinja.
+
+Запуск из корня проекта (нужен config.yaml)::
+
+    python -m benchmarks.templates --count 5000
+
+before - прежний core.templates: окружение с auto_reload по умолчанию,
+шаблон ищется (и проверяется на диске) для каждого письма;
+after - get_env() без auto_reload и render_many() на всю пачку.
+Холодный старт: компиляция шаблона из исходника против загрузки
+байткода из FileSystemBytecodeCache.
+"""
+import argparse
+import tempfile
+import time
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
+
+from core.templates import TEMPLATE_DIR, render_many
+
+TEMPLATE = "feedback_notification.html"
+
+
+def best_of(repeat: int, func, *args) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def new_env(bytecode_cache=None) -> Environment:
+    return Environment(
+        loader=FileSystemLoader(TEMPLATE_DIR),
+        autoescape=select_autoescape(["html", "xml"]),
+        bytecode_cache=bytecode_cache,
+    )
+
+
+def render_before(env: Environment, contexts) -> None:
+    for context in contexts:
+        env.get_template(TEMPLATE).render(**context)
+
+
+def render_after(contexts) -> None:
+    render_many(TEMPLATE, contexts)
+
+
+def cold_compile() -> None:
+    new_env().get_template(TEMPLATE)
+
+
+def cold_bytecode(cache_dir: str) -> None:
+    new_env(FileSystemBytecodeCache(cache_dir)).get_template(TEMPLATE)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=5000, help="писем в пачке")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    contexts = [
+        {"name": f"User {n}", "email": f"user{n}@example.com", "message": "Текст отзыва. " * 20}
+        for n in range(args.count)
+    ]
+    env = new_env()
+    render_before(env, contexts[:1])
+    render_after(contexts[:1])
+    before = best_of(args.repeat, render_before, env, contexts)
+    after = best_of(args.repeat, render_after, contexts)
+    print(f"{args.count} писем: before {before * 1000:.1f} ms, after {after * 1000:.1f} ms "
+          f"({before / after:.2f}x)")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cold_bytecode(cache_dir)
+        compile_time = best_of(args.repeat, cold_compile)
+        bytecode_time = best_of(args.repeat, cold_bytecode, cache_dir)
+    print(f"холодный старт: компиляция {compile_time * 1000:.2f} ms, "
+          f"байткод с диска {bytecode_time * 1000:.2f} ms ({compile_time / bytecode_time:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
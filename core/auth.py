@@ -3,13 +3,13 @@ from typing import Annotated
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
 from sqlalchemy.orm import Session
 
 from core.config import get_settings
 from core.database import get_db
+from core.principals import get_principal, get_token_subject
 from core.security import verify_password
-from users import crud, schemas
+from users import schemas
 
 settings = get_settings()
 
@@ -25,16 +25,10 @@ async def get_current_user(
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
-    except JWTError:
+    user_id = get_token_subject(token)
+    if user_id is None or not user_id.isdigit():
         raise credentials_exception
-    user = crud.get_user(db, user_id=int(user_id))
+    user = get_principal(db, "id", int(user_id))
     if user is None:
         raise credentials_exception
     return user
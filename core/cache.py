@@ -0,0 +1,224 @@
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Hashable, Optional, Sequence, Tuple
+
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+
+from core.config import get_settings
+from core.metrics import record_cache
+
+try:
+    from redis import asyncio as aioredis
+    from redis.exceptions import RedisError
+except ImportError:  # Redis не обязателен: без него работает процессный LRU
+    aioredis = None
+    RedisError = OSError
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "cache:"
+# Сколько секунд не обращаться к Redis после ошибки соединения
+REDIS_RETRY_AFTER = 30
+# Заголовки ответа, которые не сохраняются вместе с телом
+SKIP_HEADERS = {"content-length", "date", "server", "etag"}
+
+
+class TTLCache:
+    """Процессный LRU-кэш с TTL на каждую запись"""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            expires, value = item
+            if expires < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def delete_prefix(self, prefix: str) -> None:
+        with self._lock:
+            for key in [k for k in self._data if isinstance(k, str) and k.startswith(prefix)]:
+                del self._data[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class ResponseCache:
+    """Кэш ответов: Redis, если он настроен и доступен, иначе процессный LRU.
+
+    Без Redis каждый воркер держит свою копию, и инвалидация из админки
+    сбрасывает только кэш того воркера, который обработал запись.
+    """
+
+    def __init__(self, redis=None, default_timeout: int = 300, max_entries: int = 1024):
+        self.redis = redis
+        self.default_timeout = default_timeout
+        self.local = TTLCache(max_entries, default_timeout)
+        self._redis_down_until = 0.0
+
+    def _use_redis(self) -> bool:
+        return self.redis is not None and time.monotonic() >= self._redis_down_until
+
+    def _redis_failed(self, exc: Exception) -> None:
+        logger.warning("Redis cache unavailable, falling back to memory: %s", exc)
+        self._redis_down_until = time.monotonic() + REDIS_RETRY_AFTER
+
+    async def get(self, key: str) -> Optional[dict]:
+        if self._use_redis():
+            try:
+                raw = await self.redis.get(key)
+                return json.loads(raw) if raw else None
+            except (RedisError, OSError) as exc:
+                self._redis_failed(exc)
+        return self.local.get(key)
+
+    async def set(self, key: str, entry: dict, ttl: Optional[int] = None) -> None:
+        ttl = ttl or self.default_timeout
+        if self._use_redis():
+            try:
+                await self.redis.set(key, json.dumps(entry), ex=ttl)
+                return
+            except (RedisError, OSError) as exc:
+                self._redis_failed(exc)
+        self.local.set(key, entry, ttl)
+
+    async def invalidate(self, namespace: str) -> None:
+        """Сбрасывает все закэшированные ответы пространства имен"""
+        prefix = f"{KEY_PREFIX}{namespace}:"
+        self.local.delete_prefix(prefix)
+        if self._use_redis():
+            try:
+                keys = [key async for key in self.redis.scan_iter(match=prefix + "*", count=500)]
+                if keys:
+                    await self.redis.unlink(*keys)
+            except (RedisError, OSError) as exc:
+                self._redis_failed(exc)
+
+
+@lru_cache()
+def get_cache() -> ResponseCache:
+    settings = get_settings()
+    redis = None
+    if settings.CACHE_TYPE == "redis" and aioredis is not None:
+        redis = aioredis.Redis(
+            host=settings.CACHE_HOST,
+            port=settings.CACHE_PORT,
+            db=settings.CACHE_DB,
+            socket_timeout=0.5,
+            socket_connect_timeout=0.5,
+        )
+    return ResponseCache(redis, settings.CACHE_DEFAULT_TIMEOUT, settings.CACHE_MAX_ENTRIES)
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.sha1(body).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Слабое сравнение ETag по RFC 9110 для If-None-Match"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag.removeprefix("W/") in candidates
+
+
+class CacheMiddleware(BaseHTTPMiddleware):
+    """Кэширует успешные GET-ответы публичных эндпоинтов и отвечает 304 по ETag.
+
+    rules - пары (регулярное выражение пути, пространство имен); по
+    пространству имен записи сбрасываются через get_cache().invalidate().
+    """
+
+    def __init__(self, app, rules: Sequence[Tuple[str, str]], ttl: Optional[int] = None):
+        super().__init__(app)
+        self.rules = [(re.compile(pattern), namespace) for pattern, namespace in rules]
+        self.ttl = ttl
+
+    def _namespace(self, request: Request) -> Optional[str]:
+        if request.method != "GET":
+            return None
+        for pattern, namespace in self.rules:
+            if pattern.match(request.url.path):
+                return namespace
+        return None
+
+    async def __call__(self, scope, receive, send):
+        # Остальные запросы (в том числе раздача файлов) проходят без буферизации тела
+        if scope["type"] != "http" or self._namespace(Request(scope)) is None:
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+    async def dispatch(self, request: Request, call_next):
+        namespace = self._namespace(request)
+        if namespace is None:
+            return await call_next(request)
+
+        cache = get_cache()
+        key = f"{KEY_PREFIX}{namespace}:{request.url.path}?{request.url.query}"
+        entry = await cache.get(key)
+        status = "HIT"
+        if entry is None:
+            response = await call_next(request)
+            if response.status_code != 200:
+                return response
+            body = b"".join([chunk async for chunk in response.body_iterator])
+            entry = {
+                # latin-1 переводит любые байты в строку без потерь
+                "body": body.decode("latin-1"),
+                "etag": make_etag(body),
+                "headers": {
+                    name: value for name, value in response.headers.items()
+                    if name not in SKIP_HEADERS
+                },
+            }
+            await cache.set(key, entry, self.ttl)
+            status = "MISS"
+        record_cache(namespace, status == "HIT")
+
+        headers = {
+            **entry["headers"],
+            "ETag": entry["etag"],
+            "Cache-Control": "no-cache",
+            "X-Cache": status,
+        }
+        if etag_matches(request.headers.get("if-none-match"), entry["etag"]):
+            headers.pop("content-type", None)
+            return Response(status_code=304, headers=headers)
+        return Response(content=entry["body"].encode("latin-1"), headers=headers)
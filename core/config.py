@@ -18,6 +18,23 @@ class Settings(BaseSettings):
     SECRET_KEY: str = os.getenv("SECRET_KEY", "your-secret-key")
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    API_KEY_CACHE_SIZE: int = 1024
+    API_KEY_CACHE_TTL: int = 300
+    API_KEY_NEGATIVE_TTL: int = 60
+    API_KEY_MAX_FAILED_LOOKUPS: int = 100
+    API_KEY_FAILED_LOOKUP_WINDOW: int = 60
+    AUTH_CACHE_SIZE: int = 4096
+    AUTH_PRINCIPAL_TTL: int = 30
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_QUEUE: int = 32
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT: int = 100
+    RATE_LIMIT_PERIOD: int = 60
+    RATE_LIMIT_STORAGE: str = "memory"
+    RATE_LIMIT_RULES: List[dict] = []
+    RATE_LIMIT_EXEMPT: List[str] = []
+    RATE_LIMIT_TRUST_PROXY: bool = False
     
     # Database
     POSTGRES_SERVER: str = os.getenv("POSTGRES_SERVER", "localhost")
@@ -45,10 +62,81 @@ class Settings(BaseSettings):
     MAIL_FROM: str = "your-email@gmail.com"
     MAIL_PORT: int = 587
     MAIL_SERVER: str = "smtp.gmail.com"
+    MAIL_USE_TLS: bool = True
+    MAIL_TIMEOUT: float = 30
+    MAIL_POOL_SIZE: int = 2
+    MAIL_IDLE_TIMEOUT: float = 60
+    MAIL_BATCH_SIZE: int = 20
+    MAIL_FEEDBACK_TO: List[str] = []
+
+    # Cache
+    CACHE_TYPE: str = "memory"
+    CACHE_HOST: str = "localhost"
+    CACHE_PORT: int = 6379
+    CACHE_DB: int = 0
+    CACHE_DEFAULT_TIMEOUT: int = 300
+    CACHE_MAX_ENTRIES: int = 1024
+
+    # Uploads
+    UPLOAD_DIR: str = "uploads"
+    UPLOAD_CHUNK_SIZE: int = 1024 * 1024
+    UPLOAD_RESUMABLE_TTL: int = 24 * 3600
+    MAX_IMAGE_SIZE: int = 20 * 1024 * 1024
+    MAX_VIDEO_SIZE: int = 2 * 1024 * 1024 * 1024
+    MAX_FILE_SIZE: int = 100 * 1024 * 1024
+    MEDIA_GC_GRACE: int = 3600
+    MEDIA_ACCEL_REDIRECT: str = ""
+
+    # Image derivatives
+    IMAGE_SIZES: List[int] = [320, 640, 1280]
+    IMAGE_FORMATS: List[str] = ["webp", "avif"]
+    IMAGE_QUALITY: int = 80
+    IMAGE_WORKERS: int = 2
+
+    # Templates
+    TEMPLATES_AUTO_RELOAD: bool = False
+    TEMPLATES_CACHE_SIZE: int = 400
+    TEMPLATES_BYTECODE_CACHE: str = ""
+
+    # Queue
+    QUEUE_WORKER: bool = True
+    QUEUE_MAX_RETRIES: int = 3
+    QUEUE_RETRY_DELAY: int = 60
+    QUEUE_MAX_RETRY_DELAY: int = 3600
+    QUEUE_POLL_INTERVAL: float = 1.0
+    QUEUE_LEASE_TIMEOUT: int = 300
 
     # Pinata
     PINATA_API_KEY: str
     PINATA_API_SECRET: str
+    PINATA_BASE_URL: str = "https://api.pinata.cloud"
+    PINATA_GATEWAY: str = "https://gateway.pinata.cloud/ipfs"
+    PINATA_BATCH_SIZE: int = 10
+    PINATA_TIMEOUT: float = 300
+
+    # Metrics
+    METRICS_ENABLED: bool = True
+    METRICS_PORT: int = 0
+    METRICS_PATH: str = "/metrics"
+
+    # Telegram
+    BOT_TOKEN: str = ""
+    TELEGRAM_API_URL: str = "https://api.telegram.org"
+    TELEGRAM_TIMEOUT: float = 10
+    TELEGRAM_CONCURRENCY: int = 10
+    TELEGRAM_RATE: float = 25
+    TELEGRAM_BATCH_SIZE: int = 500
+    TELEGRAM_SLICE_SECONDS: float = 60
+
+    # Views
+    VIEWS_STORAGE: str = "memory"
+    VIEWS_FLUSH_INTERVAL: float = 10
+    VIEWS_BATCH_SIZE: int = 500
+
+    # Profiling
+    PROFILING_ENABLED: bool = False
+    PROFILING_N_PLUS_ONE_THRESHOLD: int = 5
+    PROFILING_LOG_STATEMENTS: bool = False
 
     @property
     def get_database_url(self) -> str:
@@ -73,6 +161,16 @@ def load_yaml_config() -> dict:
 @lru_cache()
 def get_settings() -> Settings:
     yaml_config = load_yaml_config()
+    cache = yaml_config.get("cache", {})
+    uploads = yaml_config.get("uploads", {})
+    images = yaml_config.get("images", {})
+    templates = yaml_config.get("templates", {})
+    queue = yaml_config.get("queue", {})
+    pinata = yaml_config.get("pinata", {})
+    metrics = yaml_config.get("metrics", {})
+    profiling = yaml_config.get("profiling", {})
+    views = yaml_config.get("views", {})
+    telegram = yaml_config.get("telegram", {})
     
     return Settings(
         PROJECT_NAME=yaml_config["app"]["name"],
@@ -83,6 +181,23 @@ def get_settings() -> Settings:
         SECRET_KEY=yaml_config["security"]["secret_key"],
         ALGORITHM=yaml_config["security"]["algorithm"],
         ACCESS_TOKEN_EXPIRE_MINUTES=yaml_config["security"]["access_token_expire_minutes"],
+        API_KEY_CACHE_SIZE=yaml_config["security"].get("api_key_cache_size", 1024),
+        API_KEY_CACHE_TTL=yaml_config["security"].get("api_key_cache_ttl", 300),
+        API_KEY_NEGATIVE_TTL=yaml_config["security"].get("api_key_negative_ttl", 60),
+        API_KEY_MAX_FAILED_LOOKUPS=yaml_config["security"].get("api_key_max_failed_lookups", 100),
+        API_KEY_FAILED_LOOKUP_WINDOW=yaml_config["security"].get("api_key_failed_lookup_window", 60),
+        AUTH_CACHE_SIZE=yaml_config["security"].get("auth_cache_size", 4096),
+        AUTH_PRINCIPAL_TTL=yaml_config["security"].get("auth_principal_ttl", 30),
+        BCRYPT_ROUNDS=yaml_config["security"].get("bcrypt_rounds", 12),
+        PASSWORD_HASH_WORKERS=yaml_config["security"].get("password_hash_workers", 2),
+        PASSWORD_HASH_MAX_QUEUE=yaml_config["security"].get("password_hash_max_queue", 32),
+        RATE_LIMIT_ENABLED=yaml_config["security"].get("rate_limit_enabled", True),
+        RATE_LIMIT=yaml_config["security"].get("rate_limit", 100),
+        RATE_LIMIT_PERIOD=yaml_config["security"].get("rate_limit_period", 60),
+        RATE_LIMIT_STORAGE=yaml_config["security"].get("rate_limit_storage", "memory"),
+        RATE_LIMIT_RULES=yaml_config["security"].get("rate_limit_rules", []),
+        RATE_LIMIT_EXEMPT=yaml_config["security"].get("rate_limit_exempt", []),
+        RATE_LIMIT_TRUST_PROXY=yaml_config["security"].get("rate_limit_trust_proxy", False),
         
         POSTGRES_SERVER=yaml_config["database"]["host"],
         POSTGRES_PORT=yaml_config["database"]["port"],
@@ -105,7 +220,69 @@ def get_settings() -> Settings:
         MAIL_FROM=yaml_config["email"]["from"],
         MAIL_PORT=yaml_config["email"]["port"],
         MAIL_SERVER=yaml_config["email"]["server"],
+        MAIL_USE_TLS=yaml_config["email"].get("use_tls", True),
+        MAIL_TIMEOUT=yaml_config["email"].get("timeout", 30),
+        MAIL_POOL_SIZE=yaml_config["email"].get("pool_size", 2),
+        MAIL_IDLE_TIMEOUT=yaml_config["email"].get("idle_timeout", 60),
+        MAIL_BATCH_SIZE=yaml_config["email"].get("batch_size", 20),
+        MAIL_FEEDBACK_TO=yaml_config["email"].get("feedback_to") or [],
+        
+        CACHE_TYPE=cache.get("type", "memory"),
+        CACHE_HOST=cache.get("host", "localhost"),
+        CACHE_PORT=cache.get("port", 6379),
+        CACHE_DB=cache.get("db", 0),
+        CACHE_DEFAULT_TIMEOUT=cache.get("default_timeout", 300),
+        CACHE_MAX_ENTRIES=cache.get("max_entries", 1024),
+        
+        UPLOAD_DIR=uploads.get("dir", "uploads"),
+        UPLOAD_CHUNK_SIZE=uploads.get("chunk_size", 1024 * 1024),
+        UPLOAD_RESUMABLE_TTL=uploads.get("resumable_ttl", 24 * 3600),
+        MAX_IMAGE_SIZE=uploads.get("max_image_size", 20 * 1024 * 1024),
+        MAX_VIDEO_SIZE=uploads.get("max_video_size", 2 * 1024 * 1024 * 1024),
+        MAX_FILE_SIZE=uploads.get("max_file_size", 100 * 1024 * 1024),
+        MEDIA_GC_GRACE=uploads.get("gc_grace", 3600),
+        MEDIA_ACCEL_REDIRECT=uploads.get("accel_redirect", ""),
+        
+        IMAGE_SIZES=images.get("sizes", [320, 640, 1280]),
+        IMAGE_FORMATS=images.get("formats", ["webp", "avif"]),
+        IMAGE_QUALITY=images.get("quality", 80),
+        IMAGE_WORKERS=images.get("workers", 2),
+        
+        TEMPLATES_AUTO_RELOAD=templates.get("auto_reload", False),
+        TEMPLATES_CACHE_SIZE=templates.get("cache_size", 400),
+        TEMPLATES_BYTECODE_CACHE=templates.get("bytecode_cache_dir", ""),
+        
+        QUEUE_WORKER=queue.get("worker", True),
+        QUEUE_MAX_RETRIES=queue.get("max_retries", 3),
+        QUEUE_RETRY_DELAY=queue.get("retry_delay", 60),
+        QUEUE_MAX_RETRY_DELAY=queue.get("max_retry_delay", 3600),
+        QUEUE_POLL_INTERVAL=queue.get("poll_interval", 1.0),
+        QUEUE_LEASE_TIMEOUT=queue.get("lease_timeout", 300),
         
         PINATA_API_KEY=yaml_config["pinata_api_key"],
-        PINATA_API_SECRET=yaml_config["pinata_api_secret"]
+        PINATA_API_SECRET=yaml_config["pinata_api_secret"],
+        PINATA_BASE_URL=pinata.get("base_url", "https://api.pinata.cloud"),
+        PINATA_GATEWAY=pinata.get("gateway", "https://gateway.pinata.cloud/ipfs"),
+        PINATA_BATCH_SIZE=pinata.get("batch_size", 10),
+        PINATA_TIMEOUT=pinata.get("timeout", 300),
+        
+        METRICS_ENABLED=metrics.get("enabled", True),
+        METRICS_PORT=metrics.get("port", 0),
+        METRICS_PATH=metrics.get("path", "/metrics"),
+        
+        BOT_TOKEN=telegram.get("bot_token", ""),
+        TELEGRAM_API_URL=telegram.get("api_url", "https://api.telegram.org"),
+        TELEGRAM_TIMEOUT=telegram.get("timeout", 10),
+        TELEGRAM_CONCURRENCY=telegram.get("concurrency", 10),
+        TELEGRAM_RATE=telegram.get("rate", 25),
+        TELEGRAM_BATCH_SIZE=telegram.get("batch_size", 500),
+        TELEGRAM_SLICE_SECONDS=telegram.get("slice_seconds", 60),
+        
+        VIEWS_STORAGE=views.get("storage", "memory"),
+        VIEWS_FLUSH_INTERVAL=views.get("flush_interval", 10),
+        VIEWS_BATCH_SIZE=views.get("batch_size", 500),
+        
+        PROFILING_ENABLED=profiling.get("enabled", False),
+        PROFILING_N_PLUS_ONE_THRESHOLD=profiling.get("n_plus_one_threshold", 5),
+        PROFILING_LOG_STATEMENTS=profiling.get("log_statements", False),
     ) 
\ No newline at end of file
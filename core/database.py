@@ -1,18 +1,164 @@
-from sqlalchemy import create_engine
+from collections import Counter
+from typing import Dict, Optional
+
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 
 from core.config import load_yaml_config
 
+# Асинхронные драйверы для диалектов из config.yaml
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+# Счетчики событий пула по имени движка: connect/checkout/checkin/invalidate
+pool_events: Dict[str, Counter] = {}
+engines: Dict[str, Engine] = {}
+
+
+def build_database_url(db_config: dict, async_: bool = False) -> str:
+    """Собирает URL подключения из секции database в config.yaml"""
+    driver = db_config["driver"]
+    if async_:
+        driver = ASYNC_DRIVERS.get(driver.split("+")[0], driver)
+    if driver.startswith("sqlite"):
+        return f"{driver}:///{db_config['name']}"
+    return (
+        f"{driver}://{db_config['user']}:{db_config['password']}"
+        f"@{db_config['host']}:{db_config['port']}/{db_config['name']}"
+    )
+
+
+def _engine_options(db_config: dict) -> dict:
+    options = {
+        "echo": db_config.get("echo", False),
+        "pool_pre_ping": True,
+    }
+    # У SQLite свой пул без этих параметров
+    if not db_config["driver"].startswith("sqlite"):
+        options.update(
+            pool_size=db_config.get("pool_size", 5),
+            max_overflow=db_config.get("max_overflow", 10),
+            pool_timeout=db_config.get("pool_timeout", 30),
+            pool_recycle=db_config.get("pool_recycle", 1800),
+        )
+    return options
+
+
+POOL_EVENTS = ("connect", "checkout", "checkin", "invalidate")
+
+
+def _track_pool(name: str, sync_engine: Engine) -> None:
+    counter = pool_events.setdefault(name, Counter({e: 0 for e in POOL_EVENTS}))
+    engines[name] = sync_engine
+    for event_name in POOL_EVENTS:
+        def listener(*args, _event_name=event_name):
+            counter[_event_name] += 1
+        event.listen(sync_engine, event_name, listener)
+
+
+def create_db_engine(db_config: dict, name: str = "primary", async_: bool = False):
+    """Единая фабрика движков: параметры пула из config.yaml, pre-ping и учет статистики"""
+    url = build_database_url(db_config, async_=async_)
+    options = _engine_options(db_config)
+    if async_:
+        db_engine = create_async_engine(url, **options)
+        _track_pool(name, db_engine.sync_engine)
+    else:
+        db_engine = create_engine(url, **options)
+        _track_pool(name, db_engine)
+    return db_engine
+
+
+def get_pool_stats() -> Dict[str, dict]:
+    """Текущее состояние пулов всех движков процесса"""
+    stats = {}
+    for name, sync_engine in engines.items():
+        pool = sync_engine.pool
+        stats[name] = {
+            "size": pool.size() if hasattr(pool, "size") else None,
+            "checked_in": pool.checkedin() if hasattr(pool, "checkedin") else None,
+            "checked_out": pool.checkedout() if hasattr(pool, "checkedout") else None,
+            "overflow": pool.overflow() if hasattr(pool, "overflow") else None,
+            **pool_events[name],
+        }
+    return stats
+
+
 yaml_config = load_yaml_config()
 db = yaml_config["database"]
-db_url = f"{db['driver']}://{db['user']}:{db['password']}@{db['host']}:{db['port']}/{db['name']}"
+# Необязательная read-реплика: незаданные поля берутся из основной БД
+replica: Optional[dict] = db.get("replica")
+replica_db = {**db, **replica} if replica else None
 
 # Синхронное подключение (используется в большинстве кода)
-engine = create_engine(db_url)
+engine = create_db_engine(db)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-Base = declarative_base()
+# Асинхронное подключение для async-обработчиков (админка)
+async_engine = create_db_engine(db, name="primary_async", async_=True)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+# Сессии только для чтения идут на реплику, если она настроена
+read_engine = create_db_engine(replica_db, name="replica") if replica_db else engine
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+class _ReturningDefaults:
+    # Серверные значения (id, created_at, updated_at) приходят в RETURNING
+    # того же INSERT/UPDATE, а не отдельным SELECT
+    __mapper_args__ = {"eager_defaults": True}
+
+
+Base = declarative_base(cls=_ReturningDefaults)
+
+
+@event.listens_for(Base, "before_insert", propagate=True)
+def _insert_onupdate_columns_as_null(mapper, connection, target):
+    # Колонки только с onupdate (updated_at) вставляются как NULL; явное значение
+    # избавляет eager_defaults от отдельного SELECT за ними после INSERT
+    for attr in mapper.column_attrs:
+        column = attr.columns[0]
+        if (
+            column.onupdate is not None
+            and column.default is None
+            and column.server_default is None
+            and attr.key not in target.__dict__
+        ):
+            setattr(target, attr.key, None)
+
+
+def commit_returning(db: Session, *objs) -> None:
+    """Коммит вместо пары commit() + refresh().
+
+    Значения objs, заполненные базой, уже пришли в RETURNING при flush,
+    поэтому после коммита они не истекают и не перечитываются. Остальные
+    объекты сессии истекают как обычно при expire_on_commit, а у objs -
+    связи, которые могли измениться вместе с внешними ключами.
+    """
+    db.add_all(objs)
+    db.flush()
+    expire_on_commit = db.expire_on_commit
+    db.expire_on_commit = False
+    try:
+        db.commit()
+    finally:
+        db.expire_on_commit = expire_on_commit
+    if not expire_on_commit:
+        return
+    kept = {id(obj) for obj in objs}
+    for obj in list(db.identity_map.values()):
+        if id(obj) not in kept:
+            db.expire(obj)
+    for obj in objs:
+        relationships = inspect(obj).mapper.relationships.keys()
+        if relationships:
+            db.expire(obj, relationships)
 
 # Синхронный генератор сессий
 def get_db():
@@ -20,4 +166,17 @@ def get_db():
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+# Генератор сессий только для чтения (публичные GET-эндпоинты)
+def get_read_db():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+# Асинхронный генератор сессий
+async def get_async_db():
+    async with AsyncSessionLocal() as session:
+        yield session
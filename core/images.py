@@ -0,0 +1,108 @@
+import asyncio
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from core.config import get_settings
+from core.storage import variant_key
+
+try:
+    from PIL import Image, ImageOps, features
+except ImportError:  # Без Pillow производные не создаются, отдаются оригиналы
+    Image = None
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+IMAGE_EXTS = {".jpg", ".jpeg", ".png", ".webp", ".gif", ".bmp", ".tiff", ".avif"}
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+@lru_cache()
+def _encodable_formats() -> Tuple[str, ...]:
+    """Проверка кодеков Pillow выполняется один раз на процесс"""
+    if Image is None:
+        return ()
+    return tuple(fmt for fmt in settings.IMAGE_FORMATS if features.check(fmt))
+
+
+def supported_formats() -> List[str]:
+    """Форматы из настроек, которые умеет кодировать установленный Pillow"""
+    return list(_encodable_formats())
+
+
+def is_image(key: Optional[str]) -> bool:
+    return bool(key) and Path(key).suffix.lower() in IMAGE_EXTS
+
+
+def variant_urls(key: Optional[str]) -> Dict[str, Dict[int, str]]:
+    """URL производных изображения по формату и ширине.
+
+    Имена детерминированы, поэтому список строится без обращения к диску;
+    пока производный файл не готов, /media отдает по его адресу оригинал.
+    """
+    if not is_image(key):
+        return {}
+    return {
+        fmt: {width: f"/media/{variant_key(key, width, fmt)}" for width in settings.IMAGE_SIZES}
+        for fmt in supported_formats()
+    }
+
+
+def _render(source: str, targets: List[Tuple[int, str, str]], quality: int) -> List[str]:
+    """Выполняется в дочернем процессе: масштабирует и кодирует все производные"""
+    created = []
+    with Image.open(source) as original:
+        original = ImageOps.exif_transpose(original)
+        if original.mode not in ("RGB", "RGBA"):
+            original = original.convert("RGBA" if "transparency" in original.info else "RGB")
+        for width, fmt, dest in targets:
+            image = original.copy()
+            # Без увеличения: маленький оригинал сохраняется в своем размере
+            image.thumbnail((width, width * 10), Image.LANCZOS)
+            tmp = f"{dest}.{os.getpid()}.tmp"
+            image.save(tmp, format=fmt.upper(), quality=quality)
+            os.replace(tmp, dest)
+            created.append(dest)
+    return created
+
+
+def get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=settings.IMAGE_WORKERS)
+    return _pool
+
+
+def shutdown_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+async def generate_derivatives(key: str) -> List[str]:
+    """Создает уменьшенные копии изображения в пуле процессов, уже готовые пропускает"""
+    if not is_image(key):
+        return []
+    root = Path(settings.UPLOAD_DIR)
+    targets = [
+        (width, fmt, str(root / variant_key(key, width, fmt)))
+        for fmt in supported_formats()
+        for width in settings.IMAGE_SIZES
+    ]
+    targets = [target for target in targets if not os.path.exists(target[2])]
+    if not targets:
+        return []
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(
+            get_pool(), _render, str(root / key), targets, settings.IMAGE_QUALITY
+        )
+    except Exception:
+        logger.exception("Failed to generate derivatives for %s", key)
+        return []
@@ -0,0 +1,137 @@
+import asyncio
+import logging
+import time
+from email.message import EmailMessage
+from functools import lru_cache
+from typing import List, Optional, Union
+
+import aiosmtplib
+
+from core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class SMTPPool:
+    """Пул постоянных SMTP-соединений.
+
+    Соединение (и TLS-рукопожатие) переиспользуется между письмами; после
+    долгого простоя оно проверяется NOOP, а после ошибки отбрасывается.
+    """
+
+    def __init__(
+        self,
+        hostname: str,
+        port: int,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        use_tls: bool = True,
+        timeout: float = 30,
+        size: int = 2,
+        idle_timeout: float = 60,
+    ):
+        self.hostname = hostname
+        self.port = port
+        self.username = username or None
+        self.password = password or None
+        self.use_tls = use_tls
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self._idle: "asyncio.LifoQueue[tuple]" = asyncio.LifoQueue()
+        self._slots = asyncio.Semaphore(size)
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        # 465 - TLS сразу, остальные порты - STARTTLS
+        implicit_tls = self.use_tls and self.port == 465
+        client = aiosmtplib.SMTP(
+            hostname=self.hostname,
+            port=self.port,
+            use_tls=implicit_tls,
+            start_tls=self.use_tls and not implicit_tls,
+            timeout=self.timeout,
+        )
+        await client.connect()
+        if self.username:
+            await client.login(self.username, self.password)
+        return client
+
+    async def _acquire(self) -> aiosmtplib.SMTP:
+        while not self._idle.empty():
+            client, released_at = self._idle.get_nowait()
+            if not client.is_connected:
+                continue
+            if time.monotonic() - released_at > self.idle_timeout:
+                try:
+                    await client.noop()
+                except aiosmtplib.SMTPException:
+                    client.close()
+                    continue
+            return client
+        return await self._connect()
+
+    def _release(self, client: aiosmtplib.SMTP, healthy: bool) -> None:
+        if healthy and client.is_connected:
+            self._idle.put_nowait((client, time.monotonic()))
+        else:
+            client.close()
+
+    async def send_many(self, messages: List[EmailMessage]) -> List[Optional[Exception]]:
+        """Отправляет письма по одному соединению; для каждого письма - None или ошибка"""
+        results: List[Optional[Exception]] = []
+        async with self._slots:
+            client = await self._acquire()
+            healthy = True
+            try:
+                for message in messages:
+                    try:
+                        await client.send_message(message)
+                        results.append(None)
+                    except aiosmtplib.SMTPRecipientsRefused as exc:
+                        # Соединение в порядке, отказано только этому адресату
+                        results.append(exc)
+                    except (aiosmtplib.SMTPException, OSError) as exc:
+                        healthy = False
+                        results.append(exc)
+                        # Остальные письма пачки пойдут на повтор вместе с этим
+                        results += [exc] * (len(messages) - len(results))
+                        break
+            finally:
+                self._release(client, healthy)
+        return results
+
+    async def close(self) -> None:
+        while not self._idle.empty():
+            client, _ = self._idle.get_nowait()
+            try:
+                await client.quit()
+            except (aiosmtplib.SMTPException, OSError):
+                client.close()
+
+
+def build_message(to: Union[str, List[str]], subject: str, html: str, sender: Optional[str] = None) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = sender or get_settings().MAIL_FROM
+    message["To"] = to if isinstance(to, str) else ", ".join(to)
+    message["Subject"] = subject
+    message.set_content(html, subtype="html")
+    return message
+
+
+@lru_cache()
+def get_mailer() -> SMTPPool:
+    settings = get_settings()
+    return SMTPPool(
+        hostname=settings.MAIL_SERVER,
+        port=settings.MAIL_PORT,
+        username=settings.MAIL_USERNAME,
+        password=settings.MAIL_PASSWORD,
+        use_tls=settings.MAIL_USE_TLS,
+        timeout=settings.MAIL_TIMEOUT,
+        size=settings.MAIL_POOL_SIZE,
+        idle_timeout=settings.MAIL_IDLE_TIMEOUT,
+    )
+
+
+async def close_mailer() -> None:
+    if get_mailer.cache_info().currsize:
+        await get_mailer().close()
@@ -0,0 +1,100 @@
+import os
+import stat
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from typing import Optional
+
+import aiofiles.os
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import FileResponse, Response
+
+from core.cache import etag_matches
+from core.config import get_settings
+from core.storage import is_media_key, original_key
+
+settings = get_settings()
+router = APIRouter(prefix="/media", tags=["media"])
+
+# Файлы с хешем в имени не меняются никогда
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+# Остальные файлы можно кэшировать, но с проверкой по ETag
+REVALIDATE_CACHE = "public, no-cache"
+
+
+def resolve_media_path(key: str) -> Path:
+    """Путь к файлу внутри UPLOAD_DIR; служебные каталоги (.tmp, .incoming) не отдаются"""
+    root = Path(settings.UPLOAD_DIR).resolve()
+    parts = Path(key).parts
+    if not parts or any(part.startswith(".") for part in parts):
+        raise HTTPException(status_code=404, detail="File not found")
+    path = (root / key).resolve()
+    if not path.is_relative_to(root):
+        raise HTTPException(status_code=404, detail="File not found")
+    return path
+
+
+def media_etag(key: str, stat_result: os.stat_result) -> str:
+    if is_media_key(key):
+        # Сильный ETag - сам SHA-256 содержимого
+        return f'"{Path(key).stem}"'
+    return f'"{int(stat_result.st_mtime):x}-{stat_result.st_size:x}"'
+
+
+def not_modified(request: Request, etag: str, mtime: float) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag_matches(if_none_match, etag)
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+async def stat_media(path: Path) -> Optional[os.stat_result]:
+    try:
+        stat_result = await aiofiles.os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    return stat_result if stat.S_ISREG(stat_result.st_mode) else None
+
+
+@router.api_route("/{key:path}", methods=["GET", "HEAD"])
+async def serve_media(key: str, request: Request):
+    """Раздача загруженных файлов с поддержкой Range, ETag и условных запросов.
+
+    Если задан uploads.accel_redirect, сам файл отдает nginx по X-Accel-Redirect.
+    """
+    original = original_key(key)
+    path = resolve_media_path(key)
+    stat_result = await stat_media(path)
+    fallback = stat_result is None and original is not None
+    if fallback:
+        # Производное изображение еще не готово - отдаем оригинал без долгого кэширования
+        key = original
+        path = resolve_media_path(key)
+        stat_result = await stat_media(path)
+    if stat_result is None:
+        raise HTTPException(status_code=404, detail="File not found")
+
+    etag = media_etag(key, stat_result)
+    # Производные от хешированного оригинала тоже не меняются
+    immutable = not fallback and is_media_key(original or key)
+    headers = {
+        "ETag": etag,
+        "Last-Modified": formatdate(stat_result.st_mtime, usegmt=True),
+        "Cache-Control": IMMUTABLE_CACHE if immutable else REVALIDATE_CACHE,
+        "Accept-Ranges": "bytes",
+    }
+    if not_modified(request, etag, stat_result.st_mtime):
+        return Response(status_code=304, headers=headers)
+
+    if settings.MEDIA_ACCEL_REDIRECT:
+        relative = path.relative_to(Path(settings.UPLOAD_DIR).resolve()).as_posix()
+        headers["X-Accel-Redirect"] = settings.MEDIA_ACCEL_REDIRECT.rstrip("/") + "/" + relative
+        return Response(headers=headers)
+
+    # FileResponse сам обрабатывает Range/If-Range и использует pathsend, если его поддерживает сервер
+    return FileResponse(path, headers=headers, stat_result=stat_result)
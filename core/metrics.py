@@ -0,0 +1,200 @@
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, Optional, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    from prometheus_client import (
+        CONTENT_TYPE_LATEST, REGISTRY, Counter, Gauge, Histogram, generate_latest, start_http_server,
+    )
+    from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+except ImportError:  # prometheus_client не обязателен: без него метрики отключены
+    REGISTRY = None
+
+logger = logging.getLogger(__name__)
+
+
+class RequestStats:
+    """SQL-статистика одного HTTP-запроса"""
+    __slots__ = ("queries", "duration")
+
+    def __init__(self):
+        self.queries = 0
+        self.duration = 0.0
+
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+# Получатели (statement, duration) каждого SQL-запроса: профилировщик и бюджет запросов в тестах
+QueryObserver = Callable[[str, float], None]
+_query_observers: ContextVar[Tuple[QueryObserver, ...]] = ContextVar("query_observers", default=())
+# Получают запросы из всех потоков и задач (TestClient выполняет приложение в своем потоке)
+_global_query_observers: Set[QueryObserver] = set()
+
+if REGISTRY is not None:
+    REQUEST_LATENCY = Histogram(
+        "http_request_duration_seconds",
+        "HTTP request latency by route template",
+        ["method", "route", "status"],
+    )
+    REQUESTS_IN_FLIGHT = Gauge("http_requests_in_flight", "HTTP requests being processed")
+    REQUEST_QUERIES = Histogram(
+        "http_request_db_queries",
+        "SQL queries executed per HTTP request",
+        ["route"],
+        buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+    )
+    DB_QUERY_DURATION = Histogram(
+        "db_query_duration_seconds",
+        "SQL query execution time",
+        buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+    )
+    CACHE_REQUESTS = Counter(
+        "cache_requests_total",
+        "Response cache lookups",
+        ["namespace", "result"],
+    )
+
+
+def record_cache(namespace: str, hit: bool) -> None:
+    if REGISTRY is not None:
+        CACHE_REQUESTS.labels(namespace, "hit" if hit else "miss").inc()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("query_start")
+    if not started:
+        return
+    duration = time.perf_counter() - started.pop()
+    if REGISTRY is not None:
+        DB_QUERY_DURATION.observe(duration)
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.duration += duration
+    for observer in _query_observers.get():
+        observer(statement, duration)
+    for observer in tuple(_global_query_observers):
+        observer(statement, duration)
+
+
+@contextmanager
+def observe_queries(observer: QueryObserver, all_threads: bool = False) -> Iterator[None]:
+    """Передает observer запросы текущего контекста (или всего процесса при all_threads)"""
+    if all_threads:
+        _global_query_observers.add(observer)
+        try:
+            yield
+        finally:
+            _global_query_observers.discard(observer)
+    else:
+        token = _query_observers.set(_query_observers.get() + (observer,))
+        try:
+            yield
+        finally:
+            _query_observers.reset(token)
+
+
+class RuntimeCollector:
+    """Снимает состояние пулов БД и пула bcrypt в момент опроса"""
+
+    def collect(self):
+        from core.database import POOL_EVENTS, get_pool_stats
+        from core.security import password_hasher
+
+        pool = {
+            name: GaugeMetricFamily(f"db_pool_{name}", f"Database pool {name.replace('_', ' ')} connections", labels=["engine"])
+            for name in ("size", "checked_in", "checked_out", "overflow")
+        }
+        events = CounterMetricFamily("db_pool_events", "Database pool events", labels=["engine", "event"])
+        for engine_name, stats in get_pool_stats().items():
+            for name, family in pool.items():
+                if stats.get(name) is not None:
+                    family.add_metric([engine_name], stats[name])
+            for event_name in POOL_EVENTS:
+                events.add_metric([engine_name, event_name], stats[event_name])
+        yield from pool.values()
+        yield events
+
+        hasher = password_hasher.stats()
+        state = GaugeMetricFamily("password_hash_pool", "Password hashing pool state", labels=["state"])
+        for name in ("workers", "in_flight", "queued"):
+            state.add_metric([name], hasher[name])
+        yield state
+        yield CounterMetricFamily("password_hash_completed", "Password hash operations completed", value=hasher["completed"])
+        yield CounterMetricFamily("password_hash_rejected", "Password hash operations rejected with 503", value=hasher["rejected"])
+
+
+class MetricsMiddleware:
+    """Латентность по шаблону маршрута, запросы в обработке и число SQL-запросов на запрос"""
+
+    def __init__(self, app: ASGIApp, exclude: tuple = ()):
+        self.app = app
+        self.exclude = exclude
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or REGISTRY is None or scope["path"] in self.exclude:
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        started = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            REQUESTS_IN_FLIGHT.dec()
+            _request_stats.reset(token)
+            # Шаблон пути вместо самого пути, чтобы не плодить метки
+            route = scope.get("route")
+            route_path = getattr(route, "path", "unmatched")
+            REQUEST_LATENCY.labels(scope["method"], route_path, str(status)).observe(
+                time.perf_counter() - started
+            )
+            REQUEST_QUERIES.labels(route_path).observe(stats.queries)
+
+
+def metrics_response():
+    from starlette.responses import Response
+    return Response(generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
+
+
+def setup_metrics(app, settings) -> None:
+    """Подключает сбор метрик и отдачу на metrics.path (или отдельном metrics.port)"""
+    if not settings.METRICS_ENABLED:
+        return
+    if REGISTRY is None:
+        logger.warning("prometheus_client is not installed, metrics are disabled")
+        return
+    REGISTRY.register(RuntimeCollector())
+    app.add_middleware(MetricsMiddleware, exclude=(settings.METRICS_PATH,))
+    if settings.METRICS_PORT:
+        def start_server():
+            try:
+                start_http_server(settings.METRICS_PORT)
+            except OSError as exc:
+                # Порт уже занят другим воркером этого же приложения
+                logger.warning("Metrics server on port %s not started: %s", settings.METRICS_PORT, exc)
+        app.add_event_handler("startup", start_server)
+    else:
+        app.add_route(settings.METRICS_PATH, lambda request: metrics_response(), include_in_schema=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, func
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, func, Index, JSON, Text
 from core.database import Base
 
 class ApiKey(Base):
@@ -12,5 +12,35 @@ class ApiKey(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    __table_args__ = (
+        Index("ix_api_keys_created_at_id", "created_at", "id"),
+    )
+
+    def __str__(self):
+        return f"{self.name} ({self.api_key})"
+
+
+class Job(Base):
+    """Фоновая задача очереди (см. core.queue)"""
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String, nullable=False)
+    payload = Column(JSON, nullable=False, default=dict)
+    # pending -> running -> done; после исчерпания попыток - dead
+    status = Column(String, nullable=False, default="pending")
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False)
+    run_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    locked_until = Column(DateTime(timezone=True), nullable=True)
+    last_error = Column(Text, nullable=True)
+    result = Column(JSON, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    __table_args__ = (
+        Index("ix_jobs_status_kind_run_at", "status", "kind", "run_at"),
+    )
+
     def __str__(self):
-        return f"{self.name} ({self.api_key})" 
\ No newline at end of file
+        return f"{self.kind}#{self.id} ({self.status})"
@@ -0,0 +1,86 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Generic, List, Optional, Sequence, Tuple, TypeVar
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+from sqlalchemy import and_, or_, tuple_
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    """Конверт ответа в режиме курсора. Пустой ?cursor= запрашивает первую страницу"""
+    items: List[T]
+    next_cursor: Optional[str] = None
+
+
+def encode_cursor(created_at: Optional[datetime], id: int) -> str:
+    """Кодирует позицию (created_at, id) в непрозрачный курсор"""
+    payload = {"c": created_at.isoformat() if created_at else None, "i": id}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], int]:
+    """Декодирует курсор, при ошибке отдает 400"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        created_at = datetime.fromisoformat(payload["c"]) if payload["c"] else None
+        return created_at, int(payload["i"])
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def apply_keyset(query, model, cursor: Optional[str], limit: int):
+    """Добавляет к запросу keyset-условие, сортировку (новые сначала) и limit + 1.
+
+    Лишняя строка нужна только для того, чтобы понять, есть ли следующая страница.
+    Модели без created_at пагинируются по id. Строки с created_at = NULL идут
+    первыми (порядок DESC в PostgreSQL, индекс (created_at, id) по-прежнему
+    читается с конца): сравнение кортежей с NULL их бы просто потеряло.
+    """
+    created_at = getattr(model, "created_at", None)
+    if cursor:
+        last_created_at, last_id = decode_cursor(cursor)
+        if created_at is None:
+            query = query.filter(model.id < last_id)
+        elif last_created_at is None:
+            query = query.filter(or_(
+                and_(created_at.is_(None), model.id < last_id),
+                created_at.isnot(None),
+            ))
+        else:
+            query = query.filter(tuple_(created_at, model.id) < tuple_(last_created_at, last_id))
+    if created_at is not None:
+        query = query.order_by(created_at.desc().nulls_first(), model.id.desc())
+    else:
+        query = query.order_by(model.id.desc())
+    return query.limit(limit + 1)
+
+
+def build_page(rows: Sequence[Any], limit: int) -> Tuple[List[Any], Optional[str]]:
+    """Отрезает лишнюю строку и формирует курсор следующей страницы"""
+    items = list(rows[:limit])
+    next_cursor = None
+    if len(rows) > limit and items:
+        last = items[-1]
+        next_cursor = encode_cursor(getattr(last, "created_at", None), last.id)
+    return items, next_cursor
+
+
+def paginate(query, model, cursor: Optional[str], limit: int) -> dict:
+    """Выполняет keyset-запрос и возвращает конверт {items, next_cursor}"""
+    rows = apply_keyset(query, model, cursor, limit).all()
+    items, next_cursor = build_page(rows, limit)
+    return {"items": items, "next_cursor": next_cursor}
+
+
+async def paginate_async(db, stmt, model, cursor: Optional[str], limit: int) -> dict:
+    """Асинхронный вариант paginate для select() и AsyncSession"""
+    rows = (await db.scalars(apply_keyset(stmt, model, cursor, limit))).all()
+    items, next_cursor = build_page(rows, limit)
+    return {"items": items, "next_cursor": next_cursor}
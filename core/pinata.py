@@ -0,0 +1,58 @@
+import json
+from contextlib import ExitStack
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import httpx
+
+from core.config import get_settings
+
+
+class PinataClient:
+    """Клиент Pinata API для закрепления файлов в IPFS"""
+
+    def __init__(self, api_key: str, api_secret: str, base_url: str, timeout: float = 300,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.client = httpx.AsyncClient(
+            base_url=base_url,
+            headers={"pinata_api_key": api_key, "pinata_secret_api_key": api_secret},
+            timeout=timeout,
+            transport=transport,
+        )
+
+    async def pin_directory(self, name: str, files: List[Tuple[str, Path]]) -> str:
+        """Закрепляет файлы одной директорией и возвращает ее CID.
+
+        files - пары (путь внутри директории, путь на диске); файлы читаются
+        потоково при отправке multipart-запроса.
+        """
+        with ExitStack() as stack:
+            parts = [
+                ("file", (f"{name}/{relative}", stack.enter_context(open(path, "rb"))))
+                for relative, path in files
+            ]
+            response = await self.client.post(
+                "/pinning/pinFileToIPFS",
+                files=parts,
+                data={
+                    "pinataMetadata": json.dumps({"name": name}),
+                    "pinataOptions": json.dumps({"cidVersion": 1}),
+                },
+            )
+        response.raise_for_status()
+        return response.json()["IpfsHash"]
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+@lru_cache()
+def get_pinata() -> PinataClient:
+    settings = get_settings()
+    return PinataClient(
+        settings.PINATA_API_KEY,
+        settings.PINATA_API_SECRET,
+        settings.PINATA_BASE_URL,
+        settings.PINATA_TIMEOUT,
+    )
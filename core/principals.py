@@ -0,0 +1,84 @@
+import time
+from typing import Optional
+
+from jose import JWTError, jwt
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from core.cache import TTLCache
+from core.config import get_settings
+from users import schemas
+from users.models import User
+
+settings = get_settings()
+
+# Проверенные токены: токен -> payload, хранится не дольше срока действия токена
+token_cache = TTLCache(settings.AUTH_CACHE_SIZE, settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+# Снимки пользователей по ("id", id) и ("email", email) с коротким TTL:
+# изменения из других воркеров видны не позже чем через AUTH_PRINCIPAL_TTL
+principal_cache = TTLCache(settings.AUTH_CACHE_SIZE, settings.AUTH_PRINCIPAL_TTL)
+
+
+def decode_token(token: str) -> dict:
+    """jwt.decode с запоминанием результата до истечения токена"""
+    payload = token_cache.get(token)
+    if payload is not None:
+        return payload
+    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    exp = payload.get("exp")
+    ttl = exp - time.time() if exp is not None else None
+    if ttl is None or ttl > 0:
+        token_cache.set(token, payload, ttl)
+    return payload
+
+
+def get_token_subject(token: str) -> Optional[str]:
+    try:
+        return decode_token(token).get("sub")
+    except JWTError:
+        return None
+
+
+def _remember(user: Optional[User]) -> Optional[schemas.User]:
+    """Снимок пользователя без повторной валидации: данные из БД уже приняты,
+    а email, не прошедший EmailStr (старые записи), не должен давать 500"""
+    if user is None:
+        return None
+    principal = schemas.User.model_construct(
+        **{name: getattr(user, name) for name in schemas.User.model_fields}
+    )
+    principal_cache.set(("id", principal.id), principal)
+    principal_cache.set(("email", principal.email), principal)
+    return principal
+
+
+def get_principal(db: Session, field: str, value) -> Optional[schemas.User]:
+    """Пользователь по id или email из кэша; в БД идем только при промахе"""
+    principal = principal_cache.get((field, value))
+    if principal is not None:
+        return principal
+    return _remember(db.query(User).filter(getattr(User, field) == value).first())
+
+
+async def get_principal_async(db: AsyncSession, field: str, value) -> Optional[schemas.User]:
+    """То же для асинхронной сессии"""
+    principal = principal_cache.get((field, value))
+    if principal is not None:
+        return principal
+    result = await db.execute(select(User).where(getattr(User, field) == value))
+    return _remember(result.scalars().first())
+
+
+def invalidate_principal(user_id: Optional[int] = None, email: Optional[str] = None) -> None:
+    """Сбрасывает кэш пользователя после изменения или удаления"""
+    if user_id is not None:
+        cached = principal_cache.get(("id", user_id))
+        if cached is not None:
+            principal_cache.delete(("email", cached.email))
+        principal_cache.delete(("id", user_id))
+    if email is not None:
+        cached = principal_cache.get(("email", email))
+        if cached is not None:
+            principal_cache.delete(("id", cached.id))
+        principal_cache.delete(("email", email))
@@ -0,0 +1,103 @@
+import logging
+import re
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from typing import Iterator, List, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.metrics import observe_queries
+
+logger = logging.getLogger(__name__)
+
+_PARAM_RE = re.compile(r"%\(\w+\)s|%s|\$\d+|:\w+|\?")
+_LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """Форма запроса без значений параметров: по ней ищутся повторы"""
+    shape = _PARAM_RE.sub("?", statement)
+    shape = _LITERAL_RE.sub("?", shape)
+    shape = _IN_LIST_RE.sub("(?)", shape)
+    return _SPACE_RE.sub(" ", shape).strip()
+
+
+class QueryRecorder:
+    """Выполненные SQL-запросы и их длительность"""
+
+    def __init__(self):
+        self.statements: List[Tuple[str, float]] = []
+        self._lock = threading.Lock()
+
+    def record(self, statement: str, duration: float) -> None:
+        with self._lock:
+            self.statements.append((statement, duration))
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    @property
+    def duration(self) -> float:
+        return sum(duration for _, duration in self.statements)
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Формы запросов, выполненные не меньше threshold раз (признак N+1)"""
+        shapes = Counter(statement_shape(statement) for statement, _ in self.statements)
+        return [(shape, count) for shape, count in shapes.most_common() if count >= threshold]
+
+
+@contextmanager
+def record_queries(all_threads: bool = False) -> Iterator[QueryRecorder]:
+    """Записывает запросы текущего контекста (или всего процесса при all_threads)"""
+    recorder = QueryRecorder()
+    with observe_queries(recorder.record, all_threads):
+        yield recorder
+
+
+class ProfilingMiddleware:
+    """Отладочный профилировщик SQL по запросам.
+
+    Добавляет к ответу X-DB-Query-Count, X-DB-Query-Time (мс) и
+    X-DB-N-Plus-One (число повторяющихся форм запросов), повторы пишет
+    в лог предупреждением вместе с самим запросом.
+    """
+
+    def __init__(self, app: ASGIApp, threshold: int = 5, log_statements: bool = False):
+        self.app = app
+        self.threshold = threshold
+        self.log_statements = log_statements
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with record_queries() as recorder:
+            async def send_with_headers(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    repeated = recorder.repeated(self.threshold)
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (b"x-db-query-count", str(recorder.count).encode()),
+                        (b"x-db-query-time", f"{recorder.duration * 1000:.1f}".encode()),
+                        (b"x-db-n-plus-one", str(len(repeated)).encode()),
+                    ]
+                await send(message)
+
+            await self.app(scope, receive, send_with_headers)
+        self.report(scope, recorder)
+
+    def report(self, scope: Scope, recorder: QueryRecorder) -> None:
+        route = getattr(scope.get("route"), "path", scope["path"])
+        endpoint = f"{scope['method']} {route}"
+        for shape, count in recorder.repeated(self.threshold):
+            logger.warning("Possible N+1 in %s: %d x %s", endpoint, count, shape)
+        logger.info(
+            "%s: %d queries in %.1f ms", endpoint, recorder.count, recorder.duration * 1000
+        )
+        if self.log_statements:
+            for statement, duration in recorder.statements:
+                logger.info("%s: %.1f ms %s", endpoint, duration * 1000, statement)
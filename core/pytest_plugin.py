@@ -0,0 +1,65 @@
+"""Бюджет SQL-запросов в тестах.
+
+Подключается через ``pytest -p core.pytest_plugin`` или
+``pytest_plugins = ["core.pytest_plugin"]`` в conftest.py.
+
+Маркер ограничивает весь тест::
+
+    @pytest.mark.query_budget(3)
+    def test_campaigns(client):
+        client.get("/api/v1/campaigns")
+
+Фикстура ограничивает отдельный вызов эндпоинта::
+
+    def test_publications(client, query_budget):
+        with query_budget(3, allow_n_plus_one=False):
+            client.get("/api/v1/publications/")
+"""
+from contextlib import contextmanager
+
+import pytest
+
+from core.config import get_settings
+from core.profiling import record_queries
+
+
+def _check(recorder, max_queries: int, allow_n_plus_one: bool = False) -> None:
+    problems = []
+    if recorder.count > max_queries:
+        problems.append(f"{recorder.count} SQL queries, budget is {max_queries}")
+    if not allow_n_plus_one:
+        problems.extend(
+            f"possible N+1: {count} x {shape}"
+            for shape, count in recorder.repeated(get_settings().PROFILING_N_PLUS_ONE_THRESHOLD)
+        )
+    if problems:
+        statements = "\n".join(f"  {statement}" for statement, _ in recorder.statements)
+        pytest.fail("; ".join(problems) + f"\nExecuted:\n{statements}", pytrace=False)
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "query_budget(max_queries, allow_n_plus_one=False): fail if the test runs more SQL queries",
+    )
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    marker = item.get_closest_marker("query_budget")
+    if marker is None:
+        return (yield)
+    with record_queries(all_threads=True) as recorder:
+        result = yield
+    _check(recorder, *marker.args, **marker.kwargs)
+    return result
+
+
+@pytest.fixture
+def query_budget():
+    @contextmanager
+    def budget(max_queries: int, allow_n_plus_one: bool = False):
+        with record_queries(all_threads=True) as recorder:
+            yield recorder
+        _check(recorder, max_queries, allow_n_plus_one)
+    return budget
@@ -0,0 +1,251 @@
+import asyncio
+import logging
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from core.config import get_settings
+from core.database import AsyncSessionLocal, commit_returning
+from core.models import Job
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+DEAD = "dead"
+
+# Обработчик получает payload-ы пачки задач одного вида и возвращает
+# результаты в том же порядке (или None); исключение на месте результата
+# отправляет на повтор только соответствующую задачу
+HandlerFunc = Callable[[List[dict]], Awaitable[Optional[List[Any]]]]
+
+
+@dataclass
+class JobHandler:
+    func: HandlerFunc
+    batch_size: int = 1
+
+
+handlers: Dict[str, JobHandler] = {}
+
+
+def job_handler(kind: str, batch_size: int = 1):
+    """Регистрирует обработчик задач вида kind"""
+    def decorator(func: HandlerFunc) -> HandlerFunc:
+        handlers[kind] = JobHandler(func, batch_size)
+        return func
+    return decorator
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _new_job(kind: str, payload: dict, run_at: Optional[datetime], max_attempts: Optional[int]) -> Job:
+    return Job(
+        kind=kind,
+        payload=payload,
+        status=PENDING,
+        attempts=0,
+        max_attempts=max_attempts or settings.QUEUE_MAX_RETRIES + 1,
+        run_at=run_at or utcnow(),
+    )
+
+
+def enqueue(
+    db: Session,
+    kind: str,
+    payload: dict,
+    run_at: Optional[datetime] = None,
+    max_attempts: Optional[int] = None,
+    commit: bool = True,
+) -> Job:
+    """Ставит задачу в очередь. С commit=False задача попадет в БД вместе
+    с остальными изменениями текущей транзакции (или не попадет вовсе)."""
+    job = _new_job(kind, payload, run_at, max_attempts)
+    db.add(job)
+    if commit:
+        commit_returning(db, job)
+    else:
+        db.flush()
+    return job
+
+
+async def enqueue_async(
+    db: AsyncSession,
+    kind: str,
+    payload: dict,
+    run_at: Optional[datetime] = None,
+    max_attempts: Optional[int] = None,
+    commit: bool = True,
+) -> Job:
+    job = _new_job(kind, payload, run_at, max_attempts)
+    db.add(job)
+    if commit:
+        await db.commit()
+    else:
+        await db.flush()
+    return job
+
+
+def retry_delay(attempts: int) -> float:
+    """Экспоненциальная задержка перед повтором с небольшим разбросом"""
+    delay = min(settings.QUEUE_RETRY_DELAY * 2 ** (attempts - 1), settings.QUEUE_MAX_RETRY_DELAY)
+    return delay * random.uniform(1, 1.1)
+
+
+class Worker:
+    """Обработчик очереди задач в БД.
+
+    Задачи забираются через SELECT ... FOR UPDATE SKIP LOCKED, поэтому
+    воркеры в нескольких процессах не берут одну задачу дважды. Взятая задача
+    арендуется на QUEUE_LEASE_TIMEOUT секунд и продлевается, пока обработчик
+    работает; задачу упавшего процесса после истечения аренды заберет другой.
+    Каждый вид задач обрабатывается в своем цикле, так что долгая пачка
+    одного вида не задерживает остальные.
+    """
+
+    def __init__(self, session_factory=AsyncSessionLocal):
+        self.session_factory = session_factory
+        self.lease = timedelta(seconds=settings.QUEUE_LEASE_TIMEOUT)
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+
+    async def claim(self, kind: str, limit: int) -> List[Job]:
+        now = utcnow()
+        async with self.session_factory() as db:
+            stmt = (
+                select(Job)
+                .where(
+                    Job.kind == kind,
+                    or_(
+                        and_(Job.status == PENDING, Job.run_at <= now),
+                        and_(Job.status == RUNNING, Job.locked_until < now),
+                    ),
+                )
+                .order_by(Job.run_at, Job.id)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            )
+            jobs = []
+            for job in (await db.scalars(stmt)).all():
+                if job.attempts >= job.max_attempts:
+                    # Аренда истекла на последней попытке: процесс упал во время обработки
+                    job.status = DEAD
+                    job.locked_until = None
+                    job.last_error = job.last_error or "Lease expired"
+                    continue
+                job.status = RUNNING
+                job.attempts += 1
+                job.locked_until = now + self.lease
+                jobs.append(job)
+            await db.commit()
+            return jobs
+
+    async def _heartbeat(self, ids: List[int]) -> None:
+        while True:
+            await asyncio.sleep(self.lease.total_seconds() / 3)
+            async with self.session_factory() as db:
+                await db.execute(
+                    update(Job)
+                    .where(Job.id.in_(ids), Job.status == RUNNING)
+                    .values(locked_until=utcnow() + self.lease)
+                )
+                await db.commit()
+
+    async def _finish(self, jobs: List[Job], results: Optional[List[Any]], error: Optional[BaseException]) -> None:
+        if error is None and results is not None and len(results) < len(jobs):
+            # Задачи без результата считаются неудачными и уходят на повтор
+            missing = RuntimeError(f"Handler returned {len(results)} results for {len(jobs)} jobs")
+            logger.warning("Job batch %s: %s", [job.id for job in jobs], missing)
+            results = list(results) + [missing] * (len(jobs) - len(results))
+        async with self.session_factory() as db:
+            for index, job in enumerate(jobs):
+                result = results[index] if results is not None else None
+                # Исключение в результатах - ошибка только этой задачи пачки
+                job_error = error if error is not None else (
+                    result if isinstance(result, Exception) else None
+                )
+                if job_error is None:
+                    values = {"status": DONE, "locked_until": None, "result": result}
+                elif job.attempts >= job.max_attempts:
+                    values = {"status": DEAD, "locked_until": None, "last_error": repr(job_error)[:2000]}
+                else:
+                    values = {
+                        "status": PENDING,
+                        "locked_until": None,
+                        "run_at": utcnow() + timedelta(seconds=retry_delay(job.attempts)),
+                        "last_error": repr(job_error)[:2000],
+                    }
+                await db.execute(update(Job).where(Job.id == job.id).values(**values))
+            await db.commit()
+
+    async def run_batch(self, kind: str, handler: JobHandler) -> int:
+        jobs = await self.claim(kind, handler.batch_size)
+        if not jobs:
+            return 0
+        heartbeat = asyncio.create_task(self._heartbeat([job.id for job in jobs]))
+        results, error = None, None
+        try:
+            results = await handler.func([job.payload for job in jobs])
+        except Exception as exc:
+            logger.warning("Job batch %s %s failed: %r", kind, [job.id for job in jobs], exc)
+            error = exc
+        finally:
+            heartbeat.cancel()
+        await self._finish(jobs, results, error)
+        return len(jobs)
+
+    async def run_once(self) -> int:
+        """Одна пачка каждого вида, виды обрабатываются параллельно"""
+        counts = await asyncio.gather(
+            *(self.run_batch(kind, handler) for kind, handler in list(handlers.items()))
+        )
+        return sum(counts)
+
+    async def _run_kind(self, kind: str, handler: JobHandler) -> None:
+        while not self._stopping.is_set():
+            try:
+                processed = await self.run_batch(kind, handler)
+            except Exception:
+                logger.exception("Queue worker iteration for %s failed", kind)
+                processed = 0
+            if not processed:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), settings.QUEUE_POLL_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def run(self) -> None:
+        await asyncio.gather(
+            *(self._run_kind(kind, handler) for kind, handler in list(handlers.items()))
+        )
+
+    def start(self) -> None:
+        self._stopping.clear()
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        self._stopping.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+
+
+worker = Worker()
+
+
+async def start_worker() -> None:
+    if settings.QUEUE_WORKER:
+        worker.start()
+
+
+async def stop_worker() -> None:
+    await worker.stop()
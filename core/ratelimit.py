@@ -0,0 +1,255 @@
+import asyncio
+import json
+import logging
+import math
+import re
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.cache import REDIS_RETRY_AFTER, TTLCache, aioredis, RedisError
+from core.config import get_settings
+from core.principals import get_token_subject
+from core.security import is_verified_signature
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RateLimitRule:
+    name: str
+    limit: int
+    period: int
+    pattern: Optional["re.Pattern"] = None
+    methods: Optional[Tuple[str, ...]] = None
+
+    def matches(self, method: str, path: str) -> bool:
+        if self.methods and method not in self.methods:
+            return False
+        return self.pattern is None or self.pattern.match(path) is not None
+
+
+def _sliding_count(previous: int, current: int, elapsed: float, period: int) -> float:
+    """Скользящее окно по двум фиксированным: часть предыдущего окна,
+    которая еще попадает в последние period секунд, плюс текущее"""
+    return previous * (1 - elapsed / period) + current
+
+
+class MemoryRateLimitStore:
+    """Счетчики в памяти процесса: у каждого воркера свои лимиты"""
+
+    def __init__(self, maxsize: int = 100_000):
+        self._windows = TTLCache(maxsize)
+        self._lock = threading.Lock()
+
+    async def hit(self, key: str, period: int, now: float) -> Tuple[int, int]:
+        window = int(now // period)
+        with self._lock:
+            counts = self._windows.get(key) or {}
+            counts = {w: c for w, c in counts.items() if w >= window - 1}
+            counts[window] = counts.get(window, 0) + 1
+            self._windows.set(key, counts, ttl=period * 2)
+        return counts.get(window - 1, 0), counts[window]
+
+
+class RedisRateLimitStore:
+    """Счетчики в Redis, общие для всех воркеров"""
+
+    def __init__(self, redis):
+        self.redis = redis
+
+    async def hit(self, key: str, period: int, now: float) -> Tuple[int, int]:
+        window = int(now // period)
+        current_key = f"{key}:{window}"
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.get(f"{key}:{window - 1}")
+            pipe.incr(current_key)
+            pipe.expire(current_key, period * 2)
+            previous, current, _ = await pipe.execute()
+        return int(previous or 0), int(current)
+
+
+class RateLimiter:
+    def __init__(self, redis=None):
+        self.memory = MemoryRateLimitStore()
+        self.redis = RedisRateLimitStore(redis) if redis is not None else None
+        self._redis_down_until = 0.0
+
+    async def hit(self, key: str, rule: RateLimitRule) -> Tuple[bool, int, int]:
+        """Учитывает запрос; возвращает (разрешен, осталось, секунд до сброса)"""
+        now = time.time()
+        counts = None
+        if self.redis is not None and now >= self._redis_down_until:
+            try:
+                counts = await self.redis.hit(key, rule.period, now)
+            except (RedisError, OSError) as exc:
+                logger.warning("Redis rate limit store unavailable, falling back to memory: %s", exc)
+                self._redis_down_until = now + REDIS_RETRY_AFTER
+        if counts is None:
+            counts = await self.memory.hit(key, rule.period, now)
+        previous, current = counts
+        elapsed = now % rule.period
+        used = _sliding_count(previous, current, elapsed, rule.period)
+        allowed = used <= rule.limit
+        remaining = max(int(rule.limit - used), 0)
+        reset = math.ceil(rule.period - elapsed)
+        return allowed, remaining, reset
+
+
+class TokenBucket:
+    """Равномерная отправка: не больше rate операций в секунду с запасом burst.
+
+    pause() останавливает всех ожидающих, например на retry_after из ответа 429.
+    Один bucket можно делить между циклами событий: блокировка создается
+    заново в каждом новом цикле.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = rate
+        self.capacity = burst or max(int(rate), 1)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop, self._lock = loop, asyncio.Lock()
+        return self._lock
+
+    def pause(self, seconds: float) -> None:
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+        # После паузы запас набирается заново, без пачки накопленных запросов
+        self.tokens = 0.0
+        self.updated = self.paused_until
+
+    async def acquire(self) -> None:
+        async with self._get_lock():
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+def client_ip(scope: Scope, trust_proxy: bool = False) -> str:
+    """IP клиента; X-Forwarded-For учитывается только за доверенным прокси"""
+    if trust_proxy:
+        forwarded = Headers(scope=scope).get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+def load_rules(settings) -> List[RateLimitRule]:
+    rules = [
+        RateLimitRule(
+            name=rule.get("name") or rule["path"],
+            limit=rule["limit"],
+            period=rule.get("period", settings.RATE_LIMIT_PERIOD),
+            pattern=re.compile(rule["path"]),
+            methods=tuple(m.upper() for m in rule["methods"]) if rule.get("methods") else None,
+        )
+        for rule in settings.RATE_LIMIT_RULES
+    ]
+    rules.append(RateLimitRule("default", settings.RATE_LIMIT, settings.RATE_LIMIT_PERIOD))
+    return rules
+
+
+class RateLimitMiddleware:
+    """Ограничение частоты запросов со скользящим окном.
+
+    Запрос учитывается в первом подходящем правиле (переопределения из
+    security.rate_limit_rules, затем общее security.rate_limit). Клиент
+    определяется по API-ключу, затем по пользователю из JWT, иначе по IP.
+    Отдельный счетчик получает только ключ, подпись которого уже прошла
+    проверку HMAC: иначе случайный X-API-Key на каждый запрос давал бы
+    новый счетчик и обходил лимиты.
+    """
+
+    def __init__(self, app: ASGIApp, limiter: Optional[RateLimiter] = None, rules: Optional[Sequence[RateLimitRule]] = None):
+        settings = get_settings()
+        self.app = app
+        self.limiter = limiter or get_rate_limiter()
+        self.rules = list(rules) if rules is not None else load_rules(settings)
+        self.exempt = [re.compile(pattern) for pattern in settings.RATE_LIMIT_EXEMPT]
+        self.trust_proxy = settings.RATE_LIMIT_TRUST_PROXY
+
+    def identify(self, scope: Scope) -> str:
+        headers = Headers(scope=scope)
+        api_key = headers.get("x-api-key")
+        if api_key and is_verified_signature(api_key, headers.get("x-api-signature", "")):
+            return f"key:{api_key}"
+        authorization = headers.get("authorization", "")
+        if authorization.lower().startswith("bearer "):
+            subject = get_token_subject(authorization[7:])
+            if subject:
+                return f"user:{subject}"
+        return "ip:" + client_ip(scope, self.trust_proxy)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        path, method = scope["path"], scope["method"]
+        if any(pattern.match(path) for pattern in self.exempt):
+            await self.app(scope, receive, send)
+            return
+        rule = next(rule for rule in self.rules if rule.matches(method, path))
+        allowed, remaining, reset = await self.limiter.hit(
+            f"ratelimit:{rule.name}:{self.identify(scope)}", rule
+        )
+        headers = [
+            (b"ratelimit-limit", str(rule.limit).encode()),
+            (b"ratelimit-remaining", str(remaining).encode()),
+            (b"ratelimit-reset", str(reset).encode()),
+        ]
+        if not allowed:
+            body = json.dumps({"detail": "Too many requests"}).encode()
+            await send({
+                "type": "http.response.start",
+                "status": 429,
+                "headers": headers + [
+                    (b"retry-after", str(reset).encode()),
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                ],
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+
+@lru_cache()
+def get_rate_limiter() -> RateLimiter:
+    settings = get_settings()
+    redis = None
+    if settings.RATE_LIMIT_STORAGE == "redis" and aioredis is not None:
+        redis = aioredis.Redis(
+            host=settings.CACHE_HOST,
+            port=settings.CACHE_PORT,
+            db=settings.CACHE_DB,
+            socket_timeout=0.5,
+            socket_connect_timeout=0.5,
+        )
+    return RateLimiter(redis)
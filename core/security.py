@@ -7,14 +7,90 @@ import secrets
 import string
 import hmac
 import hashlib
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
+from core.database import commit_returning
 from core.models import ApiKey
 
+from core.cache import TTLCache
 from core.config import get_settings
 
 settings = get_settings()
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Кэш проверки API-ключей: ключ -> подготовленный HMAC (или UNKNOWN_KEY).
+# Инвалидация работает в пределах процесса, в остальных воркерах
+# изменения видны не позже чем через API_KEY_CACHE_TTL.
+UNKNOWN_KEY = False
+api_key_cache = TTLCache(settings.API_KEY_CACHE_SIZE, settings.API_KEY_CACHE_TTL)
+# Пары (ключ, подпись), прошедшие проверку HMAC: только по ним лимитер
+# запросов выделяет ключу отдельный счетчик
+verified_signatures = TTLCache(settings.API_KEY_CACHE_SIZE, settings.API_KEY_CACHE_TTL)
+
+# Хеши с другим числом раундов считаются устаревшими и пересчитываются при входе
+pwd_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS
+)
+
+
+class PasswordHasher:
+    """Ограниченный пул потоков для bcrypt.
+
+    bcrypt отпускает GIL, поэтому хеширование в потоках не блокирует цикл
+    событий. Если в очереди уже max_queue операций, новая получает 503,
+    а не ждет бесконечно.
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def _submit(self, func, *args):
+        with self._lock:
+            if self.pending >= self.workers + self.max_queue:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Too many concurrent password operations",
+                    headers={"Retry-After": "1"},
+                )
+            self.pending += 1
+        future = self._executor.submit(func, *args)
+        future.add_done_callback(self._done)
+        return future
+
+    def _done(self, _future) -> None:
+        with self._lock:
+            self.pending -= 1
+            self.completed += 1
+
+    def run(self, func, *args):
+        """Для синхронного кода: выполняет в пуле и ждет результат"""
+        return self._submit(func, *args).result()
+
+    async def run_async(self, func, *args):
+        return await asyncio.wrap_future(self._submit(func, *args))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "in_flight": min(self.pending, self.workers),
+                "queued": max(self.pending - self.workers, 0),
+                "completed": self.completed,
+                "rejected": self.rejected,
+            }
+
+
+password_hasher = PasswordHasher(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_QUEUE)
 
 
 def create_access_token(
@@ -34,10 +110,21 @@ def create_access_token(
 
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return password_hasher.run(pwd_context.hash, password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_hasher.run(pwd_context.verify, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    return await password_hasher.run_async(pwd_context.hash, password)
+
+async def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, Optional[str]]:
+    """Проверяет пароль; второй элемент - новый хеш, если параметры bcrypt изменились"""
+    return await password_hasher.run_async(
+        pwd_context.verify_and_update, plain_password, hashed_password
+    )
 
 def generate_api_key() -> str:
     """Генерирует случайный API ключ"""
@@ -55,28 +142,79 @@ def create_api_key(db: Session, name: str) -> ApiKey:
         api_secret=generate_api_secret(),
         name=name
     )
-    db.add(api_key)
-    db.commit()
-    db.refresh(api_key)
+    commit_returning(db, api_key)
     return api_key
 
-def verify_api_key(db: Session, api_key: str, signature: str, data: str) -> bool:
-    """Проверяет подпись API запроса"""
-    key = db.query(ApiKey).filter(
+class FailedLookupLimiter:
+    """Ограничивает для каждого клиента число запросов в БД по неизвестным
+    ключам за окно времени: перебор ключей не нагружает базу, а ошибки
+    одного клиента не закрывают проверку ключей остальным"""
+
+    def __init__(self, limit: int, window: float, maxsize: int = 10000):
+        self.limit = limit
+        self.window = window
+        # Клиент -> (конец окна, число неудач)
+        self._failures = TTLCache(maxsize, window)
+        self._lock = threading.Lock()
+
+    def allowed(self, client: str) -> bool:
+        _, failures = self._failures.get(client, (None, 0))
+        return failures < self.limit
+
+    def record_failure(self, client: str) -> None:
+        with self._lock:
+            now = time.monotonic()
+            window_end, failures = self._failures.get(client, (now + self.window, 0))
+            self._failures.set(client, (window_end, failures + 1), window_end - now)
+
+
+failed_lookups = FailedLookupLimiter(
+    settings.API_KEY_MAX_FAILED_LOOKUPS, settings.API_KEY_FAILED_LOOKUP_WINDOW
+)
+
+
+def _load_api_key_hmac(db: Session, api_key: str, client: Optional[str] = None):
+    cached = api_key_cache.get(api_key)
+    if cached is not None:
+        return cached
+    if client is not None and not failed_lookups.allowed(client):
+        return UNKNOWN_KEY
+    key = db.query(ApiKey.api_secret).filter(
         ApiKey.api_key == api_key,
         ApiKey.is_active == True
     ).first()
-    
     if not key:
+        if client is not None:
+            failed_lookups.record_failure(client)
+        api_key_cache.set(api_key, UNKNOWN_KEY, settings.API_KEY_NEGATIVE_TTL)
+        return UNKNOWN_KEY
+    # Ключевое расписание HMAC считается один раз, на запрос - только copy()
+    prepared = hmac.new(key.api_secret.encode(), digestmod=hashlib.sha256)
+    api_key_cache.set(api_key, prepared)
+    return prepared
+
+
+def invalidate_api_key(api_key: str) -> None:
+    """Сбрасывает кэш ключа после изменения или удаления"""
+    api_key_cache.delete(api_key)
+    verified_signatures.delete(api_key)
+
+def is_verified_signature(api_key: str, signature: str) -> bool:
+    """Была ли эта подпись ключа уже проверена verify_api_key (без обращения к БД)"""
+    return signature in verified_signatures.get(api_key, ())
+
+def verify_api_key(db: Session, api_key: str, signature: str, data: str, client: Optional[str] = None) -> bool:
+    """Проверяет подпись API запроса; client (IP) учитывается в лимите неудачных поисков ключа"""
+    prepared = _load_api_key_hmac(db, api_key, client)
+    if prepared is UNKNOWN_KEY:
         return False
-        
-    expected_signature = hmac.new(
-        key.api_secret.encode(),
-        data.encode(),
-        hashlib.sha256
-    ).hexdigest()
-    
-    return hmac.compare_digest(signature, expected_signature)
+
+    mac = prepared.copy()
+    mac.update(data.encode())
+    if not hmac.compare_digest(signature, mac.hexdigest()):
+        return False
+    verified_signatures.set(api_key, verified_signatures.get(api_key, frozenset()) | {signature})
+    return True
 
 def get_api_key_signature(api_secret: str, data: str) -> str:
     """Генерирует подпись для API запроса"""
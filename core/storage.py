@@ -0,0 +1,175 @@
+import asyncio
+import logging
+import os
+import re
+import time
+import uuid
+from pathlib import Path
+from typing import Iterable, Optional, Set
+
+import aiofiles.os
+from fastapi import UploadFile
+from sqlalchemy import func, select, union
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import get_settings
+from core.uploads import StoredUpload, _discard, save_upload
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+MEDIA_DIR = "media"
+# media/ab/cd/<sha256><ext>
+MEDIA_KEY_RE = re.compile(r"^media/([0-9a-f]{2})/([0-9a-f]{2})/\1\2[0-9a-f]{60}(\.[a-z0-9]{1,10})?$")
+EXT_RE = re.compile(r"^\.[a-z0-9]{1,10}$")
+# Производные изображения лежат рядом с оригиналом: <original>.w<width>.<format>
+VARIANT_RE = re.compile(r"^(?P<original>.+)\.w(?P<width>\d+)\.(?P<format>[a-z0-9]+)$")
+
+
+def media_key(sha256: str, ext: str = "") -> str:
+    """Ключ файла в хранилище: путь относительно UPLOAD_DIR, разбитый по первым байтам хеша"""
+    return f"{MEDIA_DIR}/{sha256[:2]}/{sha256[2:4]}/{sha256}{ext}"
+
+
+def is_media_key(key: Optional[str]) -> bool:
+    return bool(key) and MEDIA_KEY_RE.match(key) is not None
+
+
+def variant_key(key: str, width: int, fmt: str) -> str:
+    return f"{key}.w{width}.{fmt}"
+
+
+def original_key(key: str) -> Optional[str]:
+    """Ключ оригинала для производного файла, None - если это не производный файл"""
+    match = VARIANT_RE.match(key)
+    return match.group("original") if match else None
+
+
+def media_ext(filename: Optional[str]) -> str:
+    ext = Path(filename or "").suffix.lower()
+    return ext if EXT_RE.match(ext) else ""
+
+
+def _reference_columns():
+    # Импорт внутри функции: модели публикаций сами импортируют core
+    from publications.models import Publication, PublicationImage, PublicationVideo
+    return (
+        Publication.photo,
+        Publication.file_path,
+        PublicationImage.image,
+        PublicationVideo.video,
+    )
+
+
+class MediaStore:
+    """Контентно-адресуемое хранилище медиа с дедупликацией по SHA-256.
+
+    Одинаковые файлы хранятся один раз; ссылки на файл - это строки в
+    publications.photo/file_path, publication_images.image и
+    publication_videos.video. Файл удаляется, когда на него не осталось ссылок.
+    """
+
+    def __init__(self, root: Path, gc_grace: int = 3600):
+        self.root = root
+        self.tmp_dir = root / ".tmp"
+        # Свежие файлы не удаляются: их строка в БД может быть еще не закоммичена
+        self.gc_grace = gc_grace
+        self._lock = asyncio.Lock()
+
+    def path(self, key: str) -> Path:
+        """Путь файла по ключу. Ключи вне UPLOAD_DIR (абсолютные пути, ../)
+        отвергаются: photo и file_path публикаций - произвольные строки"""
+        path = self.root / key
+        root = self.root.resolve()
+        resolved = path.resolve()
+        if resolved == root or not resolved.is_relative_to(root):
+            raise ValueError(f"Key {key!r} is outside of media storage")
+        return path
+
+    async def _discard_with_variants(self, key: str) -> None:
+        path = self.path(key)
+        variants = await asyncio.to_thread(lambda: list(path.parent.glob(f"{path.name}.w*")))
+        for variant in [path, *variants]:
+            await _discard(variant)
+
+    def tmp_path(self) -> Path:
+        return self.tmp_dir / f"{uuid.uuid4().hex}.part"
+
+    async def put(self, stored: StoredUpload, ext: str = "") -> str:
+        """Переносит загруженный файл в хранилище; если такой уже есть, копия удаляется"""
+        key = media_key(stored.sha256, ext)
+        dest = self.path(key)
+        async with self._lock:
+            if await aiofiles.os.path.exists(dest):
+                await _discard(stored.path)
+                # Обновляем mtime, чтобы сборщик не удалил файл до коммита новой ссылки
+                await asyncio.to_thread(os.utime, dest)
+            else:
+                await aiofiles.os.makedirs(dest.parent, exist_ok=True)
+                await aiofiles.os.replace(stored.path, dest)
+        return key
+
+    async def put_upload(self, upload: UploadFile, max_size: int) -> str:
+        stored = await save_upload(upload, self.tmp_path(), max_size)
+        return await self.put(stored, media_ext(upload.filename))
+
+    async def references(self, db: AsyncSession, key: str) -> int:
+        counts = [
+            select(func.count()).where(column == key).scalar_subquery()
+            for column in _reference_columns()
+        ]
+        return await db.scalar(select(sum(counts[1:], counts[0])))
+
+    async def _is_fresh(self, path: Path) -> bool:
+        try:
+            stat = await aiofiles.os.stat(path)
+        except FileNotFoundError:
+            return False
+        return time.time() - stat.st_mtime < self.gc_grace
+
+    async def release(self, db: AsyncSession, keys: Iterable[Optional[str]]) -> None:
+        """Удаляет файлы, на которые после коммита не осталось ссылок"""
+        for key in set(filter(None, keys)):
+            async with self._lock:
+                if await self.references(db, key):
+                    continue
+                try:
+                    path = self.path(key)
+                except ValueError:
+                    logger.warning("Not deleting %r: outside of media storage", key)
+                    continue
+                # Старые файлы (до хранилища) удаляются сразу, хешированные - после grace
+                if is_media_key(key) and await self._is_fresh(path):
+                    continue
+                await self._discard_with_variants(key)
+
+    async def referenced_keys(self, db: AsyncSession) -> Set[str]:
+        stmt = union(*[select(column).where(column.is_not(None)) for column in _reference_columns()])
+        return set((await db.scalars(stmt)).all())
+
+    def _scan(self) -> list:
+        media_root = self.root / MEDIA_DIR
+        found = []
+        for dirpath, _, filenames in os.walk(media_root):
+            for name in filenames:
+                key = Path(dirpath, name).relative_to(self.root).as_posix()
+                found.append(key)
+        return found
+
+    async def collect_garbage(self, db: AsyncSession) -> int:
+        """Удаляет из media/ файлы без ссылок (например, после прерванных операций)"""
+        referenced = await self.referenced_keys(db)
+        removed = 0
+        for key in await asyncio.to_thread(self._scan):
+            original = original_key(key) or key
+            if original in referenced or not is_media_key(original):
+                continue
+            async with self._lock:
+                if await self._is_fresh(self.path(key)):
+                    continue
+                await _discard(self.path(key))
+                removed += 1
+        return removed
+
+
+media_store = MediaStore(Path(settings.UPLOAD_DIR), settings.MEDIA_GC_GRACE)
@@ -0,0 +1,78 @@
+from functools import lru_cache
+from typing import Dict, Optional
+
+import httpx
+
+from core.config import get_settings
+from core.ratelimit import TokenBucket
+
+# Лимит Telegram действует на бота, а не на рассылку: один bucket на токен
+_buckets: Dict[str, TokenBucket] = {}
+
+
+class TelegramError(Exception):
+    """Ошибка Bot API: код ответа, описание и retry_after при 429"""
+
+    def __init__(self, status: int, description: str, retry_after: Optional[float] = None):
+        super().__init__(f"{status}: {description}")
+        self.status = status
+        self.description = description
+        self.retry_after = retry_after
+
+
+class TelegramClient:
+    """Минимальный асинхронный клиент Telegram Bot API"""
+
+    def __init__(self, token: str, base_url: str = "https://api.telegram.org", timeout: float = 10,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.client = httpx.AsyncClient(
+            base_url=f"{base_url.rstrip('/')}/bot{token}",
+            timeout=timeout,
+            transport=transport,
+        )
+
+    async def call(self, method: str, **params) -> dict:
+        response = await self.client.post(f"/{method}", json={k: v for k, v in params.items() if v is not None})
+        try:
+            data = response.json()
+        except ValueError:
+            raise TelegramError(response.status_code, response.text[:200])
+        if not data.get("ok"):
+            raise TelegramError(
+                data.get("error_code", response.status_code),
+                data.get("description", ""),
+                (data.get("parameters") or {}).get("retry_after"),
+            )
+        return data["result"]
+
+    async def send_message(self, chat_id: int, text: str, parse_mode: Optional[str] = None) -> dict:
+        return await self.call(
+            "sendMessage",
+            chat_id=chat_id,
+            text=text,
+            parse_mode=parse_mode,
+            disable_web_page_preview=True,
+        )
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+@lru_cache()
+def get_telegram() -> TelegramClient:
+    settings = get_settings()
+    return TelegramClient(settings.BOT_TOKEN, settings.TELEGRAM_API_URL, settings.TELEGRAM_TIMEOUT)
+
+
+def get_rate_limiter(token: Optional[str] = None) -> TokenBucket:
+    """Общий для процесса TokenBucket бота с темпом TELEGRAM_RATE"""
+    settings = get_settings()
+    token = token or settings.BOT_TOKEN
+    if token not in _buckets:
+        _buckets[token] = TokenBucket(settings.TELEGRAM_RATE)
+    return _buckets[token]
+
+
+async def close_telegram() -> None:
+    if get_telegram.cache_info().currsize:
+        await get_telegram().close()
@@ -0,0 +1,57 @@
+import logging
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, List
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template, select_autoescape
+
+from core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_DIR = Path(__file__).parent.parent / "templates"
+
+
+@lru_cache()
+def get_env() -> Environment:
+    """Общее для процесса окружение Jinja.
+
+    Скомпилированные шаблоны хранятся в кэше окружения; без auto_reload
+    шаблон не перепроверяется на диске при каждом обращении. Байткод можно
+    дополнительно сохранять на диск, чтобы новые процессы не компилировали заново.
+    """
+    settings = get_settings()
+    bytecode_cache = None
+    if settings.TEMPLATES_BYTECODE_CACHE:
+        Path(settings.TEMPLATES_BYTECODE_CACHE).mkdir(parents=True, exist_ok=True)
+        bytecode_cache = FileSystemBytecodeCache(settings.TEMPLATES_BYTECODE_CACHE)
+    return Environment(
+        loader=FileSystemLoader(TEMPLATE_DIR),
+        autoescape=select_autoescape(["html", "xml"]),
+        auto_reload=settings.TEMPLATES_AUTO_RELOAD,
+        cache_size=settings.TEMPLATES_CACHE_SIZE,
+        bytecode_cache=bytecode_cache,
+    )
+
+
+def get_template(template_name: str) -> Template:
+    return get_env().get_template(template_name)
+
+
+def render(template_name: str, **context) -> str:
+    return get_template(template_name).render(**context)
+
+
+def render_many(template_name: str, contexts: Iterable[dict]) -> List[str]:
+    """Рендерит один шаблон для многих получателей (шаблон ищется один раз)"""
+    template = get_template(template_name)
+    return [template.render(**context) for context in contexts]
+
+
+def precompile() -> None:
+    """Компилирует все шаблоны заранее, чтобы первое письмо не платило за компиляцию"""
+    env = get_env()
+    names = env.list_templates(filter_func=lambda name: not name.startswith("."))
+    for name in names:
+        env.get_template(name)
+    logger.info("Precompiled %d templates", len(names))
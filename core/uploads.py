@@ -0,0 +1,232 @@
+import asyncio
+import fcntl
+import hashlib
+import json
+import os
+import re
+import time
+import uuid
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator, Dict, Optional, Tuple
+
+import aiofiles
+import aiofiles.os
+from fastapi import HTTPException, UploadFile
+
+from core.config import get_settings
+
+settings = get_settings()
+
+
+@dataclass
+class StoredUpload:
+    path: Path
+    size: int
+    sha256: str
+
+
+def safe_filename(filename: Optional[str]) -> str:
+    """Оставляет от имени файла клиента только последнюю компоненту пути"""
+    name = Path(filename or "").name
+    if name in ("", ".", ".."):
+        raise HTTPException(status_code=400, detail="Invalid file name")
+    return name
+
+
+async def _discard(path: Path) -> None:
+    try:
+        await aiofiles.os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+async def save_upload(upload: UploadFile, dest: Path, max_size: int) -> StoredUpload:
+    """Потоково пишет загрузку на диск частями, проверяя размер и считая SHA-256.
+
+    Данные пишутся во временный файл рядом с dest и переименовываются
+    только после успешного чтения, так что оборванная загрузка не оставляет
+    полузаписанный файл.
+    """
+    await aiofiles.os.makedirs(dest.parent, exist_ok=True)
+    tmp = dest.with_name(f".{dest.name}.{uuid.uuid4().hex}.part")
+    hasher = hashlib.sha256()
+    size = 0
+    try:
+        async with aiofiles.open(tmp, "wb") as out:
+            while chunk := await upload.read(settings.UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_size:
+                    raise HTTPException(status_code=413, detail="File too large")
+                hasher.update(chunk)
+                await out.write(chunk)
+        await aiofiles.os.replace(tmp, dest)
+    except BaseException:
+        await _discard(tmp)
+        raise
+    return StoredUpload(dest, size, hasher.hexdigest())
+
+
+async def hash_file(path: Path) -> str:
+    hasher = hashlib.sha256()
+    async with aiofiles.open(path, "rb") as f:
+        while chunk := await f.read(settings.UPLOAD_CHUNK_SIZE):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+class ResumableUploads:
+    """Возобновляемые загрузки больших файлов (видео) по частям.
+
+    Клиент создает загрузку с объявленным размером, затем отправляет части
+    телом PATCH-запроса с заголовком Upload-Offset и завершает загрузку.
+    Прерванную загрузку можно продолжить с смещения, которое вернет status().
+
+    Все состояние загрузки лежит на диске и общее для воркеров: смещение -
+    размер файла .part (записанные байты не перезаписываются), метаданные -
+    в .json, а запись и завершение сериализуются блокировкой flock на
+    .part. Состояние SHA-256 сериализовать нельзя, поэтому хеш ведется в
+    памяти процесса только как ускорение: если часть пришла в другой
+    воркер, при завершении файл перечитывается с диска. Загрузки без
+    изменений дольше ttl секунд удаляются collect_stale().
+    """
+
+    def __init__(self, incoming_dir: Path, ttl: float = 24 * 3600):
+        self.incoming_dir = incoming_dir
+        self.ttl = ttl
+        self._hashers: Dict[str, Tuple[int, "hashlib._Hash"]] = {}
+        self._last_sweep = 0.0
+
+    def _paths(self, upload_id: str) -> Tuple[Path, Path]:
+        if not re.fullmatch(r"[0-9a-f]{32}", upload_id):
+            raise HTTPException(status_code=404, detail="Upload not found")
+        return (
+            self.incoming_dir / f"{upload_id}.part",
+            self.incoming_dir / f"{upload_id}.json",
+        )
+
+    @asynccontextmanager
+    async def _locked(self, upload_id: str):
+        """Исключительная блокировка загрузки, общая для всех процессов"""
+        part, _ = self._paths(upload_id)
+        try:
+            fd = await asyncio.to_thread(os.open, part, os.O_RDONLY)
+        except FileNotFoundError:
+            raise HTTPException(status_code=404, detail="Upload not found")
+        try:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                raise HTTPException(status_code=423, detail="Upload is busy")
+            yield
+        finally:
+            os.close(fd)
+
+    async def create(self, size: int, max_size: int, meta: dict) -> str:
+        if size > max_size:
+            raise HTTPException(status_code=413, detail="File too large")
+        if time.monotonic() - self._last_sweep > min(self.ttl, 3600):
+            await self.collect_stale()
+        upload_id = uuid.uuid4().hex
+        part, meta_path = self._paths(upload_id)
+        await aiofiles.os.makedirs(self.incoming_dir, exist_ok=True)
+        async with aiofiles.open(meta_path, "w") as f:
+            await f.write(json.dumps({**meta, "size": size}))
+        async with aiofiles.open(part, "wb"):
+            pass
+        self._hashers[upload_id] = (0, hashlib.sha256())
+        return upload_id
+
+    async def status(self, upload_id: str) -> dict:
+        part, meta_path = self._paths(upload_id)
+        try:
+            async with aiofiles.open(meta_path) as f:
+                meta = json.loads(await f.read())
+            offset = (await aiofiles.os.stat(part)).st_size
+        except FileNotFoundError:
+            raise HTTPException(status_code=404, detail="Upload not found")
+        return {**meta, "upload_id": upload_id, "offset": offset}
+
+    async def append(self, upload_id: str, offset: int, chunks: AsyncIterator[bytes]) -> int:
+        async with self._locked(upload_id):
+            meta = await self.status(upload_id)
+            if offset != meta["offset"]:
+                raise HTTPException(
+                    status_code=409,
+                    detail="Upload offset mismatch",
+                    headers={"Upload-Offset": str(meta["offset"])},
+                )
+            part, _ = self._paths(upload_id)
+            # Хеш из памяти годится, только если он посчитан ровно по записанным байтам
+            hashed = self._hashers.pop(upload_id, None)
+            hasher = hashed[1] if hashed and hashed[0] == offset else None
+            written = offset
+            try:
+                async with aiofiles.open(part, "ab") as out:
+                    async for chunk in chunks:
+                        if written + len(chunk) > meta["size"]:
+                            raise HTTPException(status_code=413, detail="Upload exceeds declared size")
+                        await out.write(chunk)
+                        written += len(chunk)
+                        if hasher is not None:
+                            hasher.update(chunk)
+            finally:
+                # Даже при обрыве соединения записанная часть остается и учитывается
+                if hasher is not None:
+                    self._hashers[upload_id] = (written, hasher)
+            return written
+
+    async def complete(self, upload_id: str, dest: Path) -> StoredUpload:
+        async with self._locked(upload_id):
+            meta = await self.status(upload_id)
+            if meta["offset"] != meta["size"]:
+                raise HTTPException(status_code=409, detail="Upload is incomplete")
+            part, meta_path = self._paths(upload_id)
+            hashed = self._hashers.pop(upload_id, None)
+            if hashed and hashed[0] == meta["size"]:
+                sha256 = hashed[1].hexdigest()
+            else:
+                sha256 = await hash_file(part)
+            await aiofiles.os.makedirs(dest.parent, exist_ok=True)
+            await aiofiles.os.replace(part, dest)
+            await _discard(meta_path)
+        return StoredUpload(dest, meta["size"], sha256)
+
+    async def abort(self, upload_id: str) -> None:
+        part, meta_path = self._paths(upload_id)
+        async with self._locked(upload_id):
+            await _discard(part)
+            await _discard(meta_path)
+        self._hashers.pop(upload_id, None)
+
+    async def collect_stale(self) -> int:
+        """Удаляет загрузки, которые не менялись дольше ttl секунд"""
+        self._last_sweep = time.monotonic()
+        deadline = time.time() - self.ttl
+        removed = 0
+        names = await asyncio.to_thread(
+            lambda: {path.stem for path in self.incoming_dir.glob("*") if path.suffix in (".part", ".json")}
+        )
+        for upload_id in names:
+            if not re.fullmatch(r"[0-9a-f]{32}", upload_id):
+                continue
+            part, meta_path = self._paths(upload_id)
+            try:
+                changed = max([(await aiofiles.os.stat(path)).st_mtime for path in (part, meta_path)])
+            except FileNotFoundError:
+                # Метаданные без части (или наоборот) остаются после сбоя
+                changed = 0
+            if changed >= deadline:
+                continue
+            try:
+                async with self._locked(upload_id):
+                    await _discard(part)
+                    await _discard(meta_path)
+            except HTTPException as exc:
+                if exc.status_code != 404:
+                    continue  # в загрузку прямо сейчас пишут
+                await _discard(meta_path)
+            self._hashers.pop(upload_id, None)
+            removed += 1
+        return removed
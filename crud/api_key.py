@@ -1,6 +1,10 @@
 from sqlalchemy.orm import Session
+from core.database import commit_returning
 from core.models import ApiKey
 from schemas.api_key import APIKeyCreate, APIKeyUpdate
+from typing import Optional
+from core.pagination import paginate
+from core.security import invalidate_api_key
 import secrets
 import string
 
@@ -21,9 +25,7 @@ def create_api_key(db: Session, api_key: APIKeyCreate) -> ApiKey:
         api_secret=generate_api_secret(),
         is_active=api_key.is_active
     )
-    db.add(db_api_key)
-    db.commit()
-    db.refresh(db_api_key)
+    commit_returning(db, db_api_key)
     return db_api_key
 
 
@@ -39,13 +41,17 @@ def get_api_keys(db: Session, skip: int = 0, limit: int = 100) -> list[ApiKey]:
     return db.query(ApiKey).offset(skip).limit(limit).all()
 
 
+def get_api_keys_page(db: Session, cursor: Optional[str] = None, limit: int = 100) -> dict:
+    return paginate(db.query(ApiKey), ApiKey, cursor, limit)
+
+
 def update_api_key(db: Session, api_key_id: int, api_key: APIKeyUpdate) -> ApiKey:
     db_api_key = get_api_key(db, api_key_id)
     if db_api_key:
         for key, value in api_key.dict(exclude_unset=True).items():
             setattr(db_api_key, key, value)
-        db.commit()
-        db.refresh(db_api_key)
+        commit_returning(db, db_api_key)
+        invalidate_api_key(db_api_key.api_key)
     return db_api_key
 
 
@@ -54,5 +60,6 @@ def delete_api_key(db: Session, api_key_id: int) -> bool:
     if db_api_key:
         db.delete(db_api_key)
         db.commit()
+        invalidate_api_key(db_api_key.api_key)
         return True
     return False 
\ No newline at end of file
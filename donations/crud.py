@@ -1,8 +1,10 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from . import models, schemas
 from typing import List, Optional
 from fastapi import HTTPException
 from datetime import datetime
+from core.database import commit_returning
+from core.pagination import paginate
 
 def create_donation_campaign(db: Session, campaign: schemas.DonationCampaignCreate) -> models.DonationCampaign:
     db_campaign = models.DonationCampaign(
@@ -11,16 +13,15 @@ def create_donation_campaign(db: Session, campaign: schemas.DonationCampaignCrea
         wallet_id=campaign.wallet_id,
         is_active=campaign.is_active
     )
-    db.add(db_campaign)
-    db.commit()
-    db.refresh(db_campaign)
+    commit_returning(db, db_campaign)
     return db_campaign
 
 def get_donation_campaign(db: Session, campaign_id: int) -> models.DonationCampaign | None:
     return db.query(models.DonationCampaign).filter(models.DonationCampaign.id == campaign_id).first()
 
 def get_campaign_by_uuid(db: Session, uuid: str) -> Optional[models.DonationCampaign]:
-    return db.query(models.DonationCampaign).filter(models.DonationCampaign.uuid == uuid).first()
+    """Кампания с кошельком по uuid (поиск по уникальному индексу uuid)"""
+    return campaigns_with_wallet(db).filter(models.DonationCampaign.uuid == uuid).first()
 
 def get_donation_campaigns(db: Session, skip: int = 0, limit: int = 100) -> list[models.DonationCampaign]:
     return db.query(models.DonationCampaign).offset(skip).limit(limit).all()
@@ -38,8 +39,7 @@ def update_donation_campaign(
     for field, value in update_data.items():
         setattr(db_campaign, field, value)
     
-    db.commit()
-    db.refresh(db_campaign)
+    commit_returning(db, db_campaign)
     return db_campaign
 
 def delete_donation_campaign(db: Session, campaign_id: int) -> bool:
@@ -59,9 +59,7 @@ def create_wallet(db: Session, wallet: schemas.WalletCreate) -> models.Wallet:
         eth=wallet.eth,
         btc=wallet.btc
     )
-    db.add(db_wallet)
-    db.commit()
-    db.refresh(db_wallet)
+    commit_returning(db, db_wallet)
     return db_wallet
 
 def get_wallet(db: Session, wallet_id: int) -> Optional[models.Wallet]:
@@ -73,6 +71,9 @@ def get_wallet_by_uuid(db: Session, uuid: str) -> Optional[models.Wallet]:
 def get_wallets(db: Session, skip: int = 0, limit: int = 100) -> List[models.Wallet]:
     return db.query(models.Wallet).offset(skip).limit(limit).all()
 
+def get_wallets_page(db: Session, cursor: Optional[str] = None, limit: int = 100) -> dict:
+    return paginate(db.query(models.Wallet), models.Wallet, cursor, limit)
+
 def update_wallet(db: Session, wallet_id: int, wallet: schemas.WalletUpdate) -> Optional[models.Wallet]:
     db_wallet = get_wallet(db, wallet_id)
     if not db_wallet:
@@ -82,8 +83,7 @@ def update_wallet(db: Session, wallet_id: int, wallet: schemas.WalletUpdate) ->
     for field, value in update_data.items():
         setattr(db_wallet, field, value)
     
-    db.commit()
-    db.refresh(db_wallet)
+    commit_returning(db, db_wallet)
     return db_wallet
 
 def delete_wallet(db: Session, wallet_id: int) -> bool:
@@ -112,16 +112,28 @@ def create_campaign(db: Session, campaign: schemas.DonationCampaignCreate) -> mo
         wallet_id=campaign.wallet_id,
         is_active=campaign.is_active
     )
-    db.add(db_campaign)
-    db.commit()
-    db.refresh(db_campaign)
+    commit_returning(db, db_campaign)
     return db_campaign
 
+def campaigns_with_wallet(db: Session, is_active: Optional[bool] = None):
+    """Кампании вместе с кошельком одним запросом (LEFT JOIN wallets)"""
+    query = db.query(models.DonationCampaign).options(joinedload(models.DonationCampaign.wallet))
+    if is_active is not None:
+        query = query.filter(models.DonationCampaign.is_active == is_active)
+    return query
+
 def get_campaign(db: Session, campaign_id: int) -> Optional[models.DonationCampaign]:
-    return db.query(models.DonationCampaign).filter(models.DonationCampaign.id == campaign_id).first()
+    return campaigns_with_wallet(db).filter(models.DonationCampaign.id == campaign_id).first()
 
-def get_campaigns(db: Session, skip: int = 0, limit: int = 100) -> List[models.DonationCampaign]:
-    return db.query(models.DonationCampaign).offset(skip).limit(limit).all()
+def get_campaigns(
+    db: Session, skip: int = 0, limit: int = 100, is_active: Optional[bool] = None
+) -> List[models.DonationCampaign]:
+    return campaigns_with_wallet(db, is_active).offset(skip).limit(limit).all()
+
+def get_campaigns_page(
+    db: Session, cursor: Optional[str] = None, limit: int = 100, is_active: Optional[bool] = None
+) -> dict:
+    return paginate(campaigns_with_wallet(db, is_active), models.DonationCampaign, cursor, limit)
 
 def update_campaign(db: Session, campaign_id: int, campaign: schemas.DonationCampaignUpdate) -> Optional[models.DonationCampaign]:
     db_campaign = get_campaign(db, campaign_id)
@@ -132,8 +144,7 @@ def update_campaign(db: Session, campaign_id: int, campaign: schemas.DonationCam
     for field, value in update_data.items():
         setattr(db_campaign, field, value)
     
-    db.commit()
-    db.refresh(db_campaign)
+    commit_returning(db, db_campaign)
     return db_campaign
 
 def delete_campaign(db: Session, campaign_id: int) -> bool:
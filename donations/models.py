@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, UUID, Numeric
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, UUID, Numeric, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import uuid
@@ -20,6 +20,15 @@ class DonationCampaign(Base):
     
     wallet = relationship("Wallet")
 
+    __table_args__ = (
+        Index("ix_donation_campaigns_created_at_id", "created_at", "id"),
+        # Частичный индекс под публичный список активных кампаний
+        Index(
+            "ix_donation_campaigns_active_created_at_id", "created_at", "id",
+            postgresql_where=text("is_active"),
+        ),
+    )
+
     def __str__(self):
         return self.title
 
@@ -36,5 +45,9 @@ class Wallet(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, onupdate=datetime.utcnow)
 
+    __table_args__ = (
+        Index("ix_wallets_created_at_id", "created_at", "id"),
+    )
+
     def __str__(self):
         return f"{self.name} (ID: {self.id})"
\ No newline at end of file
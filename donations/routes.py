@@ -1,40 +1,60 @@
 from fastapi import APIRouter, Depends, HTTPException
+from pydantic import UUID4
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional, Union
 
-from core.database import get_db
+from core.database import get_read_db
 from donations import schemas, crud
+from core.pagination import Page
 
 router = APIRouter(tags=["donations"])
 
-@router.get("/campaigns", response_model=List[schemas.DonationCampaign])
+@router.get(
+    "/campaigns",
+    response_model=Union[Page[schemas.DonationCampaignWithWallet], List[schemas.DonationCampaignWithWallet]],
+)
 def get_campaigns(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    is_active: Optional[bool] = None,
+    db: Session = Depends(get_read_db)
 ):
-    """Получить список кампаний по сбору средств"""
-    return crud.get_campaigns(db, skip=skip, limit=limit)
+    """Получить список кампаний по сбору средств вместе с адресами кошельков"""
+    if cursor is not None:
+        return crud.get_campaigns_page(db, cursor=cursor, limit=limit, is_active=is_active)
+    return crud.get_campaigns(db, skip=skip, limit=limit, is_active=is_active)
 
-@router.get("/campaigns/{campaign_id}", response_model=schemas.DonationCampaign)
-def get_campaign(campaign_id: int, db: Session = Depends(get_db)):
+@router.get("/campaigns/uuid/{campaign_uuid}", response_model=schemas.DonationCampaignWithWallet)
+def get_campaign_by_uuid(campaign_uuid: UUID4, db: Session = Depends(get_read_db)):
+    """Получить кампанию по uuid вместе с адресами кошелька"""
+    campaign = crud.get_campaign_by_uuid(db, campaign_uuid)
+    if not campaign:
+        raise HTTPException(status_code=404, detail="Campaign not found")
+    return campaign
+
+@router.get("/campaigns/{campaign_id}", response_model=schemas.DonationCampaignWithWallet)
+def get_campaign(campaign_id: int, db: Session = Depends(get_read_db)):
     """Получить информацию о конкретной кампании"""
     campaign = crud.get_campaign(db, campaign_id)
     if not campaign:
         raise HTTPException(status_code=404, detail="Campaign not found")
     return campaign
 
-@router.get("/wallets", response_model=List[schemas.Wallet])
+@router.get("/wallets", response_model=Union[Page[schemas.Wallet], List[schemas.Wallet]])
 def get_wallets(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db)
 ):
     """Получить список кошельков"""
+    if cursor is not None:
+        return crud.get_wallets_page(db, cursor=cursor, limit=limit)
     return crud.get_wallets(db, skip=skip, limit=limit)
 
 @router.get("/wallets/{wallet_id}", response_model=schemas.Wallet)
-def get_wallet(wallet_id: int, db: Session = Depends(get_db)):
+def get_wallet(wallet_id: int, db: Session = Depends(get_read_db)):
     """Получить информацию о конкретном кошельке"""
     wallet = crud.get_wallet(db, wallet_id)
     if not wallet:
@@ -54,4 +54,8 @@ class DonationCampaign(DonationCampaignBase):
     updated_at: Optional[datetime] = None
 
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True
+
+class DonationCampaignWithWallet(DonationCampaign):
+    """Кампания с адресами кошелька: страница пожертвования получает все одним запросом"""
+    wallet: Optional[WalletResponse] = None
@@ -1,15 +1,20 @@
 from sqlalchemy.orm import Session
 from . import models, schemas
+from typing import Optional
 from core.config import get_settings
-from fastapi_mail import FastMail, MessageSchema, ConnectionConfig
-from pathlib import Path
-from pydantic import EmailStr
+from core.database import commit_returning
+from core.pagination import paginate
+from core.queue import enqueue
+from .tasks import FEEDBACK_EMAIL
 
 def create_feedback(db: Session, feedback: schemas.FeedbackCreate):
     db_feedback = models.Feedback(**feedback.model_dump())
     db.add(db_feedback)
-    db.commit()
-    db.refresh(db_feedback)
+    db.flush()
+    # Уведомление сотрудникам ставится в очередь в той же транзакции, что и сам отзыв
+    if get_settings().MAIL_FEEDBACK_TO:
+        enqueue(db, FEEDBACK_EMAIL, {"feedback_id": db_feedback.id}, commit=False)
+    commit_returning(db, db_feedback)
     return db_feedback
 
 def get_feedback(db: Session, feedback_id: int):
@@ -18,6 +23,9 @@ def get_feedback(db: Session, feedback_id: int):
 def get_feedbacks(db: Session, skip: int = 0, limit: int = 100):
     return db.query(models.Feedback).offset(skip).limit(limit).all()
 
+def get_feedbacks_page(db: Session, cursor: Optional[str] = None, limit: int = 100):
+    return paginate(db.query(models.Feedback), models.Feedback, cursor, limit)
+
 def update_feedback(db: Session, feedback_id: int, feedback: schemas.FeedbackUpdate):
     db_feedback = get_feedback(db, feedback_id)
     if not db_feedback:
@@ -27,8 +35,7 @@ def update_feedback(db: Session, feedback_id: int, feedback: schemas.FeedbackUpd
     for field, value in update_data.items():
         setattr(db_feedback, field, value)
     
-    db.commit()
-    db.refresh(db_feedback)
+    commit_returning(db, db_feedback)
     return db_feedback
 
 def delete_feedback(db: Session, feedback_id: int):
@@ -39,30 +46,3 @@ def delete_feedback(db: Session, feedback_id: int):
     db.delete(db_feedback)
     db.commit()
     return True
-
-async def send_feedback_email(feedback: models.Feedback):
-    settings = get_settings()
-    conf = ConnectionConfig(
-        MAIL_USERNAME=settings.MAIL_USERNAME,
-        MAIL_PASSWORD=settings.MAIL_PASSWORD,
-        MAIL_FROM=settings.MAIL_FROM,
-        MAIL_PORT=settings.MAIL_PORT,
-        MAIL_SERVER=settings.MAIL_SERVER,
-        MAIL_STARTTLS=True,
-        MAIL_SSL_TLS=False,
-        USE_CREDENTIALS=True,
-        TEMPLATE_FOLDER=Path(__file__).parent.parent / 'templates'
-    )
-    
-    message = MessageSchema(
-        subject="Спасибо за ваш отзыв!",
-        recipients=[feedback.email],
-        template_body={
-            "name": feedback.name,
-            "message": feedback.message
-        },
-        subtype="html"
-    )
-    
-    fm = FastMail(conf)
-    await fm.send_message(message, template_name="feedback_email.html")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Index
 from sqlalchemy.sql import func
 from core.database import Base
 
@@ -13,5 +13,9 @@ class Feedback(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    __table_args__ = (
+        Index("ix_feedback_created_at_id", "created_at", "id"),
+    )
+
     def __str__(self):
         return f"Feedback from {self.name} ({self.email})"
@@ -0,0 +1,55 @@
+from typing import List, Optional
+
+from sqlalchemy import select
+
+from core.config import get_settings
+from core.database import AsyncSessionLocal
+from core.mail import build_message, get_mailer
+from core.queue import job_handler
+from core.templates import render_many
+from . import models
+
+settings = get_settings()
+
+FEEDBACK_EMAIL = "feedback_email"
+
+
+def build_feedback_emails(feedbacks: List[models.Feedback]):
+    """Уведомления о новых отзывах на email.feedback_to.
+
+    Письма уходят только на настроенные ящики сотрудников: адрес из формы
+    не проверен, и отправка на него превращала бы публичный POST в
+    ретранслятор почты. Ответ автору - через Reply-To.
+    """
+    bodies = render_many(
+        "feedback_notification.html",
+        (
+            {"name": feedback.name, "email": feedback.email, "message": feedback.message}
+            for feedback in feedbacks
+        ),
+    )
+    messages = []
+    for feedback, body in zip(feedbacks, bodies):
+        message = build_message(to=settings.MAIL_FEEDBACK_TO, subject="Новый отзыв", html=body)
+        message["Reply-To"] = feedback.email
+        messages.append(message)
+    return messages
+
+
+@job_handler(FEEDBACK_EMAIL, batch_size=settings.MAIL_BATCH_SIZE)
+async def send_feedback_emails(payloads: List[dict]) -> List[Optional[Exception]]:
+    """Отправляет уведомления пачкой по одному SMTP-соединению"""
+    ids = [payload["feedback_id"] for payload in payloads]
+    async with AsyncSessionLocal() as db:
+        feedbacks = {
+            feedback.id: feedback
+            for feedback in (await db.scalars(
+                select(models.Feedback).where(models.Feedback.id.in_(ids))
+            )).all()
+        }
+    # Отзыв могли удалить, пока письмо ждало в очереди
+    to_send = [feedback_id for feedback_id in ids if feedback_id in feedbacks]
+    messages = build_feedback_emails([feedbacks[feedback_id] for feedback_id in to_send])
+    sent = await get_mailer().send_many(messages)
+    results = dict(zip(to_send, sent))
+    return [results.get(feedback_id) for feedback_id in ids]
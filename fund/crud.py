@@ -1,4 +1,5 @@
 from sqlalchemy.orm import Session
+from core.database import commit_returning
 from . import models, schemas
 
 def get_fund_info(db: Session):
@@ -6,9 +7,7 @@ def get_fund_info(db: Session):
 
 def create_fund_info(db: Session, fund_info: schemas.FundInfoCreate):
     db_fund_info = models.FundInfo(**fund_info.model_dump())
-    db.add(db_fund_info)
-    db.commit()
-    db.refresh(db_fund_info)
+    commit_returning(db, db_fund_info)
     return db_fund_info
 
 def update_fund_info(db: Session, fund_info: schemas.FundInfoUpdate):
@@ -20,15 +19,12 @@ def update_fund_info(db: Session, fund_info: schemas.FundInfoUpdate):
     for field, value in update_data.items():
         setattr(db_fund_info, field, value)
     
-    db.commit()
-    db.refresh(db_fund_info)
+    commit_returning(db, db_fund_info)
     return db_fund_info
 
 def create_social_link(db: Session, social_link: schemas.SocialLinkCreate):
     db_social_link = models.SocialLink(**social_link.model_dump())
-    db.add(db_social_link)
-    db.commit()
-    db.refresh(db_social_link)
+    commit_returning(db, db_social_link)
     return db_social_link
 
 def get_social_links(db: Session, fund_id: int):
@@ -44,9 +40,7 @@ def delete_social_link(db: Session, social_link_id: int):
 
 def create_bank_detail(db: Session, bank_detail: schemas.BankDetailCreate):
     db_bank_detail = models.BankDetail(**bank_detail.model_dump())
-    db.add(db_bank_detail)
-    db.commit()
-    db.refresh(db_bank_detail)
+    commit_returning(db, db_bank_detail)
     return db_bank_detail
 
 def get_bank_details(db: Session, fund_id: int):
@@ -0,0 +1,41 @@
+import sys
+from pathlib import Path
+from typing import Optional
+
+import typer
+
+from core.database import SessionLocal
+from tgusers.crud import IMPORT_BATCH_SIZE, import_tg_users
+
+app = typer.Typer()
+
+
+@app.command()
+def main(
+    path: str = typer.Argument(..., help="CSV (id_telegram,name) или NDJSON; '-' - читать stdin"),
+    format: Optional[str] = typer.Option(None, help="csv или ndjson; по умолчанию по расширению файла"),
+    batch_size: int = typer.Option(IMPORT_BATCH_SIZE, help="Строк в одном INSERT ... ON CONFLICT"),
+) -> None:
+    """Импортирует пользователей Telegram в tg_users (повторный импорт обновляет имена)"""
+    format = format or ("csv" if path.lower().endswith(".csv") else "ndjson")
+    if format not in ("csv", "ndjson"):
+        typer.echo(f"Unknown format: {format}")
+        raise typer.Exit(code=1)
+
+    db = SessionLocal()
+    try:
+        if path == "-":
+            stats = import_tg_users(db, sys.stdin, format, batch_size)
+        else:
+            with Path(path).open(encoding="utf-8-sig", newline="") as stream:
+                stats = import_tg_users(db, stream, format, batch_size)
+    finally:
+        db.close()
+
+    typer.echo(f"Inserted: {stats['inserted']}, updated: {stats['updated']}, skipped: {stats['skipped']}")
+    for error in stats["errors"]:
+        typer.echo(f"  {error}")
+
+
+if __name__ == "__main__":
+    app()
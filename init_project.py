@@ -1,7 +1,7 @@
 import typer
 from sqlalchemy.orm import Session
 from core.config import get_settings, load_yaml_config
-from core.database import get_db
+from core.database import get_db, build_database_url
 from users.models import User
 from core.security import get_password_hash
 from alembic.config import Config
@@ -53,7 +53,7 @@ def run_migrations() -> None:
             missing = [f for f in required_fields if f not in db]
             raise ValueError(f"Missing required database config fields: {missing}")
             
-        db_url = f"{db['driver']}://{db['user']}:{db['password']}@{db['host']}:{db['port']}/{db['name']}"
+        db_url = build_database_url(db)
         
         alembic_cfg = Config("alembic.ini")
         alembic_cfg.set_main_option("sqlalchemy.url", db_url)
@@ -4,6 +4,20 @@ import logging
 from pathlib import Path
 from core.config import get_settings
 from core.database import engine, Base
+from core.cache import CacheMiddleware
+from core.ratelimit import RateLimitMiddleware
+from core.media import router as media_router
+from core.images import shutdown_pool
+from core.queue import start_worker, stop_worker
+from core.mail import close_mailer
+from core.telegram import close_telegram
+from core.templates import precompile
+from core.metrics import setup_metrics
+from core.profiling import ProfilingMiddleware
+from publications.counters import start_view_counter, stop_view_counter
+import publications.tasks  # регистрирует обработчики задач
+import feedback.tasks
+import tgusers.tasks
 from users.routes import router as users_router
 from fund.routes import router as fund_router
 from feedback.routes import router as feedback_router
@@ -34,6 +48,31 @@ app = FastAPI(
     openapi_url=f"{settings.API_V1_STR}/openapi.json"
 )
 
+# Кэш публичных GET-эндпоинтов (сбрасывается из админки по пространству имен)
+app.add_middleware(
+    CacheMiddleware,
+    rules=[
+        (rf"^{settings.API_V1_STR}/fund/(info|social-links/\d+|bank-details/\d+)$", "fund"),
+        (rf"^{settings.API_V1_STR}/(campaigns|wallets)$", "donations"),
+        (r"^/api/v1/publications/(top)?$", "publications"),
+    ],
+)
+
+# Ограничение частоты запросов (security.rate_limit*)
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimitMiddleware)
+
+# Метрики Prometheus: латентность по маршрутам, SQL-запросы, пулы (metrics.*)
+setup_metrics(app, settings)
+
+# Профилирование SQL и поиск N+1 (profiling.*), только для отладки
+if settings.PROFILING_ENABLED:
+    app.add_middleware(
+        ProfilingMiddleware,
+        threshold=settings.PROFILING_N_PLUS_ONE_THRESHOLD,
+        log_statements=settings.PROFILING_LOG_STATEMENTS,
+    )
+
 # Настройка CORS
 app.add_middleware(
     CORSMiddleware,
@@ -51,10 +90,27 @@ app.include_router(donations_router, prefix=settings.API_V1_STR)
 app.include_router(publications_api_router)
 app.include_router(tg_router)
 app.include_router(api_key_router)
+app.include_router(media_router)
 
 # Инициализация админ-роутов
 init_admin_routes(app)
 
+# Пул процессов для обработки изображений
+app.add_event_handler("shutdown", shutdown_pool)
+
+# Обработчик очереди фоновых задач
+app.add_event_handler("startup", start_worker)
+app.add_event_handler("shutdown", stop_worker)
+app.add_event_handler("shutdown", close_mailer)
+app.add_event_handler("shutdown", close_telegram)
+
+# Отложенная запись просмотров публикаций (views.*)
+app.add_event_handler("startup", start_view_counter)
+app.add_event_handler("shutdown", stop_view_counter)
+
+# Шаблоны писем компилируются при старте
+app.add_event_handler("startup", precompile)
+
 @app.get("/api/v1/")
 async def root():
     return {"message": "Welcome to Muhajeer Foundation API", "version": settings.VERSION}
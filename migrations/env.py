@@ -6,14 +6,14 @@ from sqlalchemy import pool
 from alembic import context
 
 from core.config import load_yaml_config
+from core.database import build_database_url
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
 
 yaml_config = load_yaml_config()
-db = yaml_config["database"]
-db_url = f"{db['driver']}://{db['user']}:{db['password']}@{db['host']}:{db['port']}/{db['name']}"
+db_url = build_database_url(yaml_config["database"])
 # Установка URL из конфига
 config.set_main_option("sqlalchemy.url", db_url)
 
@@ -0,0 +1,27 @@
+"""add publications keyset index
+
+Revision ID: 5b1e7c2d9a41
+Revises: c4056afe6e02
+Create Date: 2025-05-10 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b1e7c2d9a41'
+down_revision: Union[str, None] = 'c4056afe6e02'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Индекс под keyset-пагинацию ленты публикаций (created_at DESC, id DESC)
+    op.create_index('ix_publications_created_at_id', 'publications', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_publications_created_at_id', table_name='publications')
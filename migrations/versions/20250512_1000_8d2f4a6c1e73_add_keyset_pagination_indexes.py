@@ -0,0 +1,31 @@
+"""add keyset pagination indexes
+
+Revision ID: 8d2f4a6c1e73
+Revises: 5b1e7c2d9a41
+Create Date: 2025-05-12 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d2f4a6c1e73'
+down_revision: Union[str, None] = '5b1e7c2d9a41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ['feedback', 'users', 'api_keys', 'donation_campaigns', 'wallets']
+
+
+def upgrade() -> None:
+    # Индексы (created_at, id) под курсорную пагинацию списков
+    for table in TABLES:
+        op.create_index(f'ix_{table}_created_at_id', table, ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.drop_index(f'ix_{table}_created_at_id', table_name=table)
@@ -0,0 +1,34 @@
+"""add active campaigns index
+
+Revision ID: b4d1f8e2c637
+Revises: a3c9e5f7b210
+Create Date: 2025-05-16 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4d1f8e2c637'
+down_revision: Union[str, None] = 'a3c9e5f7b210'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Частичный индекс (created_at, id) под список активных кампаний;
+    # поиск по uuid уже обслуживает уникальное ограничение donation_campaigns.uuid
+    op.create_index(
+        'ix_donation_campaigns_active_created_at_id',
+        'donation_campaigns',
+        ['created_at', 'id'],
+        unique=False,
+        postgresql_where=sa.text('is_active'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_donation_campaigns_active_created_at_id', table_name='donation_campaigns')
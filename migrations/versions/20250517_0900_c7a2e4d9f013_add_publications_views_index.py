@@ -0,0 +1,34 @@
+"""add publications views index
+
+Revision ID: c7a2e4d9f013
+Revises: b4d1f8e2c637
+Create Date: 2025-05-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7a2e4d9f013'
+down_revision: Union[str, None] = 'b4d1f8e2c637'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("UPDATE publications SET views = 0 WHERE views IS NULL")
+    # (views, id) для выборки самых просматриваемых активных публикаций без сортировки
+    op.create_index(
+        'ix_publications_active_views_id',
+        'publications',
+        ['views', 'id'],
+        unique=False,
+        postgresql_where=sa.text('is_active'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_publications_active_views_id', table_name='publications')
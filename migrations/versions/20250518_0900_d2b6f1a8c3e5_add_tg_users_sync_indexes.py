@@ -0,0 +1,29 @@
+"""add tg_users sync indexes
+
+Revision ID: d2b6f1a8c3e5
+Revises: c7a2e4d9f013
+Create Date: 2025-05-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2b6f1a8c3e5'
+down_revision: Union[str, None] = 'c7a2e4d9f013'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Выгрузка изменений /api/v1/tg/all?since=... фильтрует по created_at OR updated_at
+    op.create_index('ix_tg_users_created_at', 'tg_users', ['created_at'], unique=False)
+    op.create_index('ix_tg_users_updated_at', 'tg_users', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tg_users_updated_at', table_name='tg_users')
+    op.drop_index('ix_tg_users_created_at', table_name='tg_users')
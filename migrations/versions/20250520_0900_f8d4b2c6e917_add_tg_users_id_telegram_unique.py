@@ -0,0 +1,39 @@
+"""add unique index on tg_users.id_telegram
+
+Revision ID: f8d4b2c6e917
+Revises: e5c3a7b9d104
+Create Date: 2025-05-20 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f8d4b2c6e917'
+down_revision: Union[str, None] = 'e5c3a7b9d104'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Удаляем дубликаты, оставляя самую раннюю запись каждого id_telegram
+    op.execute(
+        """
+        DELETE FROM tg_users
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT id, row_number() OVER (PARTITION BY id_telegram ORDER BY id) AS rn
+                FROM tg_users
+            ) ranked
+            WHERE rn > 1
+        )
+        """
+    )
+    op.create_index('ix_tg_users_id_telegram', 'tg_users', ['id_telegram'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tg_users_id_telegram', table_name='tg_users')
@@ -1,20 +1,65 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from typing import List
-from .models import Publication as PublicationModel, PublicationImage, PublicationVideo
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session, selectinload
+from typing import List, Optional
+from .counters import get_view_counter
+from .models import Publication as PublicationModel
 from .schemas import Publication
-from core.database import get_db
+from core.database import get_read_db
+from core.pagination import apply_keyset, build_page
 
 router = APIRouter(prefix="/api/v1/publications", tags=["publications"])
 
+
+def _with_media(db: Session):
+    return db.query(PublicationModel).options(
+        selectinload(PublicationModel.images),
+        selectinload(PublicationModel.videos),
+    )
+
+
 @router.get("/", response_model=List[Publication])
-def list_publications(db: Session = Depends(get_db)):
-    publications = db.query(PublicationModel).all()
-    result = []
-    for pub in publications:
-        images = db.query(PublicationImage).filter(PublicationImage.publication_id == pub.id).all()
-        videos = db.query(PublicationVideo).filter(PublicationVideo.publication_id == pub.id).all()
-        pub.images = images
-        pub.videos = videos
-        result.append(pub)
-    return result 
\ No newline at end of file
+def list_publications(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
+    db: Session = Depends(get_read_db)
+):
+    """Список публикаций: три запроса на страницу, курсор следующей страницы в X-Next-Cursor.
+
+    Отдается одна страница (limit, по умолчанию 100), а не весь архив, как
+    раньше: клиенты, которым нужны все публикации, идут по X-Next-Cursor,
+    пока заголовок не пропадет.
+    """
+    rows = apply_keyset(_with_media(db), PublicationModel, cursor, limit).all()
+    items, next_cursor = build_page(rows, limit)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return items
+
+
+@router.get("/top", response_model=List[Publication])
+def top_publications(
+    limit: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_read_db)
+):
+    """Самые просматриваемые активные публикации: читаются с конца индекса (views, id)"""
+    return (
+        _with_media(db)
+        .filter(PublicationModel.is_active == True)
+        .order_by(PublicationModel.views.desc(), PublicationModel.id.desc())
+        .limit(limit)
+        .all()
+    )
+
+
+@router.get("/{publication_id}", response_model=Publication)
+async def get_publication(publication_id: int, db: Session = Depends(get_read_db)):
+    """Публикация по id; просмотр учитывается в буфере и попадает в views при ближайшем сбросе"""
+    publication = await run_in_threadpool(
+        lambda: _with_media(db).filter(PublicationModel.id == publication_id).first()
+    )
+    if publication is None:
+        raise HTTPException(status_code=404, detail="Publication not found")
+    await get_view_counter().hit(publication.id)
+    return publication
@@ -0,0 +1,157 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Optional
+
+from sqlalchemy import case, func, update
+
+from core.cache import REDIS_RETRY_AFTER, RedisError, aioredis
+from core.config import get_settings
+from core.database import AsyncSessionLocal
+from .models import Publication
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY = "views:publications"
+
+
+class ViewCounter:
+    """Счетчик просмотров публикаций с отложенной записью.
+
+    Просмотры копятся в буфере (Redis, общий для воркеров, или память
+    процесса) и раз в VIEWS_FLUSH_INTERVAL секунд записываются в БД
+    агрегированными приращениями: views = views + delta. Приращения
+    складываются, поэтому несколько воркеров могут сбрасывать буферы
+    одновременно без потери обновлений.
+    """
+
+    def __init__(self, redis=None, session_factory=AsyncSessionLocal, batch_size: int = 500):
+        self.redis = redis
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self._pending: Counter = Counter()
+        self._lock = threading.Lock()
+        self._redis_down_until = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+
+    def _use_redis(self) -> bool:
+        return self.redis is not None and time.monotonic() >= self._redis_down_until
+
+    def _redis_failed(self, exc: Exception) -> None:
+        logger.warning("Redis view buffer unavailable, falling back to memory: %s", exc)
+        self._redis_down_until = time.monotonic() + REDIS_RETRY_AFTER
+
+    def _add(self, deltas: Dict[int, int]) -> None:
+        with self._lock:
+            self._pending.update(deltas)
+
+    async def hit(self, publication_id: int, count: int = 1) -> None:
+        if self._use_redis():
+            try:
+                await self.redis.hincrby(REDIS_KEY, publication_id, count)
+                return
+            except (RedisError, OSError) as exc:
+                self._redis_failed(exc)
+        self._add({publication_id: count})
+
+    async def _take(self) -> Dict[int, int]:
+        """Забирает накопленные приращения, обнуляя буферы"""
+        with self._lock:
+            deltas, self._pending = self._pending, Counter()
+        if self._use_redis():
+            try:
+                # HGETALL и DEL в одной транзакции: параллельный hit попадет либо
+                # в забранные значения, либо в новый хэш
+                async with self.redis.pipeline(transaction=True) as pipe:
+                    pipe.hgetall(REDIS_KEY)
+                    pipe.delete(REDIS_KEY)
+                    shared, _ = await pipe.execute()
+                deltas.update({int(key): int(value) for key, value in shared.items()})
+            except (RedisError, OSError) as exc:
+                self._redis_failed(exc)
+        return {key: value for key, value in deltas.items() if value}
+
+    async def _give_back(self, deltas: Dict[int, int]) -> None:
+        """Возвращает приращения в буфер, если запись в БД не удалась"""
+        if self._use_redis():
+            try:
+                async with self.redis.pipeline(transaction=False) as pipe:
+                    for publication_id, delta in deltas.items():
+                        pipe.hincrby(REDIS_KEY, publication_id, delta)
+                    await pipe.execute()
+                return
+            except (RedisError, OSError) as exc:
+                self._redis_failed(exc)
+        self._add(deltas)
+
+    async def flush(self) -> int:
+        """Записывает накопленные просмотры в БД, возвращает число обновленных публикаций"""
+        deltas = await self._take()
+        if not deltas:
+            return 0
+        # Строки блокируются в порядке id, чтобы воркеры не ловили взаимные блокировки
+        ids = sorted(deltas)
+        try:
+            async with self.session_factory() as db:
+                for start in range(0, len(ids), self.batch_size):
+                    chunk = {publication_id: deltas[publication_id] for publication_id in ids[start:start + self.batch_size]}
+                    await db.execute(
+                        update(Publication)
+                        .where(Publication.id.in_(chunk))
+                        .values(views=func.coalesce(Publication.views, 0) + case(chunk, value=Publication.id))
+                        .execution_options(synchronize_session=False)
+                    )
+                await db.commit()
+        except Exception:
+            logger.exception("Failed to flush %d publication view counters", len(deltas))
+            await self._give_back(deltas)
+            return 0
+        return len(deltas)
+
+    async def run(self, interval: float) -> None:
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._stopping.wait(), interval)
+            except asyncio.TimeoutError:
+                pass
+            await self.flush()
+
+    def start(self, interval: float) -> None:
+        self._stopping.clear()
+        self._task = asyncio.create_task(self.run(interval))
+
+    async def stop(self) -> None:
+        """Останавливает фоновый сброс; последний сброс выполняется перед выходом"""
+        self._stopping.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        else:
+            await self.flush()
+
+
+@lru_cache()
+def get_view_counter() -> ViewCounter:
+    settings = get_settings()
+    redis = None
+    if settings.VIEWS_STORAGE == "redis" and aioredis is not None:
+        redis = aioredis.Redis(
+            host=settings.CACHE_HOST,
+            port=settings.CACHE_PORT,
+            db=settings.CACHE_DB,
+            socket_timeout=0.5,
+            socket_connect_timeout=0.5,
+        )
+    return ViewCounter(redis, batch_size=settings.VIEWS_BATCH_SIZE)
+
+
+async def start_view_counter() -> None:
+    get_view_counter().start(get_settings().VIEWS_FLUSH_INTERVAL)
+
+
+async def stop_view_counter() -> None:
+    await get_view_counter().stop()
@@ -2,6 +2,8 @@ from sqlalchemy.orm import Session
 from .models import Publication
 from .schemas import PublicationCreate, PublicationUpdate
 from typing import List, Optional
+from core.database import commit_returning
+from core.pagination import paginate
 
 
 def get_publication(db: Session, publication_id: int) -> Optional[Publication]:
@@ -28,14 +30,16 @@ def get_publications(db: Session, skip: int = 0, limit: int = 100) -> List[Publi
     return pubs
 
 
+def get_publications_page(db: Session, cursor: Optional[str] = None, limit: int = 100) -> dict:
+    return paginate(db.query(Publication), Publication, cursor, limit)
+
+
 def create_publication(db: Session, publication: PublicationCreate, file_path: str = None) -> Publication:
     data = publication.dict()
     if file_path is not None:
         data["file_path"] = file_path
     db_publication = Publication(**data)
-    db.add(db_publication)
-    db.commit()
-    db.refresh(db_publication)
+    commit_returning(db, db_publication)
     return db_publication
 
 
@@ -45,8 +49,7 @@ def update_publication(db: Session, publication_id: int, publication: Publicatio
         return None
     for field, value in publication.dict(exclude_unset=True).items():
         setattr(db_publication, field, value)
-    db.commit()
-    db.refresh(db_publication)
+    commit_returning(db, db_publication)
     return db_publication
 
 
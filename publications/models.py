@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, func, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, func, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from core.database import Base
 
@@ -19,6 +19,15 @@ class Publication(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    images = relationship("PublicationImage", back_populates="publication", cascade="all, delete-orphan", passive_deletes=True)
+    videos = relationship("PublicationVideo", back_populates="publication", cascade="all, delete-orphan", passive_deletes=True)
+
+    __table_args__ = (
+        Index("ix_publications_created_at_id", "created_at", "id"),
+        # Самые просматриваемые активные публикации читаются с конца индекса без сортировки
+        Index("ix_publications_active_views_id", "views", "id", postgresql_where=is_active == True),
+    )
+
     def __str__(self):
         return self.title
 
@@ -28,7 +37,7 @@ class PublicationImage(Base):
     id = Column(Integer, primary_key=True, index=True)
     publication_id = Column(Integer, ForeignKey("publications.id", ondelete="CASCADE"), nullable=False)
     image = Column(String, nullable=False)
-    publication = relationship("Publication", backref="images")
+    publication = relationship("Publication", back_populates="images")
 
 class PublicationVideo(Base):
     __tablename__ = "publication_videos"
@@ -36,4 +45,4 @@ class PublicationVideo(Base):
     id = Column(Integer, primary_key=True, index=True)
     publication_id = Column(Integer, ForeignKey("publications.id", ondelete="CASCADE"), nullable=False)
     video = Column(String, nullable=False)
-    publication = relationship("Publication", backref="videos")
\ No newline at end of file
+    publication = relationship("Publication", back_populates="videos")
\ No newline at end of file
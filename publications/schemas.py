@@ -1,6 +1,7 @@
-from pydantic import BaseModel
-from typing import Optional, List
+from pydantic import BaseModel, computed_field
+from typing import Dict, Optional, List
 from datetime import datetime
+from core.images import variant_urls
 
 class PublicationBase(BaseModel):
     title: str
@@ -30,6 +31,13 @@ class PublicationUpdate(BaseModel):
 class PublicationImage(BaseModel):
     id: int
     image: str
+
+    @computed_field
+    @property
+    def variants(self) -> Dict[str, Dict[int, str]]:
+        """Уменьшенные копии: {формат: {ширина: url}}"""
+        return variant_urls(self.image)
+
     class Config:
         from_attributes = True
 
@@ -47,13 +55,35 @@ class Publication(PublicationBase):
     images: List[PublicationImage] = []
     videos: List[PublicationVideo] = []
 
+    @computed_field
+    @property
+    def photo_variants(self) -> Dict[str, Dict[int, str]]:
+        return variant_urls(self.photo)
+
     class Config:
         from_attributes = True
 
 class PublicationResponse(PublicationBase):
     id: int
-    images: Optional[List[str]] = []
-    videos: Optional[List[str]] = []
+    images: List[PublicationImage] = []
+    videos: List[PublicationVideo] = []
+
+    @computed_field
+    @property
+    def photo_variants(self) -> Dict[str, Dict[int, str]]:
+        return variant_urls(self.photo)
 
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True 
+
+
+class ResumableUploadCreate(BaseModel):
+    filename: str
+    size: int
+
+
+class ResumableUploadStatus(BaseModel):
+    upload_id: str
+    filename: str
+    size: int
+    offset: int
@@ -0,0 +1,65 @@
+from pathlib import Path
+from typing import List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from core.config import get_settings
+from core.database import AsyncSessionLocal
+from core.pinata import get_pinata
+from core.queue import job_handler
+from .models import Publication
+
+settings = get_settings()
+
+PIN_PUBLICATION = "pin_publication"
+
+
+def publication_files(publication: Publication) -> List[str]:
+    keys = [publication.photo, publication.file_path]
+    keys += [image.image for image in publication.images]
+    keys += [video.video for video in publication.videos]
+    return [key for key in dict.fromkeys(keys) if key]
+
+
+def resolve_file(key: str) -> Optional[Path]:
+    # Старые записи хранят путь вместе с каталогом uploads
+    for path in (Path(settings.UPLOAD_DIR) / key, Path(key)):
+        if path.is_file():
+            return path
+    return None
+
+
+@job_handler(PIN_PUBLICATION, batch_size=settings.PINATA_BATCH_SIZE)
+async def pin_publications(payloads: List[dict]) -> List[dict]:
+    """Закрепляет файлы пачки публикаций в IPFS одной директорией
+    (<cid>/<publication_id>/<файл>) и заполняет ipfs_link"""
+    ids = [payload["publication_id"] for payload in payloads]
+    async with AsyncSessionLocal() as db:
+        publications = (await db.scalars(
+            select(Publication)
+            .where(Publication.id.in_(ids))
+            .options(selectinload(Publication.images), selectinload(Publication.videos))
+        )).all()
+
+        files = []
+        pinned = []
+        for publication in publications:
+            paths = {}
+            for key in publication_files(publication):
+                path = resolve_file(key)
+                if path is not None:
+                    paths.setdefault(path.name, path)
+            files += [(f"{publication.id}/{name}", path) for name, path in paths.items()]
+            if paths:
+                pinned.append(publication)
+        if not files:
+            return [{"cid": None, "ipfs_link": None} for _ in ids]
+
+        cid = await get_pinata().pin_directory(f"publications-{'-'.join(map(str, sorted(ids)))}", files)
+        links = {}
+        for publication in pinned:
+            publication.ipfs_link = f"{settings.PINATA_GATEWAY.rstrip('/')}/{cid}/{publication.id}/"
+            links[publication.id] = publication.ipfs_link
+        await db.commit()
+    return [{"cid": cid, "ipfs_link": links.get(publication_id)} for publication_id in ids]
@@ -0,0 +1,85 @@
+"""Общие фикстуры тестов.
+
+Настройки читаются из config.yaml текущего каталога при импорте модулей,
+поэтому до импорта приложения тесты переходят во временный каталог с
+config.yaml из config.example.yaml, где PostgreSQL заменен на SQLite,
+а Redis - на кэш в памяти.
+"""
+import asyncio
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+import yaml
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+ROOT = Path(__file__).resolve().parent.parent
+WORKDIR = Path(tempfile.mkdtemp(prefix="muhajir-tests-"))
+
+config = yaml.safe_load((ROOT / "config.example.yaml").read_text(encoding="utf-8"))
+config["database"].update(driver="sqlite", name=str(WORKDIR / "test.db"))
+config["cache"]["type"] = "memory"
+config["security"]["rate_limit_enabled"] = False
+config["security"]["bcrypt_rounds"] = 4
+config["metrics"]["port"] = 0
+config["queue"]["worker"] = False
+config["templates"]["bytecode_cache_dir"] = ""
+config["logging"]["file"] = str(WORKDIR / "app.log")
+(WORKDIR / "config.yaml").write_text(yaml.safe_dump(config, allow_unicode=True), encoding="utf-8")
+os.chdir(WORKDIR)
+
+pytest_plugins = ["core.pytest_plugin"]
+
+from admin.deps import get_current_admin  # noqa: E402
+from core.cache import get_cache  # noqa: E402
+from core.database import Base, SessionLocal, async_engine, engine  # noqa: E402
+import main  # noqa: E402  регистрирует все модели
+
+
+@pytest.fixture(autouse=True)
+def clean_db():
+    """Пустые таблицы и кэш ответов перед каждым тестом"""
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    get_cache().local.clear()
+    yield
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def async_session_factory():
+    """Асинхронные сессии для кода, запускаемого в тесте через asyncio.run:
+    движок без пула, чтобы соединения не переходили между циклами событий"""
+    db_engine = create_async_engine(async_engine.url, poolclass=NullPool)
+    yield async_sessionmaker(db_engine, expire_on_commit=False)
+    asyncio.run(db_engine.dispose())
+
+
+@pytest.fixture(scope="session")
+def app_client():
+    """Один клиент на сессию: фоновые задачи приложения привязаны к своему циклу событий"""
+    with TestClient(main.app) as client:
+        yield client
+
+
+@pytest.fixture
+def client(app_client):
+    yield app_client
+    main.app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def admin_client(client):
+    main.app.dependency_overrides[get_current_admin] = lambda: None
+    return client
@@ -0,0 +1,76 @@
+import hashlib
+import io
+
+import pytest
+from PIL import Image
+
+from core import images
+from core.storage import media_store, variant_key
+from publications.models import Publication
+
+
+def _png(size=(8, 8)):
+    buffer = io.BytesIO()
+    Image.new("RGB", size, "red").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+PNG = _png()
+
+
+@pytest.fixture
+def publication(db):
+    publication = Publication(title="T", slug="t", text="text")
+    db.add(publication)
+    db.commit()
+    return publication
+
+
+def test_photo_upload_replaces_photo(admin_client, publication):
+    url = f"/admin/publications/{publication.id}/photo"
+    first = admin_client.put(url, files={"file": ("a.png", PNG, "image/png")}).json()["photo"]
+    assert media_store.path(first).read_bytes() == PNG
+    assert hashlib.sha256(PNG).hexdigest() in first
+
+    second = admin_client.put(url, files={"file": ("b.png", PNG + b"x", "image/png")}).json()["photo"]
+    assert second != first
+    assert media_store.path(second).exists()
+
+
+def test_photo_upload_generates_derivatives(admin_client, publication):
+    response = admin_client.put(
+        f"/admin/publications/{publication.id}/photo", files={"file": ("a.png", PNG, "image/png")}
+    )
+    key = response.json()["photo"]
+    assert images.supported_formats()
+    for fmt in images.supported_formats():
+        for width in images.settings.IMAGE_SIZES:
+            assert media_store.path(variant_key(key, width, fmt)).exists()
+
+
+def test_variant_urls_checks_codecs_once(monkeypatch):
+    calls = []
+    monkeypatch.setattr(images.features, "check", lambda fmt: calls.append(fmt) or True)
+    images._encodable_formats.cache_clear()
+    try:
+        for _ in range(3):
+            assert set(images.variant_urls("a.png")) == set(images.settings.IMAGE_FORMATS)
+        assert calls == images.settings.IMAGE_FORMATS
+    finally:
+        images._encodable_formats.cache_clear()
+
+
+def test_file_upload_sets_file_path(admin_client, publication):
+    response = admin_client.put(
+        f"/admin/publications/{publication.id}/file",
+        files={"file": ("report.pdf", b"%PDF-1.4", "application/pdf")},
+    )
+    assert response.status_code == 200
+    assert response.json()["file_path"].endswith(".pdf")
+
+
+def test_upload_to_missing_publication(admin_client):
+    response = admin_client.put(
+        "/admin/publications/999/photo", files={"file": ("a.png", PNG, "image/png")}
+    )
+    assert response.status_code == 404
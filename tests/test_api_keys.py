@@ -0,0 +1,93 @@
+import secrets
+import time
+
+import pytest
+
+from core import security
+from core.security import (
+    FailedLookupLimiter, api_key_cache, get_api_key_signature, verified_signatures, verify_api_key,
+)
+from crud import api_key as api_key_crud
+from schemas.api_key import APIKeyCreate, APIKeyUpdate
+
+
+@pytest.fixture(autouse=True)
+def limiter(monkeypatch):
+    api_key_cache.clear()
+    verified_signatures.clear()
+    limiter = FailedLookupLimiter(limit=5, window=60)
+    monkeypatch.setattr(security, "failed_lookups", limiter)
+    yield limiter
+    api_key_cache.clear()
+    verified_signatures.clear()
+
+
+@pytest.fixture
+def api_key(db):
+    return api_key_crud.create_api_key(db, APIKeyCreate(name="bot"))
+
+
+def verify(db, key, client="10.0.0.1"):
+    signature = get_api_key_signature(key.api_secret, "all")
+    return verify_api_key(db, key.api_key, signature, "all", client)
+
+
+def test_bogus_keys_do_not_lock_out_other_clients(db, api_key):
+    for _ in range(100):
+        assert not verify_api_key(db, secrets.token_hex(16), "bogus", "all", "203.0.113.7")
+    # Ключ бота не был в кэше, но его поиск в БД не запрещен
+    assert verify(db, api_key)
+
+
+def test_limited_client_skips_db_lookups(db, limiter, query_budget):
+    for _ in range(5):
+        verify_api_key(db, secrets.token_hex(16), "bogus", "all", "203.0.113.7")
+    assert not limiter.allowed("203.0.113.7")
+    assert limiter.allowed("10.0.0.1")
+    with query_budget(0):
+        assert not verify_api_key(db, secrets.token_hex(16), "bogus", "all", "203.0.113.7")
+
+
+def test_failure_window_expires(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    limiter = FailedLookupLimiter(limit=2, window=60)
+    limiter.record_failure("a")
+    now[0] += 30
+    limiter.record_failure("a")
+    assert not limiter.allowed("a")
+    # Окно отсчитывается от первой неудачи, а не продлевается каждой следующей
+    now[0] += 31
+    assert limiter.allowed("a")
+
+
+def test_update_invalidates_cached_key(db, api_key):
+    assert verify(db, api_key)
+    assert security.is_verified_signature(api_key.api_key, get_api_key_signature(api_key.api_secret, "all"))
+
+    api_key_crud.update_api_key(db, api_key.id, APIKeyUpdate(is_active=False))
+    assert not security.is_verified_signature(api_key.api_key, get_api_key_signature(api_key.api_secret, "all"))
+    assert not verify(db, api_key)
+
+    api_key_crud.update_api_key(db, api_key.id, APIKeyUpdate(is_active=True))
+    assert verify(db, api_key)
+
+
+def test_delete_invalidates_cached_key(db, api_key):
+    key, secret = api_key.api_key, api_key.api_secret
+    assert verify(db, api_key)
+    assert api_key_crud.delete_api_key(db, api_key.id)
+    signature = get_api_key_signature(secret, "all")
+    assert not verify_api_key(db, key, signature, "all", "10.0.0.1")
+
+
+def test_tg_all_counts_failures_per_ip(client, db, api_key):
+    headers = {"x-api-key": api_key.api_key, "x-api-signature": get_api_key_signature(api_key.api_secret, "all")}
+    for _ in range(10):
+        response = client.get("/api/v1/tg/all", headers={"x-api-key": secrets.token_hex(16), "x-api-signature": "x"})
+        assert response.status_code == 403
+    assert not security.failed_lookups.allowed("testclient")
+    assert security.failed_lookups.allowed("10.0.0.1")
+    # Ключ бота с другого адреса проверяется как обычно
+    assert verify(db, api_key, client="10.0.0.1")
+    assert client.get("/api/v1/tg/all", headers=headers).status_code == 200
@@ -0,0 +1,170 @@
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+from sqlalchemy import select
+
+from core import queue, telegram as telegram_module
+from core.models import Job
+from core.ratelimit import TokenBucket
+from core.telegram import TelegramClient
+from tgusers import broadcast as broadcast_module, tasks
+from tgusers.broadcast import DONE, FAILED, RUNNING, SENT, TG_BROADCAST, Broadcaster
+from tgusers.models import TgBroadcast, TgUsers
+
+
+class FakeTelegram:
+    """Заглушка Bot API: запоминает получателей, отвечает 429 и 403 выбранным чатам.
+
+    Каждое вхождение чата в throttled - один ответ 429.
+    """
+
+    def __init__(self, throttled=(), blocked=()):
+        self.throttled = list(throttled)
+        self.blocked = set(blocked)
+        self.sent = []
+        self.requests = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        chat_id = json.loads(request.content)["chat_id"]
+        self.requests.append((chat_id, time.monotonic()))
+        if chat_id in self.throttled:
+            self.throttled.remove(chat_id)
+            return httpx.Response(429, json={
+                "ok": False, "error_code": 429, "description": "Too Many Requests",
+                "parameters": {"retry_after": 0.3},
+            })
+        if chat_id in self.blocked:
+            return httpx.Response(403, json={"ok": False, "error_code": 403, "description": "Forbidden"})
+        self.sent.append(chat_id)
+        return httpx.Response(200, json={"ok": True, "result": {"message_id": len(self.sent)}})
+
+
+@pytest.fixture
+def telegram():
+    return FakeTelegram()
+
+
+@pytest.fixture(autouse=True)
+def rate_limiters(monkeypatch):
+    monkeypatch.setattr(telegram_module, "_buckets", {})
+
+
+@pytest.fixture
+def broadcaster(telegram, async_session_factory):
+    def make(rate=1000, **options):
+        client = TelegramClient("token", transport=httpx.MockTransport(telegram))
+        options.setdefault("bucket", TokenBucket(rate))
+        options.setdefault("batch_size", 3)
+        return Broadcaster(client, async_session_factory, **options)
+    return make
+
+
+def add_recipients(db, count):
+    db.add_all([
+        TgUsers(id_telegram=1000 + n, name=f"user{n}", uuid_id=str(n)) for n in range(count)
+    ])
+    broadcast = TgBroadcast(text="Hello", parse_mode="HTML")
+    db.add(broadcast)
+    db.commit()
+    return broadcast.id
+
+
+def load(db, broadcast_id):
+    db.expire_all()
+    return db.get(TgBroadcast, broadcast_id)
+
+
+def test_retry_after_and_blocked(db, telegram, broadcaster):
+    broadcast_id = add_recipients(db, 12)
+    telegram.throttled = [1003]
+    telegram.blocked = {1005}
+
+    assert asyncio.run(broadcaster(batch_size=12).run(broadcast_id))
+
+    # Сообщение после 429 уходит повторно не раньше retry_after
+    attempts = [t for chat_id, t in telegram.requests if chat_id == 1003]
+    assert len(attempts) == 2
+    assert attempts[1] - attempts[0] >= 0.29
+    assert sorted(telegram.sent) == [1000 + n for n in range(12) if n != 5]
+
+    broadcast = load(db, broadcast_id)
+    assert (broadcast.status, broadcast.sent, broadcast.blocked, broadcast.failed) == (DONE, 11, 1, 0)
+
+
+def test_rate_limits_sending(db, telegram, broadcaster):
+    broadcast_id = add_recipients(db, 15)
+    asyncio.run(broadcaster(rate=10, batch_size=15).run(broadcast_id))
+    # Первые 10 уходят запасом, остальные 5 - не быстрее 10 в секунду
+    times = [t for _, t in telegram.requests]
+    assert times[-1] - times[0] >= 0.45
+
+
+def test_flood_waits_do_not_use_up_attempts(db, telegram, broadcaster):
+    telegram.throttled = [1001] * 3
+    sender = broadcaster()
+    assert asyncio.run(sender.deliver(1001, "Hello", None)) == SENT
+    assert [chat_id for chat_id, _ in telegram.requests] == [1001] * 4
+
+
+def test_flood_waits_are_capped(db, telegram, broadcaster, monkeypatch):
+    monkeypatch.setattr(broadcast_module, "MAX_FLOOD_WAITS", 2)
+    telegram.throttled = [1001] * 3
+    assert asyncio.run(broadcaster().deliver(1001, "Hello", None)) == FAILED
+    assert telegram.sent == []
+
+
+def test_slices_share_bot_rate_limit(db, telegram, broadcaster, monkeypatch):
+    monkeypatch.setattr(broadcast_module.settings, "TELEGRAM_RATE", 10)
+    broadcast_id = add_recipients(db, 15)
+    # Каждая часть - новый Broadcaster в своем цикле событий, как в обработчике очереди
+    while not asyncio.run(broadcaster(bucket=None, batch_size=5).run(broadcast_id, time_budget=1e-6)):
+        pass
+    # Запас в 10 сообщений не восстанавливается с каждой частью
+    times = [t for _, t in telegram.requests]
+    assert len(times) == 15
+    assert times[-1] - times[0] >= 0.45
+
+
+def test_resume_from_checkpoint_enqueues_continuation(db, telegram, broadcaster):
+    broadcast_id = add_recipients(db, 7)
+
+    assert not asyncio.run(broadcaster().run(broadcast_id, time_budget=1e-6))
+    broadcast = load(db, broadcast_id)
+    assert broadcast.status == RUNNING
+    assert broadcast.sent == 3
+    recipients = db.scalars(select(TgUsers).order_by(TgUsers.id)).all()
+    assert broadcast.last_tg_user_id == recipients[2].id
+    jobs = db.scalars(select(Job).where(Job.kind == TG_BROADCAST)).all()
+    assert [job.payload for job in jobs] == [{"broadcast_id": broadcast_id}]
+
+    # Новый экземпляр продолжает с контрольной точки без повторов
+    assert asyncio.run(broadcaster().run(broadcast_id))
+    assert telegram.sent == [1000 + n for n in range(7)]
+    assert load(db, broadcast_id).status == DONE
+
+
+def test_worker_runs_slices_until_done(db, telegram, broadcaster, async_session_factory, monkeypatch):
+    broadcast_id = add_recipients(db, 7)
+    monkeypatch.setattr(tasks, "Broadcaster", lambda: broadcaster(batch_size=2))
+    monkeypatch.setattr(tasks.settings, "TELEGRAM_SLICE_SECONDS", 1e-6)
+    monkeypatch.setattr(queue, "handlers", {TG_BROADCAST: queue.handlers[TG_BROADCAST]})
+    queue.enqueue(db, TG_BROADCAST, {"broadcast_id": broadcast_id})
+    worker = queue.Worker(async_session_factory)
+
+    async def drain():
+        slices = 0
+        while await worker.run_once():
+            slices += 1
+        return slices
+
+    # Четыре части по две отправки ставят в очередь следующую,
+    # пятая не находит получателей и завершает рассылку
+    assert asyncio.run(drain()) == 5
+    assert telegram.sent == [1000 + n for n in range(7)]
+    assert load(db, broadcast_id).status == DONE
+    db.expire_all()
+    statuses = db.scalars(select(Job.status).where(Job.kind == TG_BROADCAST)).all()
+    assert statuses == [queue.DONE] * 5
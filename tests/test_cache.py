@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+from fakeredis import FakeServer
+from fakeredis.aioredis import FakeRedis
+
+from core.cache import KEY_PREFIX, ResponseCache, get_cache
+from publications.models import Publication
+
+URL = "/api/v1/publications/"
+
+
+@pytest.fixture
+def server():
+    return FakeServer()
+
+
+@pytest.fixture
+def redis_cache(monkeypatch, server):
+    cache = get_cache()
+    monkeypatch.setattr(cache, "redis", FakeRedis(server=server))
+    monkeypatch.setattr(cache, "_redis_down_until", 0.0)
+    return cache
+
+
+@pytest.fixture
+def publication(db):
+    publication = Publication(title="Old", slug="p", text="text")
+    db.add(publication)
+    db.commit()
+    return publication
+
+
+def cached_keys(server, namespace):
+    async def scan():
+        redis = FakeRedis(server=server)
+        return [key async for key in redis.scan_iter(match=f"{KEY_PREFIX}{namespace}:*")]
+    return asyncio.run(scan())
+
+
+def test_etag_and_not_modified(client, redis_cache, server, publication):
+    first = client.get(URL)
+    assert first.headers["x-cache"] == "MISS"
+    etag = first.headers["etag"]
+    assert cached_keys(server, "publications")
+
+    second = client.get(URL)
+    assert second.headers["x-cache"] == "HIT"
+    assert second.headers["etag"] == etag
+    assert second.content == first.content
+
+    not_modified = client.get(URL, headers={"If-None-Match": f"W/{etag}"})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+
+
+def test_write_clears_namespace(admin_client, redis_cache, server, publication):
+    assert admin_client.get(URL).json()[0]["title"] == "Old"
+    admin_client.get("/api/v1/fund/social-links/1")
+    assert cached_keys(server, "publications")
+    fund_keys = cached_keys(server, "fund")
+    assert fund_keys
+
+    response = admin_client.put(f"/admin/publications/{publication.id}", json={"title": "New"})
+    assert response.status_code == 200
+    assert cached_keys(server, "publications") == []
+    # Другие пространства имен запись не трогает
+    assert cached_keys(server, "fund") == fund_keys
+
+    fresh = admin_client.get(URL)
+    assert fresh.headers["x-cache"] == "MISS"
+    assert fresh.json()[0]["title"] == "New"
+
+
+def test_falls_back_to_memory_when_redis_is_down(server):
+    server.connected = False
+    cache = ResponseCache(FakeRedis(server=server))
+
+    async def scenario():
+        await cache.set("cache:ns:/a?", {"body": "x"})
+        return await cache.get("cache:ns:/a?")
+
+    assert asyncio.run(scenario()) == {"body": "x"}
+    assert not cache._use_redis()
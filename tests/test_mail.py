@@ -0,0 +1,111 @@
+import asyncio
+import socket
+
+import pytest
+from aiosmtpd.controller import Controller
+from sqlalchemy import select
+
+from core.config import get_settings
+from core.mail import SMTPPool, build_message
+from core.models import Job
+from feedback import crud, schemas, tasks
+
+
+class RecordingHandler:
+    """SMTP-заглушка: запоминает сессии и письма, отказывает адресам refused@"""
+
+    def __init__(self):
+        self.sessions = 0
+        self.messages = []
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        self.sessions += 1
+        session.host_name = hostname
+        return responses
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address.startswith("refused@"):
+            return "550 mailbox unavailable"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append(envelope)
+        return "250 Message accepted"
+
+
+@pytest.fixture
+def smtp():
+    handler = RecordingHandler()
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    controller = Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+    yield handler, port
+    controller.stop()
+
+
+def make_pool(port: int) -> SMTPPool:
+    return SMTPPool("127.0.0.1", port, use_tls=False, timeout=5, size=1)
+
+
+def test_pool_reuses_connection(smtp):
+    handler, port = smtp
+
+    async def scenario():
+        pool = make_pool(port)
+        first = await pool.send_many([build_message("a@example.com", "1", "<p>1</p>")])
+        second = await pool.send_many([
+            build_message("b@example.com", "2", "<p>2</p>"),
+            build_message("c@example.com", "3", "<p>3</p>"),
+        ])
+        await pool.close()
+        return first + second
+
+    assert asyncio.run(scenario()) == [None, None, None]
+    assert len(handler.messages) == 3
+    assert handler.sessions == 1
+
+
+def test_refused_recipient_fails_only_its_message(smtp):
+    handler, port = smtp
+
+    async def scenario():
+        pool = make_pool(port)
+        results = await pool.send_many([
+            build_message("refused@example.com", "1", "<p>1</p>"),
+            build_message("ok@example.com", "2", "<p>2</p>"),
+        ])
+        await pool.close()
+        return results
+
+    refused, sent = asyncio.run(scenario())
+    assert refused is not None and sent is None
+    assert [envelope.rcpt_tos for envelope in handler.messages] == [["ok@example.com"]]
+    assert handler.sessions == 1
+
+
+def feedback_in(email: str = "visitor@example.com") -> schemas.FeedbackCreate:
+    return schemas.FeedbackCreate(name="Visitor", email=email, message="Hello")
+
+
+def test_feedback_without_staff_inbox_sends_nothing(db, monkeypatch):
+    monkeypatch.setattr(get_settings(), "MAIL_FEEDBACK_TO", [])
+    crud.create_feedback(db, feedback_in())
+    assert db.scalars(select(Job)).all() == []
+
+
+def test_feedback_notifies_staff_only(db, smtp, monkeypatch):
+    handler, port = smtp
+    monkeypatch.setattr(get_settings(), "MAIL_FEEDBACK_TO", ["staff@example.com"])
+    monkeypatch.setattr(tasks, "get_mailer", lambda: make_pool(port))
+    feedback = crud.create_feedback(db, feedback_in("victim@example.org"))
+    job = db.scalars(select(Job)).one()
+    assert job.kind == tasks.FEEDBACK_EMAIL
+
+    assert asyncio.run(tasks.send_feedback_emails([job.payload])) == [None]
+    [envelope] = handler.messages
+    assert envelope.rcpt_tos == ["staff@example.com"]
+    assert b"Reply-To: victim@example.org" in envelope.original_content
+    assert feedback.message.encode() in envelope.original_content
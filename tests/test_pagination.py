@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import update
+
+from core.pagination import paginate
+from publications.models import Publication, PublicationImage, PublicationVideo
+
+URL = "/api/v1/publications/"
+
+
+@pytest.fixture
+def publications(db):
+    started = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    rows = []
+    for n in range(7):
+        publication = Publication(
+            title=f"P{n}", slug=f"p{n}", text="text", created_at=started + timedelta(days=n)
+        )
+        publication.images = [PublicationImage(image=f"{n}.png")]
+        publication.videos = [PublicationVideo(video=f"{n}.mp4")]
+        rows.append(publication)
+    db.add_all(rows)
+    db.commit()
+    return rows
+
+
+def walk(fetch, limit):
+    ids, cursor = [], None
+    for _ in range(20):
+        page_ids, cursor = fetch(limit, cursor)
+        ids.extend(page_ids)
+        if not cursor:
+            return ids
+    pytest.fail(f"pagination did not finish: {ids}")
+
+
+def test_api_pages(client, publications):
+    def fetch(limit, cursor):
+        params = {"limit": limit, "cursor": cursor} if cursor else {"limit": limit}
+        response = client.get(URL, params=params)
+        assert response.status_code == 200
+        return [item["id"] for item in response.json()], response.headers.get("x-next-cursor")
+
+    expected = [p.id for p in reversed(publications)]
+    for limit in (1, 3, 7, 100):
+        assert walk(fetch, limit) == expected
+
+
+def test_rows_without_created_at_are_not_lost(db, publications):
+    # Старые записи без created_at: None при вставке заменил бы server_default
+    undated = [publications[2].id, publications[5].id]
+    db.execute(update(Publication).where(Publication.id.in_(undated)).values(created_at=None))
+    db.commit()
+
+    def fetch(limit, cursor):
+        page = paginate(db.query(Publication), Publication, cursor, limit)
+        return [p.id for p in page["items"]], page["next_cursor"]
+
+    # Сначала строки без created_at, затем новые к старым
+    expected = sorted(undated, reverse=True) + [
+        p.id for p in reversed(publications) if p.id not in undated
+    ]
+    for limit in (1, 2, 3, 10):
+        assert walk(fetch, limit) == expected
+
+
+def test_list_query_count_does_not_grow(client, publications, query_budget):
+    # Одна выборка публикаций и по одному selectinload на изображения и видео
+    with query_budget(3):
+        response = client.get(URL, params={"limit": 100})
+    assert len(response.json()) == len(publications)
+    assert response.json()[0]["images"]
+
+
+def test_invalid_cursor(client):
+    assert client.get(URL, params={"cursor": "!!"}).status_code == 400
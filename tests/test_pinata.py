@@ -0,0 +1,145 @@
+import asyncio
+from datetime import timedelta
+from pathlib import Path
+
+import httpx
+import pytest
+from sqlalchemy import select, update
+
+from core import queue
+from core.config import get_settings
+from core.models import Job
+from core.pinata import PinataClient
+from publications import tasks
+from publications.models import Publication, PublicationImage
+from publications.tasks import PIN_PUBLICATION
+
+settings = get_settings()
+
+
+class FakePinata:
+    """Заглушка Pinata API: запоминает загрузки, первые ответы берет из failures"""
+
+    def __init__(self):
+        self.failures = []
+        self.uploads = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/pinning/pinFileToIPFS"
+        assert request.headers["pinata_api_key"] == "key"
+        if self.failures:
+            return httpx.Response(self.failures.pop(0), json={"error": "try later"})
+        self.uploads.append(request.read())
+        return httpx.Response(200, json={"IpfsHash": f"bafy{len(self.uploads)}"})
+
+
+@pytest.fixture
+def pinata(monkeypatch, async_session_factory):
+    fake = FakePinata()
+    client = PinataClient("key", "secret", "https://pinata.test", transport=httpx.MockTransport(fake))
+    monkeypatch.setattr(tasks, "get_pinata", lambda: client)
+    monkeypatch.setattr(tasks, "AsyncSessionLocal", async_session_factory)
+    monkeypatch.setattr(queue, "handlers", {PIN_PUBLICATION: queue.handlers[PIN_PUBLICATION]})
+    return fake
+
+
+@pytest.fixture
+def worker(async_session_factory):
+    return queue.Worker(async_session_factory)
+
+
+def add_publication(db, n, with_files=True):
+    publication = Publication(title=f"P{n}", slug=f"p{n}", text="text")
+    if with_files:
+        folder = Path(settings.UPLOAD_DIR) / "pin"
+        folder.mkdir(parents=True, exist_ok=True)
+        (folder / f"photo{n}.jpg").write_bytes(b"jpg")
+        (folder / f"image{n}.png").write_bytes(b"png")
+        publication.photo = f"pin/photo{n}.jpg"
+        publication.images = [PublicationImage(image=f"pin/image{n}.png")]
+    db.add(publication)
+    db.commit()
+    return publication
+
+
+def enqueue_pin(db, publication, **options):
+    return queue.enqueue(db, PIN_PUBLICATION, {"publication_id": publication.id}, **options)
+
+
+def make_due(db, job):
+    # Вместо ожидания задержки повтора
+    db.execute(update(Job).where(Job.id == job.id).values(run_at=queue.utcnow() - timedelta(seconds=1)))
+    db.commit()
+
+
+def test_batch_is_pinned_in_one_request(db, pinata, worker):
+    first, second = add_publication(db, 1), add_publication(db, 2)
+    empty = add_publication(db, 3, with_files=False)
+    for publication in (first, second, empty):
+        enqueue_pin(db, publication)
+
+    assert asyncio.run(worker.run_once()) == 3
+    assert len(pinata.uploads) == 1
+    body = pinata.uploads[0]
+    for name in (f"{first.id}/photo1.jpg", f"{first.id}/image1.png", f"{second.id}/photo2.jpg"):
+        assert f'filename="publications-{first.id}-{second.id}-{empty.id}/{name}"'.encode() in body
+
+    db.expire_all()
+    gateway = settings.PINATA_GATEWAY.rstrip("/")
+    assert db.get(Publication, first.id).ipfs_link == f"{gateway}/bafy1/{first.id}/"
+    assert db.get(Publication, second.id).ipfs_link == f"{gateway}/bafy1/{second.id}/"
+    assert db.get(Publication, empty.id).ipfs_link is None
+    results = {job.payload["publication_id"]: job.result for job in db.scalars(select(Job))}
+    assert results[first.id] == {"cid": "bafy1", "ipfs_link": f"{gateway}/bafy1/{first.id}/"}
+    assert results[empty.id] == {"cid": "bafy1", "ipfs_link": None}
+
+
+@pytest.mark.parametrize("status", [429, 502])
+def test_retry_with_backoff(db, pinata, worker, status):
+    publication = add_publication(db, 1)
+    job = enqueue_pin(db, publication)
+    pinata.failures = [status, status]
+
+    started = queue.utcnow()
+    asyncio.run(worker.run_once())
+    db.expire_all()
+    failed = db.get(Job, job.id)
+    assert (failed.status, failed.attempts) == (queue.PENDING, 1)
+    assert str(status) in failed.last_error
+    first_delay = failed.run_at.replace(tzinfo=started.tzinfo) - started
+    assert first_delay >= timedelta(seconds=settings.QUEUE_RETRY_DELAY)
+    # Пока задержка не прошла, задача не берется
+    assert asyncio.run(worker.run_once()) == 0
+
+    make_due(db, job)
+    asyncio.run(worker.run_once())
+    db.expire_all()
+    second_delay = db.get(Job, job.id).run_at.replace(tzinfo=started.tzinfo) - queue.utcnow()
+    assert second_delay >= timedelta(seconds=2 * settings.QUEUE_RETRY_DELAY - 1)
+
+    make_due(db, job)
+    asyncio.run(worker.run_once())
+    db.expire_all()
+    assert db.get(Job, job.id).status == queue.DONE
+    assert db.get(Publication, publication.id).ipfs_link.endswith(f"/bafy1/{publication.id}/")
+
+
+def test_job_status_in_admin(admin_client, db, pinata, worker):
+    publication = add_publication(db, 1)
+    job = enqueue_pin(db, publication, max_attempts=1)
+    pinata.failures = [500]
+    asyncio.run(worker.run_once())
+
+    dead = admin_client.get(f"/admin/jobs/{job.id}").json()
+    assert (dead["status"], dead["attempts"]) == (queue.DEAD, 1)
+    assert "500" in dead["last_error"]
+    listed = admin_client.get("/admin/jobs/", params={"kind": PIN_PUBLICATION, "status": queue.DEAD}).json()
+    assert [item["id"] for item in listed] == [job.id]
+
+    retried = admin_client.post(f"/admin/jobs/{job.id}/retry").json()
+    assert (retried["status"], retried["attempts"], retried["last_error"]) == (queue.PENDING, 0, None)
+    asyncio.run(worker.run_once())
+
+    done = admin_client.get(f"/admin/jobs/{job.id}").json()
+    assert done["status"] == queue.DONE
+    assert done["result"]["cid"] == "bafy1"
@@ -0,0 +1,43 @@
+import pytest
+
+from core.principals import principal_cache, token_cache
+from core.security import create_access_token
+from users.models import User
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    principal_cache.clear()
+    token_cache.clear()
+    yield
+    principal_cache.clear()
+
+
+def add_user(db, email, is_superuser=True):
+    user = User(email=email, hashed_password="x", is_superuser=is_superuser)
+    db.add(user)
+    db.commit()
+    return user
+
+
+def auth(email):
+    return {"Authorization": f"Bearer {create_access_token(email)}"}
+
+
+def test_admin_with_legacy_email(client, db):
+    # Адрес из старых данных, который EmailStr не пропускает
+    add_user(db, "admin@localhost")
+    response = client.get("/admin/broadcasts/", headers=auth("admin@localhost"))
+    assert response.status_code == 200
+    assert principal_cache.get(("email", "admin@localhost")).is_superuser
+
+
+def test_admin_requires_superuser(client, db):
+    add_user(db, "user@example.com", is_superuser=False)
+    response = client.get("/admin/broadcasts/", headers=auth("user@example.com"))
+    assert response.status_code == 403
+
+
+def test_admin_unknown_user(client):
+    response = client.get("/admin/broadcasts/", headers=auth("ghost@example.com"))
+    assert response.status_code == 401
@@ -0,0 +1,54 @@
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import select, text
+
+from core.database import get_db
+from core.profiling import ProfilingMiddleware, statement_shape
+from users.models import User
+
+
+def test_statement_shape_ignores_values():
+    assert statement_shape("SELECT * FROM t WHERE id = 1") == statement_shape(
+        "SELECT *  FROM t WHERE id = 42"
+    )
+    assert statement_shape("SELECT * FROM t WHERE id IN (?, ?, ?)") == "SELECT * FROM t WHERE id IN (?)"
+
+
+@pytest.mark.query_budget(1)
+def test_marker_counts_queries(db):
+    db.execute(select(User)).all()
+
+
+def test_budget_exceeded(db, query_budget):
+    with pytest.raises(pytest.fail.Exception, match="2 SQL queries, budget is 1"):
+        with query_budget(1):
+            db.execute(text("SELECT 1"))
+            db.execute(text("SELECT 2"))
+
+
+def test_n_plus_one_detected(db, query_budget):
+    with pytest.raises(pytest.fail.Exception, match="possible N\\+1"):
+        with query_budget(10):
+            for user_id in range(5):
+                db.get(User, user_id)
+
+
+def test_n_plus_one_allowed(db, query_budget):
+    with query_budget(10, allow_n_plus_one=True) as recorder:
+        for user_id in range(5):
+            db.get(User, user_id)
+    assert recorder.count == 5
+
+
+def test_middleware_headers():
+    app = FastAPI()
+
+    @app.get("/users")
+    def users(db=Depends(get_db)):
+        return [db.get(User, user_id) for user_id in range(6)]
+
+    app.add_middleware(ProfilingMiddleware, threshold=5)
+    response = TestClient(app).get("/users")
+    assert response.headers["x-db-query-count"] == "6"
+    assert response.headers["x-db-n-plus-one"] == "1"
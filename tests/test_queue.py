@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+from sqlalchemy import select
+
+from core import queue
+from core.models import Job
+
+
+@pytest.fixture
+def worker(async_session_factory):
+    return queue.Worker(async_session_factory)
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    handlers = {}
+    monkeypatch.setattr(queue, "handlers", handlers)
+    return handlers
+
+
+def jobs_by_payload(db):
+    db.expire_all()
+    return {job.payload["n"]: job for job in db.scalars(select(Job)).all()}
+
+
+def test_kinds_run_concurrently(db, worker, registry):
+    released = asyncio.Event()
+
+    async def slow(payloads):
+        # Завершится, только если быстрый вид обработан параллельно
+        await asyncio.wait_for(released.wait(), 5)
+        return ["slow"]
+
+    async def fast(payloads):
+        released.set()
+        return ["fast"]
+
+    registry["slow"] = queue.JobHandler(slow)
+    registry["fast"] = queue.JobHandler(fast)
+    queue.enqueue(db, "slow", {"n": 1})
+    queue.enqueue(db, "fast", {"n": 2})
+
+    assert asyncio.run(worker.run_once()) == 2
+    jobs = jobs_by_payload(db)
+    assert (jobs[1].status, jobs[1].result) == (queue.DONE, "slow")
+    assert (jobs[2].status, jobs[2].result) == (queue.DONE, "fast")
+
+
+def test_short_results_fail_leftover_jobs(db, worker, registry):
+    async def handler(payloads):
+        return ["ok"]
+
+    registry["batch"] = queue.JobHandler(handler, batch_size=3)
+    queue.enqueue(db, "batch", {"n": 1})
+    queue.enqueue(db, "batch", {"n": 2}, max_attempts=1)
+    queue.enqueue(db, "batch", {"n": 3})
+
+    assert asyncio.run(worker.run_once()) == 3
+    jobs = jobs_by_payload(db)
+    assert jobs[1].status == queue.DONE
+    assert jobs[2].status == queue.DEAD
+    assert jobs[3].status == queue.PENDING
+    assert "1 results for 3 jobs" in jobs[3].last_error
+
+
+def test_exception_result_retries_only_that_job(db, worker, registry):
+    async def handler(payloads):
+        return [ValueError("bad") if p["n"] == 2 else p["n"] for p in payloads]
+
+    registry["batch"] = queue.JobHandler(handler, batch_size=2)
+    queue.enqueue(db, "batch", {"n": 1})
+    queue.enqueue(db, "batch", {"n": 2})
+
+    asyncio.run(worker.run_once())
+    jobs = jobs_by_payload(db)
+    assert (jobs[1].status, jobs[1].result) == (queue.DONE, 1)
+    assert jobs[2].status == queue.PENDING
+    assert jobs[2].attempts == 1
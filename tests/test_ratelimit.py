@@ -0,0 +1,64 @@
+import secrets
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from core.models import ApiKey
+from core.ratelimit import RateLimiter, RateLimitMiddleware, RateLimitRule
+from core.security import api_key_cache, get_api_key_signature, verified_signatures
+from tgusers.routes import router as tg_router
+
+
+@pytest.fixture
+def client():
+    api_key_cache.clear()
+    verified_signatures.clear()
+    app = FastAPI()
+    app.include_router(tg_router)
+    app.add_middleware(
+        RateLimitMiddleware, limiter=RateLimiter(), rules=[RateLimitRule("default", 3, 60)]
+    )
+    return TestClient(app)
+
+
+@pytest.fixture
+def api_key(db):
+    key = ApiKey(name="bot", api_key="k" * 32, api_secret="secret", is_active=True)
+    db.add(key)
+    db.commit()
+    return key.api_key, get_api_key_signature("secret", "all")
+
+
+def test_rotating_bogus_keys_share_client_limit(client):
+    statuses = [
+        client.get(
+            "/api/v1/tg/all",
+            headers={"x-api-key": secrets.token_hex(16), "x-api-signature": "bogus"},
+        ).status_code
+        for _ in range(5)
+    ]
+    assert statuses[:3] == [403, 403, 403]
+    assert statuses[3:] == [429, 429]
+
+
+def test_verified_key_gets_own_limit(client, api_key):
+    key, signature = api_key
+    headers = {"x-api-key": key, "x-api-signature": signature}
+    # Первый запрос проверяет подпись и еще считается по IP
+    assert client.get("/api/v1/tg/all", headers=headers).status_code == 200
+    for _ in range(2):
+        client.get("/api/v1/tg/all", headers={"x-api-key": "bogus", "x-api-signature": "bogus"})
+    # Лимит IP исчерпан, но у проверенного ключа свой счетчик
+    assert client.get("/api/v1/tg/all").status_code == 429
+    assert client.get("/api/v1/tg/all", headers=headers).status_code == 200
+
+
+def test_verified_key_with_wrong_signature_is_limited_by_ip(client, api_key):
+    key, signature = api_key
+    client.get("/api/v1/tg/all", headers={"x-api-key": key, "x-api-signature": signature})
+    statuses = [
+        client.get("/api/v1/tg/all", headers={"x-api-key": key, "x-api-signature": "forged"}).status_code
+        for _ in range(3)
+    ]
+    assert statuses == [403, 403, 429]
@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+
+from core.storage import MediaStore
+from publications.models import Publication
+
+
+@pytest.fixture
+def store(tmp_path):
+    root = tmp_path / "uploads"
+    root.mkdir()
+    return MediaStore(root, gc_grace=0)
+
+
+def release(async_session_factory, store, keys):
+    async def run():
+        async with async_session_factory() as db:
+            await store.release(db, keys)
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize("key", ["../outside.txt", "{outside}", "photos/../../outside.txt", ".", ""])
+def test_release_keeps_files_outside_storage(async_session_factory, store, tmp_path, key):
+    outside = tmp_path / "outside.txt"
+    outside.write_text("keep")
+    (tmp_path / "outside.txt.w320.webp").write_text("keep")
+    release(async_session_factory, store, [key.format(outside=outside)])
+    assert outside.exists()
+    assert (tmp_path / "outside.txt.w320.webp").exists()
+    assert store.root.exists()
+
+
+def test_path_rejects_keys_outside_storage(store, tmp_path):
+    for key in ("/etc/passwd", "../x", "a/../../x", "."):
+        with pytest.raises(ValueError):
+            store.path(key)
+    assert store.path("photos/a.jpg") == store.root / "photos/a.jpg"
+
+
+def test_release_deletes_unreferenced_legacy_file(async_session_factory, store):
+    legacy = store.root / "photos" / "old.jpg"
+    legacy.parent.mkdir()
+    legacy.write_bytes(b"jpg")
+    variant = store.root / "photos" / "old.jpg.w320.webp"
+    variant.write_bytes(b"webp")
+    release(async_session_factory, store, ["photos/old.jpg"])
+    assert not legacy.exists()
+    assert not variant.exists()
+
+
+def test_admin_update_keeps_outside_photo(admin_client, db, tmp_path):
+    outside = tmp_path / "secret.txt"
+    outside.write_text("keep")
+    publication = Publication(title="T", slug="t", text="text", photo=str(outside))
+    db.add(publication)
+    db.commit()
+    response = admin_client.put(f"/admin/publications/{publication.id}", json={"photo": None})
+    assert response.status_code == 200
+    assert outside.exists()
+    assert admin_client.delete(f"/admin/publications/{publication.id}").status_code == 200
+    assert outside.exists()
@@ -0,0 +1,68 @@
+import asyncio
+import hashlib
+import os
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from core.uploads import ResumableUploads
+
+DATA = os.urandom(300_000)
+
+
+async def chunks(data: bytes, size: int = 64 * 1024):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+def test_resume_on_another_worker(tmp_path):
+    async def scenario():
+        # Два экземпляра - как два процесса с общим каталогом загрузок
+        first, second = ResumableUploads(tmp_path), ResumableUploads(tmp_path)
+        upload_id = await first.create(len(DATA), len(DATA), {"filename": "v.mp4"})
+        offset = await first.append(upload_id, 0, chunks(DATA[:100_000]))
+        assert (await second.status(upload_id))["offset"] == offset
+        offset = await second.append(upload_id, offset, chunks(DATA[100_000:200_000]))
+        offset = await first.append(upload_id, offset, chunks(DATA[200_000:]))
+        return await first.complete(upload_id, tmp_path / "done.bin")
+
+    stored = asyncio.run(scenario())
+    assert stored.sha256 == hashlib.sha256(DATA).hexdigest()
+    assert stored.path.read_bytes() == DATA
+
+
+def test_concurrent_append_is_rejected(tmp_path):
+    async def scenario():
+        uploads = ResumableUploads(tmp_path)
+        upload_id = await uploads.create(len(DATA), len(DATA), {})
+        started = asyncio.Event()
+
+        async def slow():
+            started.set()
+            await asyncio.sleep(0.2)
+            yield DATA[:10]
+
+        writer = asyncio.create_task(uploads.append(upload_id, 0, slow()))
+        await started.wait()
+        with pytest.raises(HTTPException) as exc:
+            await ResumableUploads(tmp_path).append(upload_id, 0, chunks(DATA[:10]))
+        assert exc.value.status_code == 423
+        assert await writer == 10
+
+    asyncio.run(scenario())
+
+
+def test_stale_uploads_are_removed(tmp_path):
+    async def scenario():
+        uploads = ResumableUploads(tmp_path, ttl=60)
+        stale = await uploads.create(10, 10, {})
+        fresh = await uploads.create(10, 10, {})
+        old = time.time() - 120
+        for name in (f"{stale}.part", f"{stale}.json"):
+            os.utime(tmp_path / name, (old, old))
+        assert await uploads.collect_stale() == 1
+        assert not (tmp_path / f"{stale}.part").exists()
+        assert (await uploads.status(fresh))["offset"] == 0
+
+    asyncio.run(scenario())
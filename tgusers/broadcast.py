@@ -0,0 +1,177 @@
+import asyncio
+import html
+import logging
+import time
+from collections import Counter
+from typing import Optional
+
+import httpx
+from sqlalchemy import func, select, update
+
+from core.config import get_settings
+from core.database import AsyncSessionLocal
+from core.queue import enqueue_async, utcnow
+from core.ratelimit import TokenBucket
+from core.telegram import TelegramClient, TelegramError, get_rate_limiter, get_telegram
+from donations.models import DonationCampaign
+from publications.models import Publication
+from tgusers.models import TgBroadcast, TgUsers
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+TG_BROADCAST = "tg_broadcast"
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+CANCELLED = "cancelled"
+
+SENT = "sent"
+FAILED = "failed"
+BLOCKED = "blocked"
+
+# Повторы одного сообщения при 5xx и сетевых ошибках
+MAX_DELIVERY_ATTEMPTS = 3
+# 429 - не ошибка сообщения, а просьба подождать; считается отдельно
+MAX_FLOOD_WAITS = 10
+PREVIEW_LENGTH = 500
+
+
+def publication_message(publication: Publication) -> str:
+    text = publication.text or ""
+    if len(text) > PREVIEW_LENGTH:
+        text = text[:PREVIEW_LENGTH].rstrip() + "…"
+    parts = [f"<b>{html.escape(publication.title)}</b>", html.escape(text)]
+    if publication.source_link:
+        parts.append(html.escape(publication.source_link))
+    return "\n\n".join(part for part in parts if part)
+
+
+def campaign_message(campaign: DonationCampaign) -> str:
+    parts = [f"<b>{html.escape(campaign.title)}</b>", html.escape(campaign.description or "")]
+    return "\n\n".join(part for part in parts if part)
+
+
+class Broadcaster:
+    """Рассылка сообщения всем tg_users.
+
+    Получатели читаются пачками по tg_users.id; после каждой пачки счетчики
+    и контрольная точка (last_tg_user_id) сохраняются в tg_broadcasts, так
+    что прерванная рассылка продолжается с места остановки (повторно может
+    уйти не больше одной пачки). Одновременных запросов не больше
+    concurrency, темп задает общий для процесса bucket бота (TELEGRAM_RATE
+    сообщений в секунду на все части и рассылки), а 429 от Telegram
+    приостанавливает всех отправителей на retry_after.
+    """
+
+    def __init__(
+        self,
+        client: Optional[TelegramClient] = None,
+        session_factory=AsyncSessionLocal,
+        concurrency: int = settings.TELEGRAM_CONCURRENCY,
+        bucket: Optional[TokenBucket] = None,
+        batch_size: int = settings.TELEGRAM_BATCH_SIZE,
+    ):
+        self.client = client or get_telegram()
+        self.session_factory = session_factory
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.bucket = bucket or get_rate_limiter()
+        self.batch_size = batch_size
+
+    async def deliver(self, chat_id: int, text: str, parse_mode: Optional[str]) -> str:
+        async with self.semaphore:
+            attempt = flood_waits = 0
+            while attempt < MAX_DELIVERY_ATTEMPTS:
+                await self.bucket.acquire()
+                try:
+                    await self.client.send_message(chat_id, text, parse_mode)
+                    return SENT
+                except TelegramError as exc:
+                    if exc.retry_after:
+                        flood_waits += 1
+                        if flood_waits > MAX_FLOOD_WAITS:
+                            logger.warning("Telegram kept throttling message to %s", chat_id)
+                            return FAILED
+                        self.bucket.pause(exc.retry_after)
+                        continue
+                    if exc.status == 403:
+                        # Бот заблокирован или пользователь удален
+                        return BLOCKED
+                    if exc.status < 500:
+                        logger.info("Telegram rejected message to %s: %s", chat_id, exc)
+                        return FAILED
+                except httpx.TransportError as exc:
+                    logger.warning("Telegram request to %s failed: %r", chat_id, exc)
+                await asyncio.sleep(2 ** attempt)
+                attempt += 1
+            return FAILED
+
+    async def _start(self, broadcast_id: int) -> Optional[TgBroadcast]:
+        async with self.session_factory() as db:
+            broadcast = await db.get(TgBroadcast, broadcast_id)
+            if broadcast is None or broadcast.status in (DONE, CANCELLED):
+                return None
+            if broadcast.status == PENDING:
+                broadcast.status = RUNNING
+                broadcast.started_at = utcnow()
+                broadcast.total = await db.scalar(select(func.count()).select_from(TgUsers))
+                await db.commit()
+            return broadcast
+
+    async def run(self, broadcast_id: int, time_budget: Optional[float] = None) -> bool:
+        """Отправляет пачки, пока не закончатся получатели или time_budget секунд.
+
+        Возвращает True, если рассылка завершена (или отменена). Если время
+        вышло, задача-продолжение ставится в очередь в той же транзакции,
+        что и контрольная точка: рассылка не может остаться без продолжения.
+        """
+        broadcast = await self._start(broadcast_id)
+        if broadcast is None:
+            return True
+        deadline = time.monotonic() + time_budget if time_budget else None
+        checkpoint = broadcast.last_tg_user_id
+        while True:
+            async with self.session_factory() as db:
+                status = await db.scalar(select(TgBroadcast.status).where(TgBroadcast.id == broadcast_id))
+                if status != RUNNING:
+                    return True
+                recipients = (await db.execute(
+                    select(TgUsers.id, TgUsers.id_telegram)
+                    .where(TgUsers.id > checkpoint)
+                    .order_by(TgUsers.id)
+                    .limit(self.batch_size)
+                )).all()
+
+            if not recipients:
+                async with self.session_factory() as db:
+                    await db.execute(
+                        update(TgBroadcast)
+                        .where(TgBroadcast.id == broadcast_id, TgBroadcast.status == RUNNING)
+                        .values(status=DONE, finished_at=utcnow())
+                    )
+                    await db.commit()
+                return True
+
+            results = Counter(await asyncio.gather(*[
+                self.deliver(chat_id, broadcast.text, broadcast.parse_mode)
+                for _, chat_id in recipients
+            ]))
+            checkpoint = recipients[-1][0]
+            suspended = deadline is not None and time.monotonic() >= deadline
+            async with self.session_factory() as db:
+                await db.execute(
+                    update(TgBroadcast)
+                    .where(TgBroadcast.id == broadcast_id)
+                    .values(
+                        sent=TgBroadcast.sent + results[SENT],
+                        failed=TgBroadcast.failed + results[FAILED],
+                        blocked=TgBroadcast.blocked + results[BLOCKED],
+                        last_tg_user_id=checkpoint,
+                    )
+                )
+                if suspended:
+                    await enqueue_async(db, TG_BROADCAST, {"broadcast_id": broadcast_id}, commit=False)
+                await db.commit()
+            if suspended:
+                return False
@@ -0,0 +1,117 @@
+import csv
+import json
+import uuid
+from datetime import datetime
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, TextIO, Tuple
+
+from sqlalchemy import func, or_, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from core.database import ReadSessionLocal
+from tgusers.models import TgUsers
+
+IMPORT_BATCH_SIZE = 5000
+MAX_IMPORT_ERRORS = 20
+
+
+def iter_telegram_ids(since: Optional[datetime] = None, batch_size: int = 5000) -> Iterator[List[int]]:
+    """Telegram ID пачками через серверный курсор (yield_per).
+
+    Открывает собственную сессию: генератор дочитывается уже после выхода
+    из обработчика, когда сессия из зависимости закрыта. С since отдаются
+    только добавленные или измененные с этого момента пользователи.
+    """
+    stmt = select(TgUsers.id_telegram).order_by(TgUsers.id)
+    if since is not None:
+        stmt = stmt.where(or_(TgUsers.created_at >= since, TgUsers.updated_at >= since))
+    with ReadSessionLocal() as db:
+        result = db.execute(stmt.execution_options(yield_per=batch_size))
+        for partition in result.scalars().partitions():
+            yield list(partition)
+
+
+def _read_records(stream: TextIO, format: str) -> Iterator[Tuple[int, object]]:
+    if format == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+        return
+    for number, line in enumerate(stream, 1):
+        if line.strip():
+            yield number, line
+
+
+def parse_import(stream: TextIO, format: str) -> Iterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """Строки файла импорта: (номер строки, {id_telegram, name} или None, ошибка).
+
+    csv - с заголовком id_telegram,name; ndjson - JSON-объект в каждой строке.
+    """
+    for number, record in _read_records(stream, format):
+        try:
+            if format != "csv":
+                record = json.loads(record)
+            id_telegram = int(record["id_telegram"])
+            name = str(record.get("name") or "").strip() or str(id_telegram)
+        except (ValueError, TypeError, KeyError, AttributeError) as exc:
+            yield number, None, f"line {number}: {exc!r}"
+            continue
+        yield number, {"id_telegram": id_telegram, "name": name}, None
+
+
+def _insert(db: Session):
+    return (postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert)(TgUsers)
+
+
+def upsert_batch(db: Session, rows: List[dict]) -> Dict[str, int]:
+    """Вставляет новых и обновляет имя существующих одним INSERT ... ON CONFLICT.
+
+    Повторы id_telegram внутри пачки схлопываются (побеждает последний),
+    строки без изменений не пишутся и считаются пропущенными.
+    """
+    latest = {row["id_telegram"]: row["name"] for row in rows}
+    existing = dict(db.execute(
+        select(TgUsers.id_telegram, TgUsers.name).where(TgUsers.id_telegram.in_(latest))
+    ).all())
+    changed = [
+        {"id_telegram": id_telegram, "name": name, "uuid_id": str(uuid.uuid4())}
+        for id_telegram, name in latest.items()
+        if existing.get(id_telegram) != name
+    ]
+    if changed:
+        stmt = _insert(db).values(changed)
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=[TgUsers.id_telegram],
+            set_={"name": stmt.excluded.name, "updated_at": func.now()},
+            where=TgUsers.name != stmt.excluded.name,
+        ))
+    inserted = sum(1 for row in changed if row["id_telegram"] not in existing)
+    return {
+        "inserted": inserted,
+        "updated": len(changed) - inserted,
+        "skipped": len(rows) - len(changed),
+    }
+
+
+def import_tg_users(db: Session, stream: TextIO, format: str, batch_size: int = IMPORT_BATCH_SIZE) -> dict:
+    """Потоковый импорт пользователей пачками по batch_size, каждая пачка - своя транзакция"""
+    stats = {"inserted": 0, "updated": 0, "skipped": 0, "errors": []}
+    records = parse_import(stream, format)
+    while True:
+        chunk = list(islice(records, batch_size))
+        if not chunk:
+            break
+        rows = []
+        for _, row, error in chunk:
+            if row is None:
+                stats["skipped"] += 1
+                if len(stats["errors"]) < MAX_IMPORT_ERRORS:
+                    stats["errors"].append(error)
+            else:
+                rows.append(row)
+        if rows:
+            for key, value in upsert_batch(db, rows).items():
+                stats[key] += value
+            db.commit()
+    return stats
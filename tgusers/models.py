@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, func, BigInteger
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, func, BigInteger, Index, Text
 from sqlalchemy.orm import relationship
 from core.database import Base
 
@@ -12,5 +12,42 @@ class TgUsers(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    __table_args__ = (
+        # Один пользователь на Telegram ID; ключ для INSERT ... ON CONFLICT при импорте
+        Index("ix_tg_users_id_telegram", "id_telegram", unique=True),
+        # Под выгрузку изменений с момента since в /api/v1/tg/all
+        Index("ix_tg_users_created_at", "created_at"),
+        Index("ix_tg_users_updated_at", "updated_at"),
+    )
+
     def __str__(self):
         return f"{self.id_telegram} {self.name}"
+
+
+class TgBroadcast(Base):
+    """Рассылка сообщения всем tg_users (см. tgusers.broadcast)"""
+    __tablename__ = "tg_broadcasts"
+
+    id = Column(Integer, primary_key=True, index=True)
+    text = Column(Text, nullable=False)
+    parse_mode = Column(String, nullable=True)
+    # pending -> running -> done | cancelled
+    status = Column(String, nullable=False, default="pending")
+    total = Column(Integer, nullable=False, default=0)
+    sent = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+    blocked = Column(Integer, nullable=False, default=0)
+    # Контрольная точка: tg_users.id последнего обработанного получателя
+    last_tg_user_id = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    __table_args__ = (
+        Index("ix_tg_broadcasts_created_at_id", "created_at", "id"),
+    )
+
+    def __str__(self):
+        return f"Broadcast {self.id} ({self.status})"
@@ -1,15 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, Header
+from fastapi import APIRouter, Depends, HTTPException, Header, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
-from typing import List, Optional
-from core.database import get_db
+from datetime import datetime, timedelta
+from typing import Iterator, List, Literal, Optional
+import struct
+from core.database import get_db, get_read_db
 from users.models import User
 from tgusers.models import TgUsers
+from tgusers.crud import iter_telegram_ids
 from tgusers.schemas import TgUserCreate, TgUserUpdate, TgUserOut
 from admin.deps import get_current_admin
 import uuid
 from core.config import get_settings
 import hmac
 import hashlib
+from core.ratelimit import client_ip
 from core.security import verify_api_key
 
 settings = get_settings()
@@ -62,15 +68,59 @@ def delete_tguser(tguser_id: int, current_admin: User = Depends(get_current_admi
 
 router = APIRouter(prefix="/api/v1", tags=["tg"])
 
+EXPORT_BATCH_SIZE = 5000
+# Запас для X-Next-Since: строки из транзакций, начатых до момента выгрузки,
+# но закоммиченных после, попадут в следующую дельту (повторы допустимы)
+SYNC_OVERLAP = timedelta(seconds=30)
+EXPORT_MEDIA_TYPES = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+    "binary": "application/octet-stream",
+}
+
+
+def encode_tg_ids(batches: Iterator[List[int]], format: str) -> Iterator[bytes]:
+    """Кодирует пачки ID в JSON-массив, NDJSON или массив int64 little-endian"""
+    if format == "binary":
+        for batch in batches:
+            yield struct.pack(f"<{len(batch)}q", *batch)
+        return
+    if format == "ndjson":
+        for batch in batches:
+            yield "".join(f"{tg_id}\n" for tg_id in batch).encode()
+        return
+    yield b"["
+    separator = ""
+    for batch in batches:
+        yield (separator + ",".join(map(str, batch))).encode()
+        separator = ","
+    yield b"]"
+
+
 @router.get("/tg/all")
 def get_tg_ids(
+    request: Request,
+    format: Literal["json", "ndjson", "binary"] = Query("json"),
+    since: Optional[datetime] = Query(None, description="Только добавленные или измененные с этого момента"),
     x_api_key: str = Header(..., alias="x-api-key"),
     x_api_signature: str = Header(..., alias="x-api-signature"),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
+    """Потоковая выгрузка Telegram ID.
+
+    По умолчанию JSON-массив, как раньше; format=ndjson - по ID в строке,
+    format=binary - массив int64 little-endian. Значение заголовка
+    X-Next-Since передается в since при следующей синхронизации, чтобы
+    получить только изменения (удаления в дельту не попадают).
+    """
     # Формируем строку для подписи (можно просто 'all' для списка)
     data = "all"
-    if not verify_api_key(db, x_api_key, x_api_signature, data):
+    client = client_ip(request.scope, settings.RATE_LIMIT_TRUST_PROXY)
+    if not verify_api_key(db, x_api_key, x_api_signature, data, client):
         raise HTTPException(status_code=403, detail="Invalid API key or signature")
-    tg_ids = db.query(TgUsers.id_telegram).all()
-    return [tg_id for (tg_id,) in tg_ids] 
\ No newline at end of file
+    next_since = db.scalar(select(func.now())) - SYNC_OVERLAP
+    return StreamingResponse(
+        encode_tg_ids(iter_telegram_ids(since, EXPORT_BATCH_SIZE), format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"X-Next-Since": next_since.isoformat()},
+    )
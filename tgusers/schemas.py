@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, computed_field, model_validator
+from typing import List, Literal, Optional
 from datetime import datetime
 
 class TgUserBase(BaseModel):
@@ -19,4 +19,51 @@ class TgUserOut(TgUserBase):
     created_at: datetime
     updated_at: Optional[datetime] = None
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True
+
+
+class TgUserImportResult(BaseModel):
+    inserted: int
+    updated: int
+    skipped: int
+    # Первые ошибки разбора строк
+    errors: List[str] = []
+
+
+class TgBroadcastCreate(BaseModel):
+    """Текст сообщения или публикация/кампания, из которой он собирается"""
+    text: Optional[str] = None
+    parse_mode: Optional[Literal["HTML", "MarkdownV2"]] = None
+    publication_id: Optional[int] = None
+    campaign_id: Optional[int] = None
+
+    @model_validator(mode="after")
+    def check_source(self):
+        if sum(value is not None for value in (self.text, self.publication_id, self.campaign_id)) != 1:
+            raise ValueError("Exactly one of text, publication_id or campaign_id is required")
+        return self
+
+
+class TgBroadcastRead(BaseModel):
+    id: int
+    text: str
+    parse_mode: Optional[str] = None
+    status: str
+    total: int
+    sent: int
+    failed: int
+    blocked: int
+    last_tg_user_id: int
+    last_error: Optional[str] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    @computed_field
+    @property
+    def remaining(self) -> int:
+        return max(self.total - self.sent - self.failed - self.blocked, 0)
+
+    class Config:
+        from_attributes = True
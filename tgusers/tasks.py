@@ -0,0 +1,23 @@
+from typing import List
+
+from core.config import get_settings
+from core.queue import job_handler
+from .broadcast import TG_BROADCAST, Broadcaster
+
+settings = get_settings()
+
+
+@job_handler(TG_BROADCAST)
+async def send_broadcast(payloads: List[dict]) -> List[dict]:
+    """Отправляет часть рассылки длиной не больше TELEGRAM_SLICE_SECONDS.
+
+    Незавершенная рассылка ставит в очередь свое продолжение (см.
+    Broadcaster.run), чтобы не занимать обработчик очереди надолго;
+    прогресс хранится в tg_broadcasts.
+    """
+    results = []
+    for payload in payloads:
+        broadcast_id = payload["broadcast_id"]
+        finished = await Broadcaster().run(broadcast_id, settings.TELEGRAM_SLICE_SECONDS)
+        results.append({"broadcast_id": broadcast_id, "finished": finished})
+    return results
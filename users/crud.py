@@ -1,6 +1,10 @@
 from sqlalchemy.orm import Session
 from . import models, schemas
+from typing import Optional
+from core.database import commit_returning
 from core.security import get_password_hash
+from core.pagination import paginate
+from core.principals import invalidate_principal
 
 
 def get_user(db: Session, user_id: int):
@@ -15,6 +19,10 @@ def get_users(db: Session, skip: int = 0, limit: int = 100):
     return db.query(models.User).offset(skip).limit(limit).all()
 
 
+def get_users_page(db: Session, cursor: Optional[str] = None, limit: int = 100):
+    return paginate(db.query(models.User), models.User, cursor, limit)
+
+
 def create_user(db: Session, user: schemas.UserCreate):
     hashed_password = get_password_hash(user.password)
     db_user = models.User(
@@ -22,9 +30,7 @@ def create_user(db: Session, user: schemas.UserCreate):
         hashed_password=hashed_password,
         full_name=user.full_name,
     )
-    db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    commit_returning(db, db_user)
     return db_user
 
 
@@ -36,9 +42,7 @@ def create_admin_user(db: Session, user: schemas.UserCreate):
         full_name=user.full_name,
         is_superuser=True
     )
-    db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    commit_returning(db, db_user)
     return db_user
 
 
@@ -51,11 +55,12 @@ def update_user(db: Session, user_id: int, user: schemas.UserUpdate):
     if "password" in update_data:
         update_data["hashed_password"] = get_password_hash(update_data.pop("password"))
     
+    old_email = db_user.email
     for field, value in update_data.items():
         setattr(db_user, field, value)
     
-    db.commit()
-    db.refresh(db_user)
+    commit_returning(db, db_user)
+    invalidate_principal(user_id=db_user.id, email=old_email)
     return db_user
 
 
@@ -65,4 +70,5 @@ def delete_user(db: Session, user_id: int):
         return None
     db.delete(db_user)
     db.commit()
+    invalidate_principal(user_id=db_user.id, email=db_user.email)
     return db_user 
\ No newline at end of file
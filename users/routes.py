@@ -2,11 +2,12 @@ from typing import Annotated
 from fastapi import APIRouter, Depends, HTTPException, Security
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional, Union
 
 from core.database import get_db
 from auth.dependencies import get_current_user
 from users.models import User
+from core.pagination import Page
 from . import crud, schemas, models
 
 
@@ -17,16 +18,19 @@ router = APIRouter(
 )
 
 
-@router.get("/", response_model=List[schemas.User])
+@router.get("/", response_model=Union[Page[schemas.User], List[schemas.User]])
 def read_users(
     current_user: Annotated[models.User, Depends(get_current_user)],
     db: Annotated[Session, Depends(get_db)],
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    cursor: Optional[str] = None
 ):
     """Получить список пользователей (только для админов)"""
     if not current_user.is_superuser:
         raise HTTPException(status_code=403, detail="Not enough permissions")
+    if cursor is not None:
+        return crud.get_users_page(db, cursor=cursor, limit=limit)
     users = crud.get_users(db, skip=skip, limit=limit)
     return users
 